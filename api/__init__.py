@@ -2,6 +2,7 @@ import json
 
 import requests
 
+from utility.http_session import new_session
 from utility.log import Log
 
 LOG = Log(__name__)
@@ -31,7 +32,11 @@ class InternalServerError(Exception):
 
 
 class Api:
-    """Interface for request API methods"""
+    """Interface for request API methods
+
+    The requests are issued on the session of the interface, using the
+    keep-alive connection pool shared by the interfaces of the same base URL.
+    """
 
     def __init__(self, url, api):
         # Disable insecure request warning in response
@@ -41,6 +46,7 @@ class Api:
 
         # Remove '/' from url and append with API
         self.url = f"{url.strip('/')}/{api}"
+        self.session = new_session(self.url)
 
     def _response(self, response):
         """Validate request response
@@ -92,7 +98,7 @@ class Api:
             params["auth"] = auth
             LOG.info(f"Request AUTH - {auth}")
 
-        response = requests.get(**params)
+        response = self.session.get(**params)
         if check_sc:
             return self._response(response)
 
@@ -128,7 +134,7 @@ class Api:
             params["auth"] = auth
             LOG.info(f"Request AUTH - {auth}")
 
-        response = requests.post(**params)
+        response = self.session.post(**params)
         if check_sc:
             return self._response(response)
 
@@ -167,7 +173,7 @@ class Api:
             params["auth"] = auth
             LOG.info(f"Request AUTH - {auth}")
 
-        response = requests.delete(**params)
+        response = self.session.delete(**params)
         if check_sc:
             return self._response(response)
 
@@ -203,7 +209,7 @@ class Api:
             params["auth"] = auth
             LOG.info(f"Request AUTH - {auth}")
 
-        response = requests.patch(**params)
+        response = self.session.patch(**params)
         if check_sc:
             return self._response(response)
 
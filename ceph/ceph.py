@@ -8,8 +8,12 @@ import os
 import pickle
 import random
 import re
+import select
 import socket
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from time import sleep, time
 
 import cryptography
@@ -26,6 +30,31 @@ from utility.utils import custom_ceph_config
 
 logger = Log(__name__)
 
+# Upper bound in seconds for a single wait on a channel. The wait returns
+# earlier on channel activity, the bound only governs the timeout checks.
+CHANNEL_WAIT_INTERVAL = 1
+
+# Max time in seconds the output of a command is awaited after its exit status.
+# sshd may send the exit status ahead of the output left in the child's pipes.
+EOF_GRACE_TIMEOUT = 10
+
+# Defaults of the per user SSH transport pool of a node. OpenSSH allows ten
+# sessions per connection (MaxSessions), hence the channel limit.
+SSH_MAX_TRANSPORTS = 4
+SSH_MAX_CHANNELS = 8
+SSH_IDLE_TIMEOUT = 300
+
+# SFTP sessions kept open per user of a node, each holds a channel of the pool
+SFTP_MAX_SESSIONS = 2
+
+# Channel window of the SFTP sessions and the read requests kept in flight
+# per downloaded file, paramiko defaults to a 2 MiB window.
+SFTP_WINDOW_SIZE = 32 * 1024 * 1024
+SFTP_PREFETCH_REQUESTS = 64
+
+# Files transferred concurrently from or to a node
+SFTP_WORKERS = 4
+
 
 class SocketTimeoutException(Exception):
     pass
@@ -57,6 +86,9 @@ class Ceph(object):
         # When True, bootstrap/config may use IPv6 (OpenStack only);
         #  driven by config/custom_config
         self.use_ipv6 = False
+        # When True, cephadm shell commands reuse a long-lived container;
+        #  driven by custom_config persistent_shell
+        self.persistent_shell = False
 
     def __eq__(self, ceph_cluster):
         if hasattr(ceph_cluster, "node_list"):
@@ -1183,42 +1215,87 @@ def check_timeout(end_time, timeout):
         raise TimeoutException("Command exceed the allocated execution time.")
 
 
-def read_stream(channel, end_time, timeout, stderr=False, log=True):
-    """Reads the data from the given channel.
+def read_stream(channel, stderr=False, log=True):
+    """Drains the data currently buffered in the given channel stream.
+
+    The call never blocks, the read size is the amount of data already
+    received by the transport, so the output is consumed as it arrives
+    instead of being polled in fixed size chunks.
 
     Args:
       channel: the paramiko.Channel object to be used for reading.
-      end_time: maximum allocated time for reading from the channel.
-      timeout: Flag to check if timeout must be enforced.
       stderr: read from the stderr stream. Default is False.
       log: log the output. Default is True.
 
     Returns:
-      a string with the data read from the channel.
+      bytes read from the channel, empty when nothing is buffered.
+    """
+    _buffer = channel.in_stderr_buffer if stderr else channel.in_buffer
+    _size = len(_buffer)
+    if not _size:
+        return b""
+
+    _data = channel.recv_stderr(_size) if stderr else channel.recv(_size)
+    if log:
+        _log = logger.error if stderr else logger.debug
+        for _ln in _data.splitlines():
+            _log(_ln.decode("utf-8", errors="replace"))
+
+    return _data
+
+
+def wait_for_channel(channel, wait_time):
+    """Blocks until the channel has data, an exit status or wait_time elapses.
+
+    Until the remote end sends EOF, the channel's pipe based file descriptor
+    is watched using select, it is signalled when data lands on either of the
+    streams. Once EOF is received the descriptor stays readable, hence the
+    exit status event of the channel is waited upon instead.
+
+    Args:
+      channel: the paramiko.Channel object to be watched.
+      wait_time: maximum time in seconds to block.
+    """
+    if channel.eof_received:
+        channel.status_event.wait(wait_time)
+        return
+
+    select.select([channel], [], [], wait_time)
+
+
+def wait_exit_status(channel, end_time, cmd):
+    """Returns the exit status of the command whose output has ended.
+
+    The status follows the EOF of the output, it is waited for until the end
+    time of the command and at least EOF_GRACE_TIMEOUT.
+
+    Args:
+      channel: the paramiko.Channel object running the command.
+      end_time: time by which the command is expected to complete, or None.
+      cmd: the command, for the error message.
 
     Raises:
-      TimeoutException: if reading from the channel exceeds the allocated time.
+      CommandFailed: when the exit status is not received in time.
     """
-    _output = bytearray()
-    _stream = channel.recv_stderr if stderr else channel.recv
-    _decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    wait = EOF_GRACE_TIMEOUT
+    if end_time:
+        wait = max((end_time - datetime.datetime.now()).total_seconds(), wait)
 
-    _data = _stream(2048)
-    while _data:
-        _output.extend(_data)
-        if log:
-            for _ln in _data.splitlines():
-                _log = logger.error if stderr else logger.debug
-                _log(_decoder.decode(_ln, final=False))
+    if not channel.status_event.wait(wait):
+        raise CommandFailed(
+            f"Exit status of {cmd} not received within {wait:.0f}s of its output end"
+        )
+
+    return channel.recv_exit_status()
 
-        check_timeout(end_time, timeout)
-        _data = _stream(2048)
 
+def decode_stream(data):
+    """Returns the utf-8 decoded string of the given stream bytes."""
     try:
-        return _decoder.decode(_output, final=True)  # Final decode
+        return codecs.decode(data, "utf-8")
     except UnicodeDecodeError as e:
         logger.error(f"Decoding failed: {e}. Replacing invalid characters.")
-        return _output.decode("utf-8", errors="replace")  # Fallback to safe decode
+        return codecs.decode(data, "utf-8", errors="replace")
 
 
 class RolesContainer(object):
@@ -1294,6 +1371,42 @@ class NodeVolume(object):
         self.path = path
 
 
+class PooledTransport(object):
+    """SSH client of a connection pool along with its session accounting."""
+
+    def __init__(self, client):
+        self.client = client
+        self.channels = 0
+        self.last_used = time()
+
+    @property
+    def transport(self):
+        return self.client.get_transport()
+
+    def acquire(self):
+        self.channels += 1
+        self.last_used = time()
+
+    def release(self):
+        self.channels -= 1
+        self.last_used = time()
+
+    def is_healthy(self):
+        """Returns True when the underlying transport is active."""
+        transport = self.transport
+        return bool(transport and transport.is_active())
+
+    def is_idle(self, idle_timeout):
+        """Returns True when no session was served within idle_timeout."""
+        return time() - self.last_used > idle_timeout
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
 class SSHConnectionManager(object):
     def __init__(
         self,
@@ -1304,7 +1417,30 @@ class SSHConnectionManager(object):
         private_key_file_path="",
         private_key_password=None,
         outage_timeout=600,
+        max_transports=SSH_MAX_TRANSPORTS,
+        max_channels=SSH_MAX_CHANNELS,
+        idle_timeout=SSH_IDLE_TIMEOUT,
     ):
+        """
+        Manages the SSH connections of a user to a remote host.
+
+        Besides the primary client, a bounded pool of transports is maintained
+        for executing commands. Sessions are multiplexed over the pooled
+        transports and new transports are established only when all of them
+        are serving max_channels sessions.
+
+        Args:
+            ip_address (str): address of the remote host
+            username (str): login user
+            password (str): password of the user
+            look_for_keys (bool): search for the private keys
+            private_key_file_path (str): private key of the user
+            private_key_password (str): passphrase of the private key
+            outage_timeout (int): time in seconds to retry the connection
+            max_transports (int): maximum transports in the pool
+            max_channels (int): maximum concurrent sessions per transport
+            idle_timeout (int): seconds after which unused transports are closed
+        """
         self.ip_address = ip_address
         self.username = username
         self.password = password
@@ -1324,6 +1460,14 @@ class SSHConnectionManager(object):
         self.__transport = None
         self.__outage_start_time = None
         self.outage_timeout = datetime.timedelta(seconds=outage_timeout)
+        self.max_transports = max(1, int(max_transports))
+        self.max_channels = max(1, int(max_channels))
+        self.idle_timeout = idle_timeout
+        self.__primary = PooledTransport(self.__client)
+        self.__pool = []
+        self.__pool_pending = 0
+        self.__pool_cond = threading.Condition()
+        self.__sftp_idle = []
 
     @property
     def client(self):
@@ -1403,8 +1547,196 @@ class SSHConnectionManager(object):
             pass
         self.__transport = None
 
-    def __connect(self):
-        """Establishes a connection with the remote host using the IP Address."""
+        with self.__pool_cond:
+            for entry in self.__pool:
+                entry.close()
+            self.__pool = []
+            for entry, sftp, _ in self.__sftp_idle:
+                sftp.close()
+                entry.release()
+            self.__sftp_idle = []
+            self.__pool_cond.notify_all()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Borrows a session channel from the transport pool.
+
+        The least loaded healthy transport is picked, the primary transport is
+        preferred on ties. The primary transport is never evicted. The channel
+        is closed and returned to the pool on exit of the context.
+
+        Args:
+            timeout (int): seconds to wait for the session to be opened
+
+        Yields:
+            paramiko.Channel
+        """
+        entry = self.__acquire_transport()
+        try:
+            channel = entry.transport.open_session(timeout=timeout)
+        except BaseException:
+            self.__release_transport(entry)
+            raise
+
+        try:
+            yield channel
+        finally:
+            channel.close()
+            self.__release_transport(entry)
+
+    @contextmanager
+    def sftp(self):
+        """Borrows an SFTP session from the connection.
+
+        The sessions are opened with a large window on a channel of the
+        transport pool and are kept open once returned, sparing the next file
+        operations the negotiation of the SFTP subsystem. A session is served
+        to one borrower at a time, paramiko does not support concurrent
+        requests on a session.
+
+        Yields:
+            paramiko.SFTPClient
+        """
+        entry, sftp = self.__acquire_sftp()
+        try:
+            yield sftp
+        finally:
+            self.__release_sftp(entry, sftp)
+
+    def open_sftp(self):
+        """Returns a new SFTP session owned by the caller."""
+        client = self.get_client()
+        return paramiko.SFTPClient.from_transport(
+            client.get_transport(), window_size=SFTP_WINDOW_SIZE
+        )
+
+    def __acquire_sftp(self):
+        """Returns an idle SFTP session, opens a new one when there is none."""
+        with self.__pool_cond:
+            while self.__sftp_idle:
+                entry, sftp, _ = self.__sftp_idle.pop()
+                if entry.is_healthy() and not sftp.get_channel().closed:
+                    return entry, sftp
+
+                sftp.close()
+                entry.release()
+
+        entry = self.__acquire_transport()
+        try:
+            sftp = paramiko.SFTPClient.from_transport(
+                entry.transport, window_size=SFTP_WINDOW_SIZE
+            )
+        except BaseException:
+            self.__release_transport(entry)
+            raise
+
+        return entry, sftp
+
+    def __release_sftp(self, entry, sftp):
+        """Keeps the SFTP session open for reuse unless enough are idle."""
+        with self.__pool_cond:
+            if (
+                len(self.__sftp_idle) < SFTP_MAX_SESSIONS
+                and not sftp.get_channel().closed
+            ):
+                self.__sftp_idle.append((entry, sftp, time()))
+                return
+
+            sftp.close()
+            entry.release()
+            self.__pool_cond.notify()
+
+    def __acquire_transport(self):
+        """Returns a pooled transport having a free channel slot."""
+        # Ensures the primary transport is healthy, reconnects otherwise.
+        self.get_client()
+
+        with self.__pool_cond:
+            while True:
+                self.__evict_transports()
+                candidates = [
+                    entry
+                    for entry in [self.__primary] + self.__pool
+                    if entry.channels < self.max_channels and entry.is_healthy()
+                ]
+                if candidates:
+                    entry = min(candidates, key=lambda x: x.channels)
+                    entry.acquire()
+                    return entry
+
+                if 1 + len(self.__pool) + self.__pool_pending < self.max_transports:
+                    self.__pool_pending += 1
+                    break
+
+                self.__pool_cond.wait(CHANNEL_WAIT_INTERVAL)
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.MissingHostKeyPolicy())
+        try:
+            self.__connect(client)
+            client.get_transport().set_keepalive(15)
+        except BaseException:
+            with self.__pool_cond:
+                self.__pool_pending -= 1
+                self.__pool_cond.notify_all()
+            raise
+
+        entry = PooledTransport(client)
+        entry.acquire()
+        with self.__pool_cond:
+            self.__pool_pending -= 1
+            self.__pool.append(entry)
+
+        logger.debug(
+            "Added transport %d of %d for %s@%s",
+            len(self.__pool) + 1,
+            self.max_transports,
+            self.username,
+            self.ip_address,
+        )
+        return entry
+
+    def __release_transport(self, entry):
+        """Returns the channel slot of the given transport to the pool."""
+        with self.__pool_cond:
+            entry.release()
+            self.__pool_cond.notify()
+
+    def __evict_transports(self):
+        """Closes the pooled transports which are dead or idle for long."""
+        for item in list(self.__sftp_idle):
+            entry, sftp, last_used = item
+            if entry.is_healthy() and time() - last_used <= self.idle_timeout:
+                continue
+
+            self.__sftp_idle.remove(item)
+            sftp.close()
+            entry.release()
+
+        for entry in list(self.__pool):
+            if entry.channels:
+                continue
+
+            if entry.is_healthy() and not entry.is_idle(self.idle_timeout):
+                continue
+
+            logger.debug(
+                "Evicting %s transport of %s@%s",
+                "idle" if entry.is_healthy() else "inactive",
+                self.username,
+                self.ip_address,
+            )
+            entry.close()
+            self.__pool.remove(entry)
+
+    def __connect(self, client=None):
+        """Establishes a connection with the remote host using the IP Address.
+
+        Args:
+            client (paramiko.SSHClient): client to be connected, defaults to
+                                         the primary client.
+        """
+        client = client or self.__client
         end_time = datetime.datetime.now() + self.outage_timeout
         last_error = None
         while end_time > datetime.datetime.now():
@@ -1436,7 +1768,7 @@ class SSHConnectionManager(object):
                     connect_kw["passphrase"] = self._private_key_password
                 else:
                     connect_kw["pkey"] = self.pkey
-                self.__client.connect(**connect_kw)
+                client.connect(**connect_kw)
                 logger.info("SSH connected to %s as %s", self.ip_address, self.username)
                 self.__outage_start_time = None
                 return
@@ -1508,6 +1840,15 @@ class SSHConnectionManager(object):
         # pkey (paramiko/cryptography key) is not picklable; recreated in __setstate__
         if pickle_dict.get("pkey") is not None:
             del pickle_dict["pkey"]
+        # Pooled transports and their lock are bound to this process
+        for key in (
+            "__primary",
+            "__pool",
+            "__pool_pending",
+            "__pool_cond",
+            "__sftp_idle",
+        ):
+            pickle_dict.pop(f"_SSHConnectionManager{key}", None)
         return pickle_dict
 
     def __setstate__(self, state):
@@ -1515,10 +1856,14 @@ class SSHConnectionManager(object):
         self.__client = paramiko.SSHClient()
         self.__client.set_missing_host_key_policy(paramiko.MissingHostKeyPolicy())
         self.__transport = None
-        key_path = getattr(self, "_private_key_file_path", "") or ""
-        self.pkey = (
-            self._get_ssh_key(key_path) if self.look_for_keys and key_path else None
-        )
+        self.__primary = PooledTransport(self.__client)
+        self.__pool = []
+        self.__pool_pending = 0
+        self.__pool_cond = threading.Condition()
+        self.__sftp_idle = []
+        # As in __init__, the key file is passed to connect() and not parsed
+        # here, which keeps the unpickling of the nodes free of any I/O.
+        self.pkey = None
 
 
 class CephNode(object):
@@ -1538,6 +1883,9 @@ class CephNode(object):
             ipv4_address, ipv4_subnet  - IPv4 address and subnet (or pass ip_address, subnet)
             ipv6_address, ipv6_subnet  - IPv6 when available (e.g. OpenStack dual-stack)
             use_ipv6                    - when True, ip_address/subnet follow IPv6
+        SSH transport pool (optional, see SSHConnectionManager):
+            ssh_pool                    - dict of max_transports, max_channels
+                                          and idle_timeout overrides
         Derived: ip_address and subnet are the active stack (IPv6 if use_ipv6 and set, else IPv4).
 
         eg CephNode(username='cephuser', password='cephpasswd',
@@ -1562,6 +1910,8 @@ class CephNode(object):
         self.bootstrap_key_password = kw.get("bootstrap_key_password") or ""
         self.root_login = kw["root_login"]
         self.private_ip = kw["private_ip"]
+        # Optional SSHConnectionManager transport pool overrides
+        self.ssh_pool = kw.get("ssh_pool") or {}
 
         # Explicit IPv4 storage (backward compat: ip_address/subnet treated as IPv4)
         self.ipv4_address = kw.get("ipv4_address") or kw.get("ip_address")
@@ -1623,6 +1973,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=self.private_key_password,
+            **self.ssh_pool,
         )
         self.connection = SSHConnectionManager(
             self.ip_address,
@@ -1631,6 +1982,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=self.private_key_password,
+            **self.ssh_pool,
         )
         self.rssh = self.root_connection.get_client
         self.rssh_transport = self.root_connection.get_transport
@@ -1683,6 +2035,20 @@ class CephNode(object):
             if isinstance(ceph_demon, CephDemon) and ceph_demon.is_active
         ]
 
+    @property
+    def needs_bootstrap(self):
+        """True when the node's SSH access is bootstrapped via system SSH.
+
+        OneCloud nodes are reachable only using a certificate which Paramiko
+        does not support until connect() injects the regular key.
+        """
+        return bool(
+            hasattr(self, "vm_node")
+            and getattr(self.vm_node, "node_type", None) == "onecloud"
+            and getattr(self, "bootstrap_key_path", "")
+            and self.private_key_path
+        )
+
     def connect(self):
         """
         connect to ceph instance using paramiko ssh protocol
@@ -1696,12 +2062,7 @@ class CephNode(object):
             )
         )
 
-        _is_onecloud_bootstrap = (
-            hasattr(self, "vm_node")
-            and getattr(self.vm_node, "node_type", None) == "onecloud"
-            and getattr(self, "bootstrap_key_path", "")
-            and self.private_key_path
-        )
+        _is_onecloud_bootstrap = self.needs_bootstrap
 
         if _is_onecloud_bootstrap:
             pass  # skip initial Paramiko connect; subprocess handles it below
@@ -1863,6 +2224,7 @@ class CephNode(object):
                 look_for_keys=True,
                 private_key_file_path=key_path,
                 private_key_password=_key_pw,
+                **self.ssh_pool,
             )
             cephuser_mgr = SSHConnectionManager(
                 self.ip_address,
@@ -1871,6 +2233,7 @@ class CephNode(object):
                 look_for_keys=True,
                 private_key_file_path=key_path,
                 private_key_password=_key_pw,
+                **self.ssh_pool,
             )
             self.root_connection = root_mgr
             self.connection = cephuser_mgr
@@ -1989,7 +2352,7 @@ class CephNode(object):
         cmd = kw["cmd"]
         _end_time = None
         _verbose = kw.get("verbose", False)
-        ssh = self.rssh if kw.get("sudo") else self.ssh
+        connection = self.root_connection if kw.get("sudo") else self.connection
         long_running = kw.get("long_running", False)
         if "timeout" in kw:
             timeout = None if kw["timeout"] == "notimeout" else kw["timeout"]
@@ -1998,72 +2361,69 @@ class CephNode(object):
             timeout = 3600 if kw.get("long_running", False) else 600
 
         try:
-            channel = ssh().get_transport().open_session(timeout=timeout)
-            channel.settimeout(timeout)
-
-            logger.info(
-                "Execute %s on %s [%s]",
-                cmd,
-                self.hostname,
-                self.ip_address,
-            )
-            _exec_start_time = datetime.datetime.now()
-            channel.exec_command(cmd)
+            with connection.session(timeout=timeout) as channel:
+                channel.settimeout(timeout)
 
-            if timeout:
-                _end_time = datetime.datetime.now() + datetime.timedelta(
-                    seconds=timeout
+                logger.info(
+                    "Execute %s on %s [%s]",
+                    cmd,
+                    self.hostname,
+                    self.ip_address,
                 )
+                _exec_start_time = datetime.datetime.now()
+                channel.exec_command(cmd)
 
-            _out = ""
-            _err = ""
-            while not channel.exit_status_ready():
-                # Prevent high resource consumption
-                sleep(1)
+                if timeout:
+                    _end_time = datetime.datetime.now() + datetime.timedelta(
+                        seconds=timeout
+                    )
 
-                # Check the streams for data and log in debug mode only if it
-                # is a long running command else don't log.
+                # Log the stream data in debug mode only if it is a long running
+                # command else don't log.
                 # Fixme: logging must happen in debug irrespective of type.
                 _verbose = True if long_running else _verbose
-                if channel.recv_ready():
-                    _out += read_stream(channel, _end_time, timeout, log=_verbose)
-
-                if channel.recv_stderr_ready():
-                    _err += read_stream(
-                        channel, _end_time, timeout, stderr=True, log=_verbose
-                    )
+                _out = bytearray()
+                _err = bytearray()
+                _grace_end = None
+                while True:
+                    # No data follows the EOF, the streams are drained once more
+                    _eof = channel.eof_received or channel.closed
+                    _out += read_stream(channel, log=_verbose)
+                    _err += read_stream(channel, stderr=True, log=_verbose)
+                    if _eof:
+                        break
 
-                check_timeout(_end_time, timeout)
+                    if channel.exit_status_ready():
+                        _grace_end = _grace_end or datetime.datetime.now() + (
+                            datetime.timedelta(seconds=EOF_GRACE_TIMEOUT)
+                        )
+                        if datetime.datetime.now() > _grace_end:
+                            logger.debug(
+                                "No EOF within %ds of the exit of %s",
+                                EOF_GRACE_TIMEOUT,
+                                cmd,
+                            )
+                            break
 
-            _time = (datetime.datetime.now() - _exec_start_time).total_seconds()
-            logger.info(
-                "Execution of %s took %s seconds on %s by user %s [%s]",
-                cmd,
-                str(_time),
-                self.hostname,
-                channel.get_transport().get_username(),
-                self.ip_address,
-            )
+                    check_timeout(_end_time, timeout)
+                    wait_for_channel(channel, CHANNEL_WAIT_INTERVAL)
 
-            # Check for data residues in the channel streams. This is required for the following reasons
-            #   - exit_ready and first line is blank causing data to be None
-            #   - race condition between data read and exit ready
-            try:
-                _new_timeout = datetime.datetime.now() + datetime.timedelta(seconds=10)
-                _out += read_stream(channel, _new_timeout, timeout=True)
-                _err += read_stream(channel, _new_timeout, timeout=True, stderr=True)
-            except CommandFailed:
-                logger.debug("Encountered a timeout during read post execution.")
-            except BaseException as be:
-                logger.debug("Encountered an unknown exception during last read.\n", be)
+                _time = (datetime.datetime.now() - _exec_start_time).total_seconds()
+                logger.info(
+                    "Execution of %s took %s seconds on %s by user %s [%s]",
+                    cmd,
+                    str(_time),
+                    self.hostname,
+                    channel.get_transport().get_username(),
+                    self.ip_address,
+                )
 
-            _exit = channel.recv_exit_status()
-            return _out, _err, _exit, _time
+                _exit = wait_exit_status(channel, _end_time, cmd)
+                return decode_stream(_out), decode_stream(_err), _exit, _time
         except socket.timeout as terr:
             logger.error("%s failed to execute within %d seconds.", cmd, timeout)
             raise SocketTimeoutException(terr)
         except TimeoutException as tex:
-            channel.close()
             logger.error("%s failed to execute within %ds.", cmd, timeout)
             raise CommandFailed(tex)
         except BaseException as be:  # noqa
@@ -2138,14 +2498,100 @@ class CephNode(object):
 
         return _out, _err
 
+    def stream_command(self, cmd, fp, sudo=False, timeout=3600, max_bytes=None):
+        """Executes the command writing its output to a local file as it arrives.
+
+        The output is not buffered in memory, which suits commands producing
+        archives such as tar. The command is stopped once its output exceeds
+        max_bytes, the file then holds the first max_bytes of the output.
+
+        Args:
+            cmd (str): command whose stdout is streamed
+            fp: local file object opened in binary mode
+            sudo (bool): use root access
+            timeout (int): max time in seconds for the command to complete
+            max_bytes (int): max bytes of the output written to the file
+
+        Returns:
+            tuple of the bytes written, stderr, exit code and duration, the exit
+            code is None when the output was cut at max_bytes or its end was not
+            received within EOF_GRACE_TIMEOUT of the exit of the command
+
+        Raises:
+            CommandFailed: when the command exceeds the timeout or its exit
+                status does not follow the end of its output
+        """
+        connection = self.root_connection if sudo else self.connection
+        _start, _end_time = time(), None
+        if timeout:
+            _end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+
+        size, _err, _exit = 0, bytearray(), None
+        with connection.session(timeout=timeout) as channel:
+            channel.settimeout(timeout)
+            logger.info("Stream %s on %s [%s]", cmd, self.hostname, self.ip_address)
+            channel.exec_command(cmd)
+            _grace_end = None
+            while True:
+                _eof = channel.eof_received or channel.closed
+                _out = read_stream(channel, log=False)
+                _err += read_stream(channel, stderr=True, log=False)
+                if max_bytes and size + len(_out) > max_bytes:
+                    fp.write(_out[: max_bytes - size])
+                    size = max_bytes
+                    logger.warning(
+                        "Output of %s on %s cut at %d bytes", cmd, self.hostname, size
+                    )
+                    break
+
+                fp.write(_out)
+                size += len(_out)
+
+                # No data follows the EOF, the output is complete
+                if _eof:
+                    _exit = wait_exit_status(channel, _end_time, cmd)
+                    break
+
+                if channel.exit_status_ready():
+                    _grace_end = _grace_end or datetime.datetime.now() + (
+                        datetime.timedelta(seconds=EOF_GRACE_TIMEOUT)
+                    )
+                    if datetime.datetime.now() > _grace_end:
+                        logger.warning(
+                            "Output of %s on %s not received in full",
+                            cmd,
+                            self.hostname,
+                        )
+                        break
+
+                try:
+                    check_timeout(_end_time, timeout)
+                except TimeoutException as tex:
+                    logger.error("%s failed to execute within %ds.", cmd, timeout)
+                    raise CommandFailed(tex)
+
+                wait_for_channel(channel, CHANNEL_WAIT_INTERVAL)
+
+        return size, decode_stream(_err), _exit, time() - _start
+
     def remote_file(self, **kw):
         """Return contents of the remote file."""
-        client = self.rssh if kw.get("sudo", False) else self.ssh
+        connection = self.root_connection if kw.get("sudo", False) else self.connection
         file_name = kw["file_name"]
         file_mode = kw["file_mode"]
-        ftp = client().open_sftp()
+        ftp = connection.open_sftp()
         remote_file = ftp.file(file_name, file_mode, -1)
 
+        # The session is dedicated to the file, it is closed along with it
+        _close = remote_file.close
+
+        def close():
+            try:
+                _close()
+            finally:
+                ftp.close()
+
+        remote_file.close = close
         return remote_file
 
     def _keep_alive(self):
@@ -2184,6 +2630,7 @@ class CephNode(object):
 
     def __setstate__(self, pickle_dict):
         self.__dict__.update(pickle_dict)
+        self.ssh_pool = getattr(self, "ssh_pool", {})
         key_pw = getattr(self, "private_key_password", None)
         self.root_connection = SSHConnectionManager(
             self.ip_address,
@@ -2192,6 +2639,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=key_pw,
+            **self.ssh_pool,
         )
         self.connection = SSHConnectionManager(
             self.ip_address,
@@ -2200,6 +2648,7 @@ class CephNode(object):
             look_for_keys=self.look_for_key,
             private_key_file_path=self.private_key_path,
             private_key_password=key_pw,
+            **self.ssh_pool,
         )
         self.rssh = self.root_connection.get_client
         self.ssh = self.connection.get_client
@@ -2632,14 +3081,13 @@ class CephNode(object):
             dir_path (str): Directory path to get direcotry list
             sudo (bool): Use root access
         """
-        client = self.rssh if sudo else self.ssh
+        connection = self.root_connection if sudo else self.connection
         try:
-            return client().open_sftp().listdir(dir_path)
+            with connection.sftp() as sftp:
+                return sftp.listdir(dir_path)
         except FileNotFoundError:
             logger.info(f"Dir path '{dir_path}' not present")
             return None
-        except Exception as e:
-            raise e
 
     def get_listdir_attr(self, dir_path, sudo=False):
         """Lists directory attributes from node
@@ -2648,14 +3096,28 @@ class CephNode(object):
             dir_path (str): Directory path to get direcotry attributes
             sudo (bool): Use root access
         """
-        client = self.rssh if sudo else self.ssh
+        connection = self.root_connection if sudo else self.connection
         try:
-            return client().open_sftp().listdir_attr(dir_path)
+            with connection.sftp() as sftp:
+                return sftp.listdir_attr(dir_path)
         except FileNotFoundError:
             logger.info(f"Dir path '{dir_path}' not present")
             return None
-        except Exception as e:
-            raise e
+
+    def _transfer_stats(self, action, src, dst, size, elapsed):
+        """Logs and returns the throughput of a file transfer."""
+        rate = size / elapsed if elapsed else 0
+        logger.info(
+            f"{action} {src} to {dst} on {self.hostname}: {size} bytes in "
+            f"{elapsed:.2f}s ({rate / 1024 / 1024:.2f} MiB/s)"
+        )
+        return {
+            "src": src,
+            "dst": dst,
+            "bytes": size,
+            "elapsed": round(elapsed, 3),
+            "throughput": rate,
+        }
 
     def upload_file(self, src, dst, sudo=False):
         """Put file to remote location
@@ -2664,20 +3126,77 @@ class CephNode(object):
             src (str): Source file location
             dst (str): File destination location
             sudo (bool): Use root access
+
+        Returns:
+            dict: size, time and throughput of the transfer
         """
-        client = self.rssh if sudo else self.ssh
-        client().open_sftp().put(src, dst)
+        connection = self.root_connection if sudo else self.connection
+        _start = time()
+        with connection.sftp() as sftp:
+            # The writes are pipelined by paramiko
+            attrs = sftp.put(src, dst)
+
+        return self._transfer_stats(
+            "Uploaded", src, dst, attrs.st_size, time() - _start
+        )
 
     def download_file(self, src, dst, sudo=False):
         """Get file from remote location
 
+        The reads are prefetched, with a bounded number of requests in flight.
+
         Args:
             src (str): Source file remote location
             dst (str): File destination location
             sudo (bool): Use root access
+
+        Returns:
+            dict: size, time and throughput of the transfer
+        """
+        connection = self.root_connection if sudo else self.connection
+        _start = time()
+        with connection.sftp() as sftp:
+            sftp.get(src, dst, max_concurrent_prefetch_requests=SFTP_PREFETCH_REQUESTS)
+
+        return self._transfer_stats(
+            "Downloaded", src, dst, os.path.getsize(dst), time() - _start
+        )
+
+    def _transfer_files(self, transfer, files, sudo, max_workers):
+        files = list(files)
+        if not files:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            futures = [executor.submit(transfer, src, dst, sudo) for src, dst in files]
+
+        return [future.result() for future in futures]
+
+    def upload_files(self, files, sudo=False, max_workers=SFTP_WORKERS):
+        """Put files to remote locations concurrently
+
+        Args:
+            files (list): Tuples of the source file and its destination location
+            sudo (bool): Use root access
+            max_workers (int): Files transferred concurrently
+
+        Returns:
+            list: size, time and throughput of the transfers
+        """
+        return self._transfer_files(self.upload_file, files, sudo, max_workers)
+
+    def download_files(self, files, sudo=False, max_workers=SFTP_WORKERS):
+        """Get files from remote locations concurrently
+
+        Args:
+            files (list): Tuples of the remote source file and its destination location
+            sudo (bool): Use root access
+            max_workers (int): Files transferred concurrently
+
+        Returns:
+            list: size, time and throughput of the transfers
         """
-        client = self.rssh if sudo else self.ssh
-        client().open_sftp().get(src, dst)
+        return self._transfer_files(self.download_file, files, sudo, max_workers)
 
     def create_dirs(self, dir_path, sudo=False):
         """Create directory on node
@@ -2685,9 +3204,10 @@ class CephNode(object):
             dir_path (str): Directory path to create
             sudo (bool): Use root access
         """
-        client = self.rssh if sudo else self.ssh
+        connection = self.root_connection if sudo else self.connection
         try:
-            client().open_sftp().mkdir(dir_path)
+            with connection.sftp() as sftp:
+                sftp.mkdir(dir_path)
         except Exception:
             # Error happens when the directory already exists
             logger.info("mkdir failed, retrying with -p param")
@@ -2700,9 +3220,10 @@ class CephNode(object):
             file_path (str): file path to delete
             sudo (bool): use root access
         """
-        client = self.rssh if sudo else self.ssh
+        connection = self.root_connection if sudo else self.connection
         try:
-            client().open_sftp().remove(file_path)
+            with connection.sftp() as sftp:
+                sftp.remove(file_path)
         except Exception:
             logger.info("rm failed, retrying with -rvf param")
             cmd = f"rm -rvf {file_path}"
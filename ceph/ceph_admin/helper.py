@@ -8,7 +8,7 @@ import tempfile
 from datetime import datetime, timedelta
 from os.path import dirname
 from time import sleep
-from typing import Optional
+from typing import Dict, Optional
 
 from dateutil import parser
 from jinja2 import Template
@@ -20,6 +20,8 @@ from utility.log import Log
 from utility.ssl_certs import CertificateGenerator
 from utility.utils import generate_self_signed_certificate
 
+from .poller import get_orch_poller, service_running
+
 LOG = Log(__name__)
 
 
@@ -1160,51 +1162,61 @@ def check_service_exists(
         Boolean: True if the service and the list of daemons are running else False.
 
     """
-    end_time = datetime.now() + timedelta(seconds=timeout)
-    cmd_args = ["cephadm", "shell", "--", "ceph", "orch", "ls"]
-    if service_name:
-        cmd_args += ["--service_name", service_name]
-
-    # Due to a BZ, the running field is always 0 for RGW daemon. This has been fixed in
-    # the later release.
-    if rhcs_version and rhcs_version == "5.0" and service_type == "rgw":
-        cmd_args += ["--format", "json", "--refresh"]
-    else:
-        cmd_args += ["--service_type", service_type, "--format", "json", "--refresh"]
-
-    _retries = 3  # cross-verification retries
-    _count = 0
-    while end_time > datetime.now():
-        sleep(interval)
-        out, _ = installer.exec_command(
-            sudo=True, cmd=" ".join(cmd_args), check_ec=True
-        )
-        if "No services reported" in out:
-            LOG.warning(out)
-            continue
-        out = json.loads(out)[0]
-        running = out["status"]["running"]
-        count = out["status"]["size"]
+    return validate_services(
+        installer,
+        [(service_name, service_type)],
+        timeout=timeout,
+        interval=interval,
+        rhcs_version=rhcs_version,
+    )[(service_name, service_type)]
 
-        LOG.info(f"{running}/{count} {service_name or service_type} up... retrying")
 
-        if count + running < 1:
-            continue
+def validate_services(
+    installer,
+    services,
+    timeout: int = 1800,
+    interval: int = 20,
+    rhcs_version: Optional[LooseVersion] = None,
+) -> Dict:
+    """
+    Verify the services are running, all of them checked from the same orch polls.
 
-        if count == running and _count == count:
-            if _retries < 1:
-                return True
-            _retries -= 1
+    Args:
+        installer (CephNode): ceph installer node
+        services (List): The (service name, service type) of the services
+        timeout (int):  In seconds, the maximum allowed time (default=1800)
+        interval (int): In seconds, the polling interval time (default=20)
+        rhcs_version (LooseVersion):  RHCS version
 
-        if _count != count:
-            _count = count
-            _retries = 3
+    Returns:
+        Dict: True for the services whose daemons are all running else False.
+    """
+    predicates = dict()
+    for service_name, service_type in services:
+        # Due to a BZ, the running field is always 0 for RGW daemon. This has been fixed in
+        # the later release.
+        _type = service_type
+        if rhcs_version and rhcs_version == "5.0" and service_type == "rgw":
+            _type = None
+        predicates[(service_name, service_type)] = service_running(service_name, _type)
+
+    poller = get_orch_poller(installer)
+    results = poller.wait_all(
+        predicates, timeout=timeout, interval=interval, newer_than=datetime.now()
+    )
 
     # Identify the failure
-    out, err = installer.exec_command(sudo=True, cmd=" ".join(cmd_args))
-    out = json.loads(out)
-    LOG.error(f"{service_name or service_type} failed with \n{out[0].get('events')}")
-    return False
+    snapshot = poller.latest()
+    for (service_name, service_type), running in results.items():
+        if running:
+            continue
+        service = snapshot.service(service_name, service_type) if snapshot else None
+        LOG.error(
+            f"{service_name or service_type} failed with \n"
+            f"{(service or {}).get('events')}"
+        )
+
+    return results
 
 
 def validate_spec_services(installer, specs, rhcs_version) -> None:
@@ -1217,6 +1229,7 @@ def validate_spec_services(installer, specs, rhcs_version) -> None:
         rhcs_version    The version of Ceph
     """
     LOG.info("Validating spec services")
+    services = list()
     for spec in specs:
         svc_type = spec["service_type"]
         svc_id = spec.get("service_id")
@@ -1229,12 +1242,11 @@ def validate_spec_services(installer, specs, rhcs_version) -> None:
         if svc_id:
             svc_name = f"{svc_type}.{spec['service_id']}"
 
-        if not check_service_exists(
-            installer=installer,
-            service_name=svc_name,
-            service_type=svc_type,
-            rhcs_version=rhcs_version,
-        ):
+        services.append((svc_name, svc_type))
+
+    results = validate_services(installer, services, rhcs_version=rhcs_version)
+    for (svc_name, svc_type), running in results.items():
+        if not running:
             raise Exception(f"{svc_name or svc_type} service deployment failed!!!")
 
 
@@ -4,9 +4,8 @@ Module that interacts with the orchestrator CLI.
 Provide the interfaces to ceph orch and in turn manage the orchestration engine.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from json import loads
-from time import sleep
 
 from dateutil import parser
 
@@ -18,6 +17,7 @@ from .common import config_dict_to_string
 from .helper import GenerateServiceSpec, validate_spec_services
 from .ls import LSMixin
 from .pause import PauseMixin
+from .poller import get_orch_poller, service_exists
 from .ps import PSMixin
 from .reconfig import ReconfigMixin
 from .redeploy import RedeployMixin
@@ -89,6 +89,7 @@ class Orch(
         """
         check service existence based on the exist parameter.
         if exist is set, then validate its presence. otherwise, for its removal.
+        The services are polled by the orch poller shared by the waiters of the cluster.
 
         Args:
             service_name (Str): service name
@@ -100,23 +101,13 @@ class Orch(
             Boolean
 
         """
-        end_time = datetime.now() + timedelta(seconds=timeout)
-
-        while end_time > datetime.now():
-            sleep(interval)
-            out, err = self.ls({"base_cmd_args": {"format": "json"}})
-            out = loads(out)
-            service = [
-                d["service_name"] for d in out if d.get("service_name") == service_name
-            ]
-
-            if service_name not in service and not exist:
-                return True
-            elif service_name in service and exist:
-                return True
-            LOG.info("[%s] check for existence: %s, retrying" % (service_name, exist))
-
-        return False
+        LOG.info("[%s] check for existence: %s" % (service_name, exist))
+        return get_orch_poller(self.installer).wait(
+            service_exists(service_name, exist),
+            timeout=timeout,
+            interval=interval,
+            newer_than=datetime.now(),
+        )
 
     def check_service_restart(
         self,
@@ -10,6 +10,7 @@ from utility.log import Log
 from .apply import ApplyMixin
 from .common import config_dict_to_string
 from .orch import Orch
+from .poller import get_orch_poller
 
 LOG = Log(__name__)
 
@@ -89,21 +90,9 @@ class OSD(ApplyMixin, Orch):
         super().apply(config)
 
         # validate of osd(s)
-        interval = 5
-        timeout = self.TIMEOUT
-        checks = timeout / interval
-
-        while checks:
-            checks -= 1
-
-            out, _ = self.shell(
-                args=["ceph", "orch", "ps", "-f", "json-pretty"],
-            )
-
-            out = json.loads(out)
-            daemons = [i for i in out if i.get("daemon_type") == "osd"]
-
-            deployed = 0
+        def deployed(snapshot):
+            daemons = snapshot.daemons_of(daemon_type="osd")
+            nodes = 0
             for node, devices in node_device_dict.items():
                 count = 0
                 for dmn in daemons:
@@ -113,16 +102,22 @@ class OSD(ApplyMixin, Orch):
                 count = count - len(devices["unavailable"])
 
                 LOG.info(
-                    "%s %s/%s osd daemon(s) up... Retries: %s"
-                    % (node, count, len(devices["available"]), checks)
+                    "%s %s/%s osd daemon(s) up..."
+                    % (node, count, len(devices["available"]))
                 )
                 if count == len(devices["available"]):
-                    deployed += 1
-
-            if deployed == len(node_device_dict):
-                return
-
-            sleep(interval)
+                    nodes += 1
+
+            return nodes == len(node_device_dict)
+
+        if get_orch_poller(self.installer).wait(
+            deployed,
+            timeout=self.TIMEOUT,
+            interval=5,
+            newer_than=datetime.datetime.now(),
+            daemons=True,
+        ):
+            return
 
         raise OSDServiceFailure("OSDs are not up and running in hosts")
 
@@ -0,0 +1,386 @@
+"""
+Shared poller of the orchestrator services and daemons of a cluster.
+
+The cephadm waiters used to poll 'ceph orch ls' independently, a spec with
+eight services meant eight polling loops, each starting a cephadm shell per
+iteration. A poller is created once per cluster and fetches 'ceph orch ls'
+and 'ceph orch ps' in a single cephadm shell per interval, however many
+waiters are waiting on it. The waiters subscribe a predicate on the snapshot,
+which is evaluated against every new snapshot, the waiters of the different
+services of a deployment are thereby satisfied by the same polls.
+
+Example:
+    poller = get_orch_poller(installer)
+    poller.wait(service_running("rgw.foo"), timeout=600)
+    poller.wait_all(
+        {name: service_running(name) for name in ["mon", "mgr", "rgw.foo"]}
+    )
+"""
+
+import json
+from datetime import datetime, timedelta
+from threading import Condition, Lock
+from typing import Callable, Dict, Optional
+
+from dateutil import parser
+
+from utility.log import Log
+
+LOG = Log(__name__)
+
+# Separates the output of orch ls and orch ps fetched in the same cephadm shell
+SNAPSHOT_SEPARATOR = "CEPHCI_ORCH_PS"
+
+# Consecutive snapshots a service has to be running with the same size
+STABLE_POLLS = 3
+
+_pollers = dict()
+_pollers_lock = Lock()
+
+
+def _load_json(out):
+    """Returns the list parsed from the orch output, empty when none reported."""
+    try:
+        return json.loads(out) if out.strip() else []
+    except ValueError:
+        LOG.warning(out.strip())
+        return []
+
+
+class OrchSnapshot:
+    """Services and daemons reported by the orchestrator at a point in time."""
+
+    def __init__(self, time: datetime, services: list, daemons: Optional[list]):
+        self.time = time
+        self.services = services
+        self.daemons = daemons
+
+    def service(self, service_name=None, service_type=None) -> Optional[Dict]:
+        """Returns the first service matching the name and type, None if absent."""
+        for service in self.services:
+            if service_name and service.get("service_name") != service_name:
+                continue
+            if service_type and service.get("service_type") != service_type:
+                continue
+            return service
+
+        return None
+
+    def daemons_of(self, service_name=None, daemon_type=None, hostname=None) -> list:
+        """Returns the daemons matching the service name, daemon type and host."""
+        daemons = []
+        for daemon in self.daemons or []:
+            if service_name and daemon.get("service_name") != service_name:
+                continue
+            if daemon_type and daemon.get("daemon_type") != daemon_type:
+                continue
+            if hostname and daemon.get("hostname") != hostname:
+                continue
+            daemons.append(daemon)
+
+        return daemons
+
+    def changes(self, previous) -> list:
+        """Returns the changes of the services and daemons since the previous snapshot."""
+        changes = []
+
+        def _services(snapshot):
+            return {
+                svc.get("service_name"): "{running}/{size}".format(
+                    running=svc.get("status", {}).get("running"),
+                    size=svc.get("status", {}).get("size"),
+                )
+                for svc in snapshot.services
+            }
+
+        def _daemons(snapshot):
+            return {
+                dmn.get("daemon_name")
+                or f"{dmn.get('daemon_type')}.{dmn.get('daemon_id')}": dmn.get(
+                    "status_desc"
+                )
+                for dmn in snapshot.daemons or []
+            }
+
+        pairs = [(_services(previous), _services(self), "running")]
+        if previous.daemons is not None and self.daemons is not None:
+            pairs.append((_daemons(previous), _daemons(self), "status"))
+
+        for old, new, field in pairs:
+            for name in sorted(set(old) | set(new)):
+                if name not in old:
+                    changes.append(f"{name} added, {field} {new[name]}")
+                elif name not in new:
+                    changes.append(f"{name} removed")
+                elif old[name] != new[name]:
+                    changes.append(f"{name} {field} {old[name]} -> {new[name]}")
+
+        return changes
+
+
+def service_exists(service_name: str, exist: bool = True) -> Callable:
+    """Predicate satisfied when the presence of the service matches exist."""
+
+    def predicate(snapshot):
+        return (snapshot.service(service_name) is not None) == exist
+
+    return predicate
+
+
+def service_running(
+    service_name: Optional[str] = None,
+    service_type: Optional[str] = None,
+    stable: int = STABLE_POLLS,
+) -> Callable:
+    """
+    Predicate satisfied when all the daemons of the service are running.
+
+    The running count has to match the size of the service in more than
+    stable consecutive snapshots without the size changing.
+    """
+    state = {"size": 0, "retries": stable}
+
+    def predicate(snapshot):
+        service = snapshot.service(service_name, service_type)
+        if not service:
+            LOG.info(f"{service_name or service_type} not reported yet... retrying")
+            return False
+
+        running = service["status"]["running"]
+        count = service["status"]["size"]
+        LOG.info(f"{running}/{count} {service_name or service_type} up... retrying")
+
+        if count + running < 1:
+            return False
+
+        if count == running and state["size"] == count:
+            if state["retries"] < 1:
+                return True
+            state["retries"] -= 1
+
+        if state["size"] != count:
+            state["size"] = count
+            state["retries"] = stable
+
+        return False
+
+    return predicate
+
+
+def refreshed_after(service_name: str, time: datetime) -> Callable:
+    """Predicate satisfied when the service has been refreshed after the time."""
+
+    def predicate(snapshot):
+        service = snapshot.service(service_name)
+        if not service or not service["status"].get("last_refresh"):
+            return False
+
+        last_refresh = parser.parse(service["status"]["last_refresh"])
+        return last_refresh.replace(tzinfo=None) >= time
+
+    return predicate
+
+
+class OrchPoller:
+    """
+    Polls the orchestrator of a cluster on behalf of any number of waiters.
+
+    There is no polling thread, the first waiter needing a newer snapshot
+    polls the orchestrator while the others wait for the snapshot it fetches.
+    A poll happens only when the earliest of the pending waiters is due.
+    """
+
+    def __init__(self, installer):
+        """
+        Initialize the poller.
+
+        Args:
+            installer (CephNode): node having the cephadm package
+        """
+        self.installer = installer
+        self._snapshot = None
+        self._polling = False
+        self._requests = []
+        self._listeners = []
+        self._cond = Condition()
+
+    def subscribe(self, callback: Callable) -> None:
+        """Calls back with the previous snapshot, the new one and their changes."""
+        with self._cond:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        with self._cond:
+            self._listeners.remove(callback)
+
+    def _poll(self, daemons: bool) -> OrchSnapshot:
+        """Fetches the services, and the daemons if needed, in one cephadm shell."""
+        cmd = "ceph orch ls --format json --refresh"
+        if daemons:
+            cmd += f"; echo; echo {SNAPSHOT_SEPARATOR}; ceph orch ps --format json"
+
+        time = datetime.now()
+        out, _ = self.installer.exec_command(
+            sudo=True, cmd=f"cephadm shell -- bash -c '{cmd}'", check_ec=True
+        )
+        services, _, daemons_out = out.partition(SNAPSHOT_SEPARATOR)
+
+        return OrchSnapshot(
+            time=time,
+            services=_load_json(services),
+            daemons=_load_json(daemons_out) if daemons else None,
+        )
+
+    def _notify(self, previous, snapshot):
+        if not previous:
+            return
+
+        changes = snapshot.changes(previous)
+        for change in changes:
+            LOG.info(f"orch: {change}")
+
+        if changes:
+            for callback in list(self._listeners):
+                callback(previous, snapshot, changes)
+
+    def _satisfies(self, request) -> bool:
+        """Whether the latest snapshot satisfies the (not before, daemons) request."""
+        not_before, daemons = request
+        return bool(
+            self._snapshot
+            and self._snapshot.time >= not_before
+            and (not daemons or self._snapshot.daemons is not None)
+        )
+
+    def snapshot(
+        self,
+        not_before: Optional[datetime] = None,
+        deadline: Optional[datetime] = None,
+        daemons: bool = False,
+    ) -> Optional[OrchSnapshot]:
+        """
+        Returns a snapshot taken at or after not_before.
+
+        Args:
+            not_before (datetime): the earliest time of the snapshot, any if None
+            deadline (datetime): time after which the poller is not waited on
+            daemons (bool): the snapshot has to include the daemons
+
+        Returns:
+            OrchSnapshot, None if the deadline passed first
+        """
+        request = (not_before or datetime.min, daemons)
+        with self._cond:
+            self._requests.append(request)
+            self._cond.notify_all()
+
+        try:
+            while True:
+                with self._cond:
+                    if self._satisfies(request):
+                        return self._snapshot
+
+                    now = datetime.now()
+                    if deadline and now >= deadline:
+                        return None
+
+                    # Requests satisfied are not removed yet by their waiters
+                    pending = [
+                        _req for _req in self._requests if not self._satisfies(_req)
+                    ]
+                    due = min(_not_before for _not_before, _ in pending)
+                    if self._polling or due > now:
+                        wait = None if self._polling else due - now
+                        if deadline:
+                            wait = min(wait or deadline - now, deadline - now)
+                        self._cond.wait(wait.total_seconds() if wait else None)
+                        continue
+
+                    self._polling = True
+                    fetch_daemons = any(_daemons for _, _daemons in pending)
+
+                snapshot = None
+                try:
+                    snapshot = self._poll(fetch_daemons)
+                finally:
+                    with self._cond:
+                        self._polling = False
+                        if snapshot:
+                            previous, self._snapshot = self._snapshot, snapshot
+                            self._notify(previous, snapshot)
+                        self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._requests.remove(request)
+
+    def wait(
+        self,
+        predicate: Callable,
+        timeout: int = 300,
+        interval: int = 5,
+        newer_than: Optional[datetime] = None,
+        daemons: bool = False,
+    ) -> bool:
+        """
+        Waits until the predicate is satisfied by a snapshot.
+
+        Args:
+            predicate (Callable): called with the snapshots until it returns True
+            timeout (int): In seconds, the maximum allowed time
+            interval (int): In seconds, the interval between the snapshots
+            newer_than (datetime): time the first snapshot has to be taken after
+            daemons (bool): the predicate needs the daemons of the snapshots
+
+        Returns:
+            Boolean: True if the predicate was satisfied before the timeout
+        """
+        return self.wait_all(
+            {None: predicate},
+            timeout=timeout,
+            interval=interval,
+            newer_than=newer_than,
+            daemons=daemons,
+        )[None]
+
+    def wait_all(
+        self,
+        predicates: Dict,
+        timeout: int = 300,
+        interval: int = 5,
+        newer_than: Optional[datetime] = None,
+        daemons: bool = False,
+    ) -> Dict:
+        """
+        Waits until all the predicates are satisfied, each evaluated on the same snapshots.
+
+        Returns:
+            Dict: whether each of the predicates was satisfied before the timeout
+        """
+        deadline = datetime.now() + timedelta(seconds=timeout)
+        not_before = newer_than or datetime.now() - timedelta(seconds=interval)
+        results = {key: False for key in predicates}
+
+        while not all(results.values()):
+            snapshot = self.snapshot(not_before, deadline, daemons)
+            if not snapshot:
+                break
+
+            for key, predicate in predicates.items():
+                if not results[key]:
+                    results[key] = bool(predicate(snapshot))
+            not_before = snapshot.time + timedelta(seconds=interval)
+
+        return results
+
+    def latest(self) -> Optional[OrchSnapshot]:
+        """Returns the latest snapshot without polling."""
+        return self._snapshot
+
+
+def get_orch_poller(installer) -> OrchPoller:
+    """Returns the poller of the cluster of the installer, created on first use."""
+    node = getattr(installer, "node", installer)
+    with _pollers_lock:
+        if node.ip_address not in _pollers:
+            _pollers[node.ip_address] = OrchPoller(node)
+        return _pollers[node.ip_address]
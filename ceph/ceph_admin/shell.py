@@ -1,8 +1,38 @@
-"""Interface to cephadm shell CLI."""
+"""Interface to cephadm shell CLI.
 
+Every invocation of ``cephadm shell -- <cmd>`` starts a new container which
+takes a few seconds. When the persistent shell mode is enabled on the cluster
+(``--custom-config persistent_shell=true``), a single ``cephadm shell``
+container is started per installer node and kept alive for the run. Given a
+command, cephadm does not keep the stdin of the container open, hence the
+container runs a sleep and a shell is attached to it using ``podman exec -i``.
+The commands are written to that shell over the SSH channel and the output of
+each command is framed using a unique marker which also carries the exit code.
+
+The regular behaviour is used when base command arguments are provided, for
+long running commands, when the session is busy with another thread or when
+the container dies. It is also used for the commands having shell operators,
+such as pipes and redirections, which would otherwise run in the container
+instead of on the installer node.
+"""
+
+import atexit
+import base64
+import datetime
+import json
+import shlex
+import threading
 from copy import deepcopy
 from typing import Dict, List
+from uuid import uuid4
 
+from ceph.ceph import (
+    CHANNEL_WAIT_INTERVAL,
+    CommandFailed,
+    decode_stream,
+    read_stream,
+    wait_for_channel,
+)
 from utility.log import Log
 
 from .common import config_dict_to_string
@@ -10,6 +40,253 @@ from .typing_ import CephAdmProtocol
 
 LOG = Log(__name__)
 BASE_CMD = ["cephadm", "shell"]
+# The token of the command identifies the container among the running ones
+CONTAINER_CMD = "cephadm shell -- bash -c 'exec sleep infinity' {token}"
+SESSION_CMD = "podman exec -i {container} bash --noprofile --norc"
+SESSION_START_TIMEOUT = 300
+
+_sessions = dict()
+_sessions_lock = threading.Lock()
+
+
+def has_shell_operators(cmd):
+    """Returns True if the command has unquoted shell operators, like a pipe.
+
+    Given to ``cephadm shell -- <cmd>``, the host shell interprets those
+    operators, the part of the command after them runs on the host.
+    """
+    lexer = shlex.shlex(cmd, posix=True, punctuation_chars=True)
+    try:
+        return any(
+            token and set(token) <= set(lexer.punctuation_chars) for token in lexer
+        )
+    except ValueError:
+        # Unbalanced quotes are left to the host shell to report
+        return True
+
+
+class ShellSessionError(Exception):
+    """Raised when the persistent shell session is not usable."""
+
+    pass
+
+
+class PersistentShell:
+    """Long-lived cephadm shell container on a node."""
+
+    def __init__(self, node):
+        """
+        Args:
+            node (CephNode): node on which the container is started
+        """
+        self.node = node
+        self.lock = threading.Lock()
+        self.failed = False
+        self.container = None
+        self._container_channel = None
+        self._channel = None
+
+    @property
+    def alive(self):
+        return bool(
+            self._channel
+            and not self._channel.exit_status_ready()
+            and not self._container_channel.exit_status_ready()
+        )
+
+    def _find_container(self, token):
+        """Returns the id of the running container whose command has the token."""
+        out, _ = self.node.exec_command(
+            sudo=True, cmd="podman ps --format json", check_ec=False
+        )
+        for container in json.loads(out or "[]"):
+            command = container.get("Command") or []
+            if isinstance(command, list):
+                command = " ".join(command)
+            if token in command:
+                return container["Id"]
+
+        return None
+
+    def start(self):
+        """Starts the container and attaches a shell to it."""
+        LOG.info(f"Starting persistent cephadm shell on {self.node.hostname}")
+        token = f"cephci-shell-{uuid4().hex}"
+        transport = self.node.rssh().get_transport()
+
+        # The pty ties the container to the channel, it is stopped with it
+        self._container_channel = transport.open_session(timeout=SESSION_START_TIMEOUT)
+        self._container_channel.get_pty()
+        self._container_channel.exec_command(CONTAINER_CMD.format(token=token))
+
+        end_time = datetime.datetime.now() + datetime.timedelta(
+            seconds=SESSION_START_TIMEOUT
+        )
+        while True:
+            if self._container_channel.exit_status_ready():
+                raise ShellSessionError("cephadm shell container exited.")
+
+            self.container = self._find_container(token)
+            if self.container:
+                break
+
+            if datetime.datetime.now() >= end_time:
+                raise ShellSessionError("cephadm shell container did not start.")
+            self._container_channel.status_event.wait(CHANNEL_WAIT_INTERVAL)
+            read_stream(self._container_channel, log=False)
+
+        self._channel = transport.open_session(timeout=SESSION_START_TIMEOUT)
+        self._channel.exec_command(SESSION_CMD.format(container=self.container))
+        self._execute("true", SESSION_START_TIMEOUT)
+
+    def close(self):
+        """Stops the container along with its shell."""
+        if self.container:
+            try:
+                self.node.exec_command(
+                    sudo=True,
+                    cmd=f"podman rm -f {self.container}",
+                    check_ec=False,
+                    timeout=60,
+                )
+            except Exception:  # noqa
+                pass
+
+        for channel in (self._channel, self._container_channel):
+            if channel:
+                try:
+                    channel.close()
+                except Exception:  # noqa
+                    pass
+        self._channel = self._container_channel = self.container = None
+
+    @staticmethod
+    def _frame(buffer, marker):
+        """Returns the data before the marker line and the line, None if incomplete."""
+        index = buffer.find(marker)
+        if index == -1:
+            return None
+
+        end = buffer.find(b"\n", index)
+        if end == -1:
+            return None
+
+        # The frame begins with a newline added by the marker echo
+        return bytes(buffer[: index - 1]), bytes(buffer[index:end])
+
+    def _read_frames(self, marker, end_time):
+        """Reads both the streams until their marker lines.
+
+        The streams are drained together, a command writing more to one of
+        them than the channel window would otherwise stall the remote side.
+
+        Args:
+            marker (bytes): frame marker
+            end_time (datetime): time by which the markers are expected
+
+        Returns:
+            Tuple of the stdout frame and the stderr frame
+        """
+        buffers = {False: bytearray(), True: bytearray()}
+        frames = dict()
+        while True:
+            for stderr, buffer in buffers.items():
+                if stderr not in frames:
+                    buffer += read_stream(self._channel, stderr=stderr, log=False)
+                    frame = self._frame(buffer, marker)
+                    if frame:
+                        frames[stderr] = frame
+
+            if len(frames) == len(buffers):
+                return frames[False], frames[True]
+
+            if self._channel.exit_status_ready():
+                raise ShellSessionError("cephadm shell container exited.")
+
+            if datetime.datetime.now() >= end_time:
+                raise TimeoutError("Command exceed the allocated execution time.")
+
+            wait_for_channel(self._channel, CHANNEL_WAIT_INTERVAL)
+
+    def _execute(self, cmd, timeout):
+        """Executes the command within the container.
+
+        The command is evaluated in a subshell, so that its state and exit
+        don't affect the session, with stdin detached from the channel.
+
+        Returns:
+            Tuple of stdout, stderr and exit code.
+        """
+        if not self.alive:
+            raise ShellSessionError("cephadm shell container is not running.")
+
+        marker = f"__CEPHCI_{uuid4().hex}__"
+        encoded = base64.b64encode(cmd.encode()).decode()
+        script = (
+            f'( eval "$(echo {encoded} | base64 -d)" ) </dev/null; '
+            f"printf '\\n{marker} %s\\n' $?; printf '\\n{marker}\\n' >&2\n"
+        )
+        self._channel.sendall(script.encode())
+
+        end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout or 3600)
+        (out, frame), (err, _) = self._read_frames(marker.encode(), end_time)
+
+        return decode_stream(out), decode_stream(err), int(frame.split()[-1])
+
+    def execute(self, cmd, timeout=600):
+        """Executes the command and returns its stdout, stderr and exit code.
+
+        Raises:
+            ShellSessionError: when the container is not usable.
+            TimeoutError: when the command exceeds the timeout.
+        """
+        try:
+            return self._execute(cmd, timeout)
+        except BaseException:
+            # The frames of the session cannot be trusted anymore.
+            self.close()
+            raise
+
+
+def get_persistent_shell(node):
+    """Returns the running persistent shell of the node, starts it if required.
+
+    Returns None when the container could not be started, the caller is
+    expected to fallback to the regular cephadm shell. The container is
+    started again when it dies, but not when it failed to start.
+    """
+    with _sessions_lock:
+        session = _sessions.setdefault(node.ip_address, PersistentShell(node))
+
+    if not session.lock.acquire(blocking=False):
+        return None
+
+    if session.alive:
+        return session
+
+    # A container which could not be started is not attempted again
+    if session.failed:
+        session.lock.release()
+        return None
+
+    try:
+        session.start()
+        return session
+    except BaseException as be:  # noqa
+        LOG.warning(f"Unable to start persistent cephadm shell: {be}")
+        session.failed = True
+        session.close()
+        session.lock.release()
+        return None
+
+
+@atexit.register
+def close_persistent_shells():
+    """Stops all the persistent cephadm shell containers."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
 
 
 class ShellMixin:
@@ -41,7 +318,24 @@ class ShellMixin:
             out (Str), err (Str) stdout and stderr response
             rc (Int) exit status code if long_running command
 
+        Note:
+            With the persistent shell enabled, the whole command is evaluated
+            within the container. Commands with unquoted shell operators like
+            pipes or redirections are therefore run using a new cephadm shell,
+            where the host shell interprets the operators as before.
         """
+        if (
+            getattr(self.cluster, "persistent_shell", False)
+            and not base_cmd_args
+            and not long_running
+            and not has_shell_operators(" ".join(args))
+        ):
+            out = self.persistent_shell(args, check_status, timeout, pretty_print)
+            if out is not None:
+                if print_output:
+                    LOG.debug(out[0])
+                return out
+
         cmd = deepcopy(BASE_CMD)
 
         if base_cmd_args:
@@ -63,3 +357,56 @@ class ShellMixin:
             if print_output:
                 LOG.debug(out[0])
         return out
+
+    def persistent_shell(
+        self: CephAdmProtocol,
+        args: List[str],
+        check_status: bool = True,
+        timeout: int = 600,
+        pretty_print: bool = False,
+    ):
+        """
+        Executes the command in the persistent cephadm shell of the installer.
+
+        Args:
+            args (List): list arguments
+            check_status (Bool): check command status
+            timeout (Int): Maximum time allowed for execution.
+            pretty_print (Bool): When enabled, output/error will be logged.
+
+        Returns:
+            out (Str), err (Str) stdout and stderr response or None when the
+            persistent shell is not usable.
+        """
+        node = self.installer.node
+        session = get_persistent_shell(node)
+        if session is None:
+            return None
+
+        cmd = " ".join(args)
+        try:
+            LOG.info(f"Execute {cmd} on {node.hostname} [persistent shell]")
+            _start = datetime.datetime.now()
+            out, err, rc = session.execute(cmd, timeout)
+        except ShellSessionError as error:
+            LOG.warning(f"{error} Falling back to a new cephadm shell.")
+            return None
+        except TimeoutError as error:
+            raise CommandFailed(f"{cmd} failed to execute within {timeout}s. {error}")
+        finally:
+            session.lock.release()
+
+        _time = (datetime.datetime.now() - _start).total_seconds()
+        LOG.info(f"Execution of {cmd} took {_time} seconds on {node.hostname}")
+        if pretty_print:
+            LOG.info(
+                f"\nCommand:    {cmd}\nExit Code:  {rc}\nStdout:     {out}\nStderr:     {err}"
+            )
+
+        node.exit_status = rc
+        if check_status and rc != 0:
+            raise CommandFailed(
+                f"{cmd} returned {err} and code {rc} on {node.hostname} [{node.ip_address}]"
+            )
+
+        return out, err
@@ -1,7 +1,8 @@
 """Module that interfaces with ceph orch upgrade CLI."""
 
+import shlex
 from datetime import datetime, timedelta
-from json import JSONDecodeError, loads
+from json import JSONDecodeError, dumps, loads
 from time import sleep
 from typing import Dict
 
@@ -19,10 +20,121 @@ from .typing_ import OrchProtocol
 LOG = Log(__name__)
 
 
+# Commands run by every poll of the upgrade monitor, in a single cephadm shell
+UPGRADE_POLL_COMMANDS = {
+    "mgr_stat": "ceph mgr stat",
+    "versions": "ceph versions -f json",
+    "daemons": "ceph orch ps -f json",
+    "status": "ceph orch upgrade status",
+}
+UPGRADE_POLL_MARKER = "CEPHCI_UPGRADE_POLL"
+
+
 class UpgradeFailure(Exception):
     pass
 
 
+class UpgradeTimeline:
+    """
+    Version transitions of the daemon types and the daemons during an upgrade.
+
+    The daemon types are tracked from ceph versions and the daemons from
+    ceph orch ps, a transition is timed by the poll it is observed in.
+    """
+
+    def __init__(self, start: datetime = None):
+        self.start = start or datetime.now()
+        self.types = None
+        self.daemons = dict()
+        self.events = list()
+
+    def record(self, time: datetime, versions: Dict = None, daemons: list = None):
+        """
+        Record the transitions since the previous poll.
+
+        Args:
+            time (datetime): time of the poll
+            versions (Dict): output of ceph versions, None if not available
+            daemons (list): output of ceph orch ps, None if not available
+        """
+        if versions is not None:
+            types = {_type: v for _type, v in versions.items() if _type != "overall"}
+            for _type in sorted(set(self.types or {}) | set(types)):
+                if self.types is None or self.types.get(_type) == types.get(_type):
+                    continue
+                LOG.info(
+                    f"{_type} versions: {self.types.get(_type)} -> {types.get(_type)}"
+                )
+                self.events.append(
+                    {
+                        "time": time,
+                        "daemon_type": _type,
+                        "from": self.types.get(_type),
+                        "to": types.get(_type),
+                    }
+                )
+            self.types = types
+
+        for daemon in daemons or []:
+            # The version is not reported while the daemon is redeployed
+            if not daemon.get("version"):
+                continue
+
+            name = daemon.get("daemon_name") or "{}.{}".format(
+                daemon.get("daemon_type"), daemon.get("daemon_id")
+            )
+            previous = self.daemons.get(name)
+            self.daemons[name] = daemon["version"]
+            if previous and previous != daemon["version"]:
+                LOG.info(f"{name} upgraded: {previous} -> {daemon['version']}")
+                self.events.append(
+                    {
+                        "time": time,
+                        "daemon_type": daemon.get("daemon_type"),
+                        "daemon": name,
+                        "from": previous,
+                        "to": daemon["version"],
+                    }
+                )
+
+    def report(self, end: datetime = None) -> Dict:
+        """
+        Returns the duration of the upgrade phases and the daemons upgraded per minute.
+
+        A phase covers the upgrade of a daemon type, from the end of the
+        previous phase to the last transition of the type, the daemon types
+        being upgraded one after the other. The phases are taken from the
+        daemon transitions, from the daemon type ones when orch ps was never
+        available.
+        """
+        end = end or datetime.now()
+        upgraded = [event for event in self.events if event.get("daemon")]
+        phases = dict()
+        for event in upgraded or self.events:
+            phase = phases.setdefault(event["daemon_type"], {"daemons": 0})
+            phase["end"] = event["time"]
+            phase["daemons"] += 1 if event.get("daemon") else 0
+
+        previous = self.start
+        for phase in phases.values():
+            phase["start"] = previous
+            phase["duration"] = round((phase["end"] - previous).total_seconds(), 3)
+            previous = phase["end"]
+
+        elapsed = (end - self.start).total_seconds()
+        return {
+            "start": self.start,
+            "end": end,
+            "elapsed": round(elapsed, 3),
+            "daemons_upgraded": len(upgraded),
+            "daemons_per_minute": (
+                round(len(upgraded) * 60 / elapsed, 2) if elapsed > 0 else 0
+            ),
+            "phases": phases,
+            "events": self.events,
+        }
+
+
 class UpgradeMixin:
     """CLI that list daemons known to orchestrator."""
 
@@ -104,26 +216,28 @@ class UpgradeMixin:
 
         return self.shell(args=cmd)
 
-    def upgrade_status(self: OrchProtocol, timeout: int = 600, interval: int = 10):
+    def _status_needs_retry(self: OrchProtocol, mgr_stat: Dict) -> bool:
         """
-        Execute the command ceph orch status.
+        Whether the upgrade status of the active mgr needs the retry workaround.
 
-        Returns:
-            upgrade Status (Dict)
+        The decision is cached per active mgr and resolved again only after
+        a mgr failover or restart, which changes the mgr map epoch.
 
+        Args:
+            mgr_stat (Dict): output of ceph mgr stat
         """
-        cmd = ["ceph", "orch", "upgrade", "status"]
+        active_mgr = (mgr_stat["active_name"], mgr_stat.get("epoch"))
+        cached = getattr(self, "_upgrade_status_retry", None)
+        if cached and cached[0] == active_mgr:
+            return cached[1]
 
         # these additional checks are in place because the fix is currently
         # available in only 9.1, once back-ported to all relevant versions,
         # retry mechanism can be removed completely
-        # determine mgr version to decide retry logic
         # check if active mgr daemon has upgraded to 9.1 or above
-        out, _ = self.shell(args=["ceph", "mgr", "stat"])
-        active_mgr = loads(out)["active_name"]
-        LOG.debug("Active Mgr for the cluster: %s", active_mgr)
+        LOG.debug("Active Mgr for the cluster: %s", active_mgr[0])
         mgr_version_common, mgr_version_downstream = get_daemon_versions(
-            node=self, daemon_type="mgr", daemon_id=active_mgr
+            node=self, daemon_type="mgr", daemon_id=active_mgr[0]
         )
         LOG.debug("MGR common version: %s", mgr_version_common)
         LOG.debug("MGR downstream version: %s", mgr_version_downstream)
@@ -136,6 +250,39 @@ class UpgradeMixin:
         ) >= Version("9.9.1.0")
 
         needs_retry = not (common_ver_check or downstream_ver_check)
+        self._upgrade_status_retry = (active_mgr, needs_retry)
+        return needs_retry
+
+    @staticmethod
+    def _load_upgrade_status(out: str) -> Dict:
+        """Returns the upgrade status parsed from ceph orch upgrade status."""
+        try:
+            return loads(out)
+        except JSONDecodeError:
+            pass  # Not valid JSON, move to next check
+
+        if "There are no upgrades in progress currently." in out:
+            return {"in_progress": False}
+
+        raise CommandFailed(
+            "Command 'ceph orch upgrade status' returned unexpected output: '{}'".format(
+                out
+            )
+        )
+
+    def upgrade_status(self: OrchProtocol, timeout: int = 600, interval: int = 10):
+        """
+        Execute the command ceph orch status.
+
+        Returns:
+            upgrade Status (Dict)
+
+        """
+        cmd = ["ceph", "orch", "upgrade", "status"]
+
+        # determine mgr version to decide retry logic
+        out, _ = self.shell(args=["ceph", "mgr", "stat"])
+        needs_retry = self._status_needs_retry(loads(out))
 
         if not needs_retry:
             LOG.debug("------- Skipping retry workaround -------")
@@ -163,19 +310,38 @@ class UpgradeMixin:
                 msg += "Refer Bzs 2314146, 2313471, 2361844."
                 raise CommandFailed(msg)
 
-        try:
-            return loads(out)
-        except JSONDecodeError:
-            pass  # Not valid JSON, move to next check
+        return self._load_upgrade_status(out)
 
-        if "There are no upgrades in progress currently." in out:
-            return {"in_progress": False}
+    def poll_upgrade(self: OrchProtocol) -> Dict:
+        """
+        Fetch the mgr stat, versions, daemons and upgrade status in one cephadm shell.
 
-        raise CommandFailed(
-            "Command 'ceph orch upgrade status' returned unexpected output: '{}'".format(
-                out
-            )
+        A command failing does not stop the ones following it, its section is
+        returned as None. The orchestrator commands fail while the mgr is
+        being upgraded.
+
+        Returns:
+            Dict: output of each of the UPGRADE_POLL_COMMANDS, None if it failed
+        """
+        script = "; ".join(
+            f"echo; echo {UPGRADE_POLL_MARKER} {name}; {cmd} || echo {UPGRADE_POLL_MARKER} failed"
+            for name, cmd in UPGRADE_POLL_COMMANDS.items()
         )
+        out, _ = self.shell(args=[f"bash -c {shlex.quote(script)}"])
+
+        sections, name = dict(), None
+        for line in out.splitlines():
+            if line.startswith(UPGRADE_POLL_MARKER):
+                _name = line.split()[1]
+                if _name == "failed":
+                    sections[name] = None
+                    continue
+                name = _name
+                sections[name] = ""
+            elif name and sections[name] is not None:
+                sections[name] += line + "\n"
+
+        return {name: sections.get(name) for name in UPGRADE_POLL_COMMANDS}
 
     def upgrade_check(self: OrchProtocol, image):
         """
@@ -193,21 +359,56 @@ class UpgradeMixin:
         LOG.info("check upgrade : %s" % out)
         return loads(out)
 
-    def monitor_upgrade_status(self, timeout=3600):
+    def monitor_upgrade_status(self, timeout=3600, status_timeout=600):
         """
         Monitor upgrade status
 
+        Every poll is a single cephadm shell fetching the upgrade status along
+        with the versions of the daemons, which are recorded to the upgrade
+        timeline. The mgr version deciding the status retry workaround is
+        resolved again only after a mgr failover.
+
         Args:
             timeout (int):  Timeout in seconds (default:3600)
+            status_timeout (int): In seconds, how long the status may keep
+                                  failing with the retry workaround (default:600)
 
+        Returns:
+            Dict: upgrade timeline report
         """
         interval = 7  # ceph orch down while upgrading mgr daemon BZ2313471
         end_time = datetime.now() + timedelta(seconds=timeout)
+        timeline = self.upgrade_timeline = UpgradeTimeline()
+        status_failed_since = None
 
         while end_time > datetime.now():
             sleep(interval)
-            out = self.upgrade_status()
+            poll = self.poll_upgrade()
+            now = datetime.now()
+            timeline.record(
+                now,
+                loads(poll["versions"]) if poll["versions"] else None,
+                loads(poll["daemons"]) if poll["daemons"] else None,
+            )
 
+            if poll["status"] is None:
+                if not poll["mgr_stat"] or not self._status_needs_retry(
+                    loads(poll["mgr_stat"])
+                ):
+                    raise CommandFailed("Command 'ceph orch upgrade status' failed")
+
+                status_failed_since = status_failed_since or now
+                if (now - status_failed_since).total_seconds() > status_timeout:
+                    msg = f"Upgrade status failed even after {status_timeout} sec "
+                    msg += "due to mgr loading issue. "
+                    msg += "Refer Bzs 2314146, 2313471, 2361844."
+                    raise CommandFailed(msg)
+
+                LOG.info("Upgrade command status failed, retrying...")
+                continue
+
+            status_failed_since = None
+            out = self._load_upgrade_status(poll["status"])
             if not out["in_progress"]:
                 LOG.info("Upgrade Complete...")
                 break
@@ -215,3 +416,7 @@ class UpgradeMixin:
             LOG.info("Status : %s" % out)
         else:
             raise UpgradeFailure("Upgrade did not complete or failed")
+
+        report = timeline.report(datetime.now())
+        LOG.info("Upgrade timeline : %s" % dumps(report, default=str, indent=2))
+        return report
@@ -41,6 +41,12 @@ You can also specify the maximum number of worker threads/processes:
         for foo in bar:
             p.spawn(quux, foo, baz=True)
 
+Data common to every task can be handed to the workers once, instead of
+being pickled with each task, through an initializer:
+    with parallel(thread_pool=False, initializer=load, initargs=(data,)) as p:
+        for foo in bar:
+            p.spawn(quux, foo)
+
 If one of the spawned functions throws an exception, it will be thrown
 when iterating over the results, or when the with block ends.
 
@@ -66,6 +72,8 @@ class parallel:
         timeout=None,
         shutdown_cancel_pending=False,
         max_workers=None,
+        initializer=None,
+        initargs=(),
     ):
         """Object initialization method.
 
@@ -73,11 +81,17 @@ class parallel:
             thread_pool (bool)          Whether to use threads or processes.
             timeout (int | float)       Maximum allowed time.
             shutdown_cancel_pending (bool) If enabled, it would cancel pending tasks.
+            initializer (callable)      Called with initargs once by every worker.
+            initargs (tuple)            Arguments of the initializer.
         """
         if thread_pool:
-            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            )
         else:
-            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            )
         self._timeout = timeout
         self._cancel_pending = shutdown_cancel_pending
         self._futures = list()
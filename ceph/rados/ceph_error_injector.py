@@ -303,6 +303,7 @@ injectargs <injected_args>...
 """
 
 import json
+import shlex
 import time
 
 from ceph.rados.core_workflows import RadosOrchestrator
@@ -650,6 +651,9 @@ SIGNAL_INJECTIONS = {
     },
 }
 
+# Reported on stderr for every failing command of a batch
+CONFIG_FAILED_MARKER = "CEPHCI_CONFIG_FAILED"
+
 ALL_INJECTIONS = {
     **MESSENGER_INJECTIONS,
     **MON_INJECTIONS,
@@ -944,80 +948,7 @@ class CephErrorInjector:
         Raises:
             ValueError: If name is not in the catalog
         """
-        if name not in ALL_INJECTIONS:
-            raise ValueError(
-                f"Unknown inject variable: '{name}'. "
-                f"Use CephErrorInjector.list_available() to see all options."
-            )
-
-        meta = ALL_INJECTIONS[name]
-
-        if meta.get("runtime") is False:
-            log.warning(
-                f"Config '{name}' is NOT runtime-updatable. "
-                "It requires daemon restart or client remount to take effect."
-            )
-
-        if meta["type"] == "float" and name.endswith("_probability"):
-            try:
-                fval = float(value)
-                if fval < 0.0 or fval > 1.0:
-                    log.warning(
-                        f"Config '{name}' is a probability but value "
-                        f"{fval} is outside 0.0-1.0 range. "
-                        f"Did you mean {fval / 100.0}?"
-                    )
-            except (TypeError, ValueError):
-                pass
-
-        # Safety check: some "every Nth operation" configs with very
-        # low values (e.g., 1) will break cluster connectivity entirely
-        # because every messenger/heartbeat/dispatch operation fails.
-        # Configs where N = duration of fault (ANY non-zero is risky)
-        _DURATION_DANGER = {
-            "ms_inject_network_congestion",
-        }
-        # Configs where low int/uint values are dangerous (every-Nth)
-        _LOW_VALUE_DANGER = {
-            "ms_inject_socket_failures": 100,
-            "heartbeat_inject_failure": 100,
-            "bdev_inject_crash": 1000,
-        }
-        # Configs where high float/int values are dangerous (durations)
-        _HIGH_VALUE_DANGER = {
-            "osd_debug_inject_dispatch_delay_duration": 30,
-            "ms_inject_delay_max": 30,
-            "mon_inject_transaction_delay_max": 60,
-            "filestore_inject_stall": 60,
-            "client_debug_inject_tick_delay": 60,
-            "rgw_mp_lock_inject_delay": 60,
-        }
-        try:
-            num_val = float(value)
-            if name in _DURATION_DANGER and num_val > 0:
-                log.warning(
-                    f"SAFETY: Config '{name}' set to {num_val}. "
-                    f"N = how long the fault lasts (in operations), "
-                    f"NOT frequency. Any non-zero value is risky."
-                )
-            elif name in _LOW_VALUE_DANGER:
-                min_safe = _LOW_VALUE_DANGER[name]
-                if 0 < num_val < min_safe:
-                    log.warning(
-                        f"SAFETY: Config '{name}' set to {num_val} is "
-                        f"dangerously aggressive (min safe ~{min_safe})."
-                    )
-            elif name in _HIGH_VALUE_DANGER:
-                max_safe = _HIGH_VALUE_DANGER[name]
-                if num_val > max_safe:
-                    log.warning(
-                        f"SAFETY: Config '{name}' set to {num_val}s "
-                        f"exceeds safe threshold ({max_safe}s). "
-                        f"This may cause command timeouts."
-                    )
-        except (TypeError, ValueError):
-            pass
-
+        meta = self._validate_injection(name, value)
         target_section = section or meta["section"]
         str_value = self._convert_value(value, meta["type"])
 
@@ -1047,7 +978,13 @@ class CephErrorInjector:
 
     def inject_config_batch(self, injections: dict) -> dict:
         """
-        Apply multiple config injections at once.
+        Apply multiple config injections in a single round trip.
+
+        The whole batch is validated locally against the catalog, then every
+        key is set by a single cephadm shell invocation, which also dumps the
+        config database the values are verified against. Every key whose
+        command did not report a failure is tracked for cleanup, even when
+        the shell itself failed.
 
         Args:
             injections: Dict of {config_key: value} pairs.
@@ -1063,13 +1000,65 @@ class CephErrorInjector:
                 "osd_debug_inject_dispatch_delay_probability": 0.2,
             })
         """
-        results = {}
+        results = dict.fromkeys(injections, False)
+        values, commands = {}, []
         for name, value in injections.items():
             try:
-                results[name] = self.inject_config(name, value)
-            except ValueError as e:
-                log.error(str(e))
-                results[name] = False
+                meta = self._validate_injection(name, value)
+                str_value = self._convert_value(value, meta["type"])
+            except (TypeError, ValueError) as e:
+                log.error(f"Invalid injection {name}={value}: {e}")
+                continue
+
+            values[name] = (meta["section"], str_value)
+            commands.append(
+                (
+                    meta["section"],
+                    name,
+                    f"ceph config set {meta['section']} {name} {shlex.quote(str_value)}",
+                )
+            )
+
+        if not commands:
+            return results
+
+        log.info(
+            f"Injecting {len(commands)} configs: "
+            + ", ".join(f"{name}={val} [{sec}]" for name, (sec, val) in values.items())
+        )
+        try:
+            failed, config_dump = self._run_config_commands(commands)
+        except Exception as e:
+            # Some of the commands may have run, every key is verified on its
+            # own and tracked, hence cleaned up whether it was applied or not
+            log.error(f"Failed to run ceph config set for {', '.join(values)}: {e}")
+            failed, config_dump = set(), None
+
+        for name, (target_section, str_value) in values.items():
+            if (target_section, name) in failed:
+                log.error(f"Failed to run ceph config set for {name}")
+                continue
+
+            if config_dump is None:
+                matched = self._verify_config_set(target_section, name, str_value)
+            else:
+                matched = self._config_matches(
+                    config_dump, target_section, name, str_value
+                )
+            if not matched:
+                log.warning(
+                    f"Config {name} may not have been set correctly, "
+                    f"but proceeding with tracking for cleanup"
+                )
+
+            injection = {"name": name, "section": target_section}
+            if injection not in self._active_config_injections:
+                self._active_config_injections.append(injection)
+            results[name] = matched or config_dump is not None
+
+        log.info(
+            f"Injections active: {sum(results.values())} of {len(injections)} configs"
+        )
         return results
 
     def remove_config_injection(self, name: str, section: str = None) -> bool:
@@ -1912,17 +1901,11 @@ class CephErrorInjector:
             f"injections"
         )
 
-        # Clean config injections
-        for inj in list(self._active_config_injections):
-            try:
-                self.mon_obj.remove_config(
-                    section=inj["section"], name=inj["name"], verify_rm=False
-                )
-                summary["configs_removed"] += 1
-                log.debug(f"Removed config: {inj['name']} [{inj['section']}]")
-            except Exception as e:
-                log.warning(f"Failed to remove config {inj['name']}: {e}")
-                summary["configs_failed"] += 1
+        # Clean config injections, all of them in a single round trip
+        if self._active_config_injections:
+            removed, failed = self._remove_config_batch(self._active_config_injections)
+            summary["configs_removed"] += removed
+            summary["configs_failed"] += failed
 
         self._active_config_injections.clear()
 
@@ -2062,6 +2045,201 @@ class CephErrorInjector:
     # INTERNAL HELPERS
     # =========================================================================
 
+    @staticmethod
+    def _validate_injection(name: str, value) -> dict:
+        """
+        Validate an inject variable against the catalog and warn about
+        values known to be unsafe.
+
+        Args:
+            name: Config key name
+            value: Value to set
+
+        Returns:
+            Catalog entry of the variable
+
+        Raises:
+            ValueError: If name is not in the catalog
+        """
+        if name not in ALL_INJECTIONS:
+            raise ValueError(
+                f"Unknown inject variable: '{name}'. "
+                f"Use CephErrorInjector.list_available() to see all options."
+            )
+
+        meta = ALL_INJECTIONS[name]
+
+        if meta.get("runtime") is False:
+            log.warning(
+                f"Config '{name}' is NOT runtime-updatable. "
+                "It requires daemon restart or client remount to take effect."
+            )
+
+        if meta["type"] == "float" and name.endswith("_probability"):
+            try:
+                fval = float(value)
+                if fval < 0.0 or fval > 1.0:
+                    log.warning(
+                        f"Config '{name}' is a probability but value "
+                        f"{fval} is outside 0.0-1.0 range. "
+                        f"Did you mean {fval / 100.0}?"
+                    )
+            except (TypeError, ValueError):
+                pass
+
+        # Safety check: some "every Nth operation" configs with very
+        # low values (e.g., 1) will break cluster connectivity entirely
+        # because every messenger/heartbeat/dispatch operation fails.
+        # Configs where N = duration of fault (ANY non-zero is risky)
+        _DURATION_DANGER = {
+            "ms_inject_network_congestion",
+        }
+        # Configs where low int/uint values are dangerous (every-Nth)
+        _LOW_VALUE_DANGER = {
+            "ms_inject_socket_failures": 100,
+            "heartbeat_inject_failure": 100,
+            "bdev_inject_crash": 1000,
+        }
+        # Configs where high float/int values are dangerous (durations)
+        _HIGH_VALUE_DANGER = {
+            "osd_debug_inject_dispatch_delay_duration": 30,
+            "ms_inject_delay_max": 30,
+            "mon_inject_transaction_delay_max": 60,
+            "filestore_inject_stall": 60,
+            "client_debug_inject_tick_delay": 60,
+            "rgw_mp_lock_inject_delay": 60,
+        }
+        try:
+            num_val = float(value)
+            if name in _DURATION_DANGER and num_val > 0:
+                log.warning(
+                    f"SAFETY: Config '{name}' set to {num_val}. "
+                    f"N = how long the fault lasts (in operations), "
+                    f"NOT frequency. Any non-zero value is risky."
+                )
+            elif name in _LOW_VALUE_DANGER:
+                min_safe = _LOW_VALUE_DANGER[name]
+                if 0 < num_val < min_safe:
+                    log.warning(
+                        f"SAFETY: Config '{name}' set to {num_val} is "
+                        f"dangerously aggressive (min safe ~{min_safe})."
+                    )
+            elif name in _HIGH_VALUE_DANGER:
+                max_safe = _HIGH_VALUE_DANGER[name]
+                if num_val > max_safe:
+                    log.warning(
+                        f"SAFETY: Config '{name}' set to {num_val}s "
+                        f"exceeds safe threshold ({max_safe}s). "
+                        f"This may cause command timeouts."
+                    )
+        except (TypeError, ValueError):
+            pass
+
+        return meta
+
+    def _run_config_commands(self, commands: list) -> tuple:
+        """
+        Run ceph config commands and a config dump in a single cephadm shell.
+
+        A failing command does not stop the ones following it, it is
+        reported on stderr and returned among the failed commands.
+
+        Args:
+            commands: List of (section, name, command) tuples
+
+        Returns:
+            Tuple of the set of (section, name) whose command failed and the
+            config dump taken after all the commands ran
+        """
+        script = "; ".join(
+            f"{cmd} || echo {CONFIG_FAILED_MARKER} {section} {name} >&2"
+            for section, name, cmd in commands
+        )
+        script += "; ceph config dump -f json"
+        out, err = self.rados_obj.node.shell([f"bash -c {shlex.quote(script)}"])
+
+        failed = set()
+        for line in str(err or "").splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[0] == CONFIG_FAILED_MARKER:
+                failed.add((parts[1], parts[2]))
+
+        return failed, json.loads(out)
+
+    def _remove_config_batch(self, injections: list) -> tuple:
+        """
+        Remove config injections from the MON config database in a single
+        round trip, verified against the config dump taken right after.
+
+        Args:
+            injections: Injection tracking dicts with 'name' and 'section'
+
+        Returns:
+            Tuple of the number of configs removed and failed
+        """
+        keys = list(dict.fromkeys((inj["section"], inj["name"]) for inj in injections))
+        commands = [
+            (section, name, f"ceph config rm {section} {name}")
+            for section, name in keys
+        ]
+        try:
+            failed, config_dump = self._run_config_commands(commands)
+        except Exception as e:
+            log.warning(f"Failed to remove configs: {e}")
+            return 0, len(keys)
+
+        remaining = {(entry.get("section"), entry.get("name")) for entry in config_dump}
+        removed = 0
+        for section, name in keys:
+            if (section, name) in failed or (section, name) in remaining:
+                log.warning(f"Failed to remove config {name} [{section}]")
+                continue
+
+            log.debug(f"Removed config: {name} [{section}]")
+            removed += 1
+
+        return removed, len(keys) - removed
+
+    @staticmethod
+    def _config_matches(
+        config_dump: list, section: str, name: str, expected_value: str
+    ) -> bool:
+        """
+        Check a config of the config dump using float-aware comparison.
+
+        Ceph stores float values with full precision (e.g., "10.000000"
+        for "10.0"), which causes naive string comparison to fail.
+
+        Args:
+            config_dump: Entries of ceph config dump -f json
+            section: Config section (mon, osd, global, etc.)
+            name: Config key name
+            expected_value: The value we set (as string)
+
+        Returns:
+            True if the config is found with the expected value
+        """
+        for entry in config_dump:
+            if entry.get("name") == name and entry.get("section") == section:
+                actual = entry.get("value", "")
+                if actual == expected_value:
+                    return True
+                try:
+                    if float(actual) == float(expected_value):
+                        return True
+                except (ValueError, TypeError):
+                    pass
+                log.warning(
+                    f"Config {name} value mismatch: "
+                    f"expected={expected_value}, actual={actual}"
+                )
+                return False
+
+        log.warning(
+            f"Config {name} not found in ceph config dump " f"for section [{section}]"
+        )
+        return False
+
     def _verify_config_set(self, section: str, name: str, expected_value: str) -> bool:
         """
         Verify a config was applied using float-aware comparison.
@@ -2082,29 +2260,7 @@ class CephErrorInjector:
         try:
             cmd = "ceph config dump -f json"
             out, _ = self.rados_obj.node.shell([cmd])
-            config_dump = json.loads(out)
-
-            for entry in config_dump:
-                if entry.get("name") == name and entry.get("section") == section:
-                    actual = entry.get("value", "")
-                    if actual == expected_value:
-                        return True
-                    try:
-                        if float(actual) == float(expected_value):
-                            return True
-                    except (ValueError, TypeError):
-                        pass
-                    log.warning(
-                        f"Config {name} value mismatch: "
-                        f"expected={expected_value}, actual={actual}"
-                    )
-                    return False
-
-            log.warning(
-                f"Config {name} not found in ceph config dump "
-                f"for section [{section}]"
-            )
-            return False
+            return self._config_matches(json.loads(out), section, name, expected_value)
         except Exception as e:
             log.warning(f"Failed to verify config {name}: {e}")
             return False
@@ -24,6 +24,7 @@ from ceph.ceph import CommandFailed, SocketTimeoutException, TimeoutException
 from ceph.ceph_admin import CephAdmin
 from ceph.parallel import parallel
 from ceph.rados import utils as osd_utils
+from ceph.rados.pg_snapshot import PGSnapshot, invalidates_pg_snapshot
 from tests.rados.rados_test_util import wait_for_device_rados
 from utility import utils
 from utility.log import Log
@@ -49,7 +50,17 @@ class RadosOrchestrator:
         self.ceph_cluster = node.cluster
         self.client = node.cluster.get_nodes(role="client")[0]
         self.rhbuild = node.config.get("rhbuild")
+        self.pg_snapshot = PGSnapshot(self.dump_pgs)
 
+    def dump_pgs(self):
+        """Returns the json output of 'ceph pg dump pgs', used to build the PG snapshot."""
+        return self.run_ceph_command(cmd="ceph pg dump pgs", client_exec=True)
+
+    def invalidate_pg_snapshot(self):
+        """Discards the PG snapshot, to be called after operations that change the PG map."""
+        self.pg_snapshot.invalidate()
+
+    @invalidates_pg_snapshot
     def change_recovery_flags(self, action, flags: list = None):
         """Sets and unsets the recovery flags on the cluster
 
@@ -397,6 +408,7 @@ class RadosOrchestrator:
                 )
                 return True
 
+    @invalidates_pg_snapshot
     def set_pool_property(self, pool, props, value):
         """
         Used to fetch a given property set on the pool
@@ -445,6 +457,7 @@ class RadosOrchestrator:
                   be verified after write (bool) | default: True
                 - check_ec (bool) -> boolean to control exit code check
                 - background (bool) -> run rados bench as background process and continue with test execution
+                - output_file (str) -> file on the client to which the output of the background process is written
                 - nocleanup (bool) -> if false, the nocleanup flag will not be added and the objects would be deleted
                 - timeout (int) -> user defined timeout for rados bench process
         Returns: True -> pass, False -> fail
@@ -467,7 +480,7 @@ class RadosOrchestrator:
             cmd = f"{cmd} --max-objects {max_objs}"
         if kwargs.get("background"):
             check_ec = False
-            cmd = f"{cmd} &> /dev/null &"
+            cmd = f"{cmd} &> {kwargs.get('output_file', '/dev/null')} &"
         log.info(f"check_ec: {check_ec}")
 
         try:
@@ -562,6 +575,7 @@ class RadosOrchestrator:
             log.error(err)
             return False
 
+    @invalidates_pg_snapshot
     def create_pool(self, pool_name: str, **kwargs) -> bool:
         """
         Create a pool named from the pool_name parameter.
@@ -729,6 +743,7 @@ class RadosOrchestrator:
         )
         return out["up"]
 
+    @invalidates_pg_snapshot
     def run_scrub(self, **kwargs):
         """
         Run scrub on the given OSD or on all OSD's
@@ -753,6 +768,7 @@ class RadosOrchestrator:
             cmd = "ceph osd scrub all"
         self.client.exec_command(cmd=cmd, sudo=True)
 
+    @invalidates_pg_snapshot
     def run_deep_scrub(self, **kwargs):
         """
         Run scrub on the given OSD or on all OSD's
@@ -911,6 +927,7 @@ class RadosOrchestrator:
             log.error(f"Unable to fetch details for {log}")
             return False
 
+    @invalidates_pg_snapshot
     def configure_pg_autoscaler(self, **kwargs) -> bool:
         """
         Configures pg_Autoscaler as a global parameter and on pools
@@ -1085,6 +1102,7 @@ class RadosOrchestrator:
                 return entry["crush_weight"]
         log.error("Provided OSD ID could not be found")
 
+    @invalidates_pg_snapshot
     def reweight_crush_items(self, **kwargs) -> bool:
         """
         Performs Re-weight of various CRUSH items, based on key-value pairs sent
@@ -1190,6 +1208,7 @@ class RadosOrchestrator:
 
         return True
 
+    @invalidates_pg_snapshot
     def delete_pool(self, pool: str) -> bool:
         """
         Deletes the given pool from the cluster
@@ -1569,6 +1588,7 @@ class RadosOrchestrator:
         log.info("Fast EC features enabled successfully on pool %s", pool_name)
         return True
 
+    @invalidates_pg_snapshot
     def create_erasure_pool(self, **kwargs) -> bool:
         """
         Creates an erasure code profile and then creates a pool with the same
@@ -1765,6 +1785,7 @@ class RadosOrchestrator:
                 )
         return True
 
+    @invalidates_pg_snapshot
     def change_osd_state(self, action: str, target: int, timeout: int = 300) -> bool:
         """
         Changes the state of the OSD daemons wrt the action provided
@@ -2174,6 +2195,7 @@ class RadosOrchestrator:
                 return False
         return True
 
+    @invalidates_pg_snapshot
     def update_osd_state_on_cluster(self, osd_id, state):
         """
         Method to update the state of the OSD in the cluster. This method can mark the osd "in, out, up, down"
@@ -2254,7 +2276,8 @@ class RadosOrchestrator:
     def get_pg_state(self, pg_id):
         """Function to get the current state of a PG for the specified PG ID.
 
-        This method queries the PG to get teh current state of the PG.
+        The PG is queried live, the callers polling a PG after changing it
+        outside of the orchestrator methods see its current state.
         Example:
             get_pg_state(pg_id="1.f")
         Args:
@@ -2657,7 +2680,7 @@ class RadosOrchestrator:
         """
         Retrieves all the PG IDs for a pool or PG IDs where a
         certain osd is primary in the acting set or PG IDs which are
-        utilizing the concerned osd
+        utilizing the concerned osd. The PG IDs are served from the PG snapshot.
         Args:
             pool_name: name of the pool
             pool_id: pool id
@@ -2679,33 +2702,24 @@ class RadosOrchestrator:
             list having pgids in string format
         """
 
-        pgid_list = []
-        cmd = "ceph pg "
         if pool_name:
-            cmd += f"ls-by-pool {pool_name}"
+            pool_id, osd, osd_primary = (
+                self.get_pool_id(pool_name=pool_name),
+                None,
+                None,
+            )
         elif osd is not None:
-            cmd += f"ls-by-osd {osd}"
-            cmd = f"{cmd} {pool_id}" if pool_id else cmd
-        elif osd_primary is not None:
-            cmd += f"ls-by-primary {osd_primary}"
-            cmd = f"{cmd} {pool_id}" if pool_id else cmd
-        elif pool_id is not None:
-            cmd += f"ls {pool_id}"
-        else:
+            osd_primary = None
+        elif osd_primary is None and pool_id is None:
             log.info("No argument was provided.")
-            return pgid_list
-
-        if states:
-            cmd = f"{cmd} {states}"
-
-        pgid_dict = self.run_ceph_command(cmd=cmd, client_exec=True)
-
-        if not pgid_dict["pg_stats"]:
             return []
-        for pg_stats in pgid_dict["pg_stats"]:
-            pgid_list.append(pg_stats["pgid"])
 
-        return pgid_list
+        return self.pg_snapshot.filter(
+            pool_id=pool_id,
+            osd=osd,
+            osd_primary=osd_primary,
+            states=states.split() if states else None,
+        )
 
     def run_pool_sanity_check(self, ignore_list=[]):
         """
@@ -3014,63 +3028,36 @@ EOF"""
             log.error(err)
             return False
 
-    def check_inactive_pgs_on_pool(
-        self, pool_name: str = None, max_workers: int = 10
-    ) -> bool:
+    def check_inactive_pgs_on_pool(self, pool_name: str = None) -> bool:
         """
         Method to check if the provided pool has any PGs in inactive state.
         If no pool name is provided, then checks on the entire cluster.
 
-        Uses parallel execution to speed up PG state checks when pool_name is provided.
+        The PG states of the pool are served from a single PG snapshot, fetched
+        when the check starts.
 
         Args:
             pool_name: Name of the pool, on which inactive PGs should be checked
-            max_workers: Number of parallel threads for PG state checks (default: 10)
 
         Returns: True-> Pass (no inactive PGs),  False -> Fail (inactive PGs found)
         """
         if pool_name:
             log.debug("Checking for inactive PGs on pool : %s", pool_name)
+            self.pg_snapshot.refresh(force=True)
             pool_pgids = self.get_pgid(pool_name=pool_name)
 
             if not pool_pgids:
                 log.warning("No PGs found for pool: %s", pool_name)
                 return True
 
-            log.debug(
-                "Checking %d PGs in parallel with %d workers",
-                len(pool_pgids),
-                max_workers,
-            )
-
-            def check_single_pg(pgid):
-                """Check if a single PG is in inactive/unknown state."""
-                pg_state = self.get_pg_state(pg_id=pgid)
-                if pg_state:
-                    if any("unknown" in key for key in pg_state.split("+")):
-                        return pgid, True, pg_state  # pgid, is_inactive, state
-                    return pgid, False, pg_state
-                else:
-                    log.error("PG : %s not present on cluster", pgid)
-                    return pgid, None, None  # PG not found
-
             inactive_pgs = []
-            with cf.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_pgid = {
-                    executor.submit(check_single_pg, pgid): pgid for pgid in pool_pgids
-                }
-
-                for future in cf.as_completed(future_to_pgid):
-                    pgid = future_to_pgid[future]
-                    try:
-                        result_pgid, is_inactive, pg_state = future.result()
-                        if is_inactive:
-                            log.error(
-                                "PG: %s in inactive state (%s)", result_pgid, pg_state
-                            )
-                            inactive_pgs.append(result_pgid)
-                    except Exception as exc:
-                        log.error("PG %s check generated exception: %s", pgid, exc)
+            for pgid in pool_pgids:
+                pg_state = self.pg_snapshot.state(pgid)
+                if not pg_state:
+                    log.error("PG : %s not present on cluster", pgid)
+                elif any("unknown" in key for key in pg_state.split("+")):
+                    log.error("PG: %s in inactive state (%s)", pgid, pg_state)
+                    inactive_pgs.append(pgid)
 
             if inactive_pgs:
                 log.error(
@@ -3507,9 +3494,10 @@ EOF"""
         pool_names = [entry["name"] for entry in out.get("pools", [])]
         pool_id = out["pools"][pool_names.index(pool)]["id"]
 
-        cmd = f" ceph pg ls {pool_id}"
-        out = self.run_ceph_command(cmd=cmd, client_exec=True)
-        for ele in out["pg_stats"]:
+        pool_pgs = [
+            self.pg_snapshot.get(pgid) for pgid in self.get_pgid(pool_id=pool_id)
+        ]
+        for ele in filter(None, pool_pgs):
             if any(key in disallowed_states for key in ele["state"].split("+")):
                 log.error(
                     f"PG : {ele['pgid']} is in state : {ele['state']}. "
@@ -4595,6 +4583,7 @@ EOF"""
         log.info(f"The inconsistent object is created in the pg{pg_id}")
         return pg_id
 
+    @invalidates_pg_snapshot
     def set_noautoscale_flag(self, retry: int = 15) -> bool:
         """
         sets/Unsets the noautoscale flag on the cluster
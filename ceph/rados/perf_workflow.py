@@ -8,6 +8,7 @@ from math import floor
 
 from ceph.ceph_admin import CephAdmin
 from ceph.rados.core_workflows import RadosOrchestrator
+from ceph.rados.rados_bench import create_id, record_result
 from utility.log import Log
 from utility.utils import method_should_succeed
 
@@ -28,6 +29,7 @@ class PerfWorkflows:
         self.rados_obj = RadosOrchestrator(node=node)
         self.cluster = node.cluster
         self.clients = node.cluster.get_nodes(role="client")
+        self.bench_outputs = dict()
 
     def create_pool_per_config(self, **pool_config):
         """
@@ -133,12 +135,34 @@ class PerfWorkflows:
         Returns:
             PID of radosbench process triggered in the node
         """
+        output_file = f"/tmp/radosbench-{_pool_name}-{create_id(node.shortname)}.log"
+        bench_cfg = dict(bench_cfg)
+        bench_cfg.setdefault("output_file", output_file)
         if not self.rados_obj.bench_write(pool_name=_pool_name, **bench_cfg):
             log.error(f"radosbench failed for config: {bench_cfg}")
             raise Exception(f"radosbench failed on node: {node.hostname}")
 
         time.sleep(5)
-        return self.capture_radosbench_pid(node=node)
+        pid = self.capture_radosbench_pid(node=node)
+        self.bench_outputs[pid] = bench_cfg["output_file"]
+        return pid
+
+    def collect_radosbench_result(self, pid, store=None, store_key=None):
+        """
+        Method to parse the output of a completed radosbench process
+        triggered by trigger_radosbench
+        Args:
+            pid: PID returned by trigger_radosbench
+            store: BenchResultStore to persist the result in
+            store_key: dictionary with build, pool_type and profile of the run
+        Returns:
+            BenchResult of the radosbench write
+        """
+        # bench_write executes radosbench on the client of the orchestrator
+        out, _ = self.rados_obj.client.exec_command(
+            cmd=f"cat {self.bench_outputs[pid]}", sudo=True
+        )
+        return record_result(out, "write", store=store, store_key=store_key)
 
     @staticmethod
     def capture_radosbench_pid(node) -> int:
@@ -0,0 +1,178 @@
+"""
+This module contains the in-memory snapshot of the placement groups of the cluster.
+
+The PG queries of RadosOrchestrator used to issue one remote command per PG,
+which for pools with a large number of PGs meant thousands of commands for a
+single check. The snapshot fetches the complete PG map with one
+``ceph pg dump pgs`` and indexes it by PG ID, pool, OSD, primary OSD and state.
+
+The snapshot is refreshed once it is older than the TTL, hence the callers
+polling the PGs issue one dump per interval. The methods of the orchestrator
+that mutate the cluster invalidate the snapshot so that the next query
+reflects the change. The lookups of a single PG are not served from the
+snapshot, they query the PG live.
+"""
+
+import threading
+from collections import defaultdict
+from functools import wraps
+from time import monotonic
+
+from utility.log import Log
+
+log = Log(__name__)
+
+# Seconds for which a fetched snapshot is served.
+PG_SNAPSHOT_TTL = 5
+
+
+class PGSnapshot:
+    """Indexed view of the placement groups of the cluster."""
+
+    def __init__(self, fetch, ttl: float = PG_SNAPSHOT_TTL):
+        """
+        Args:
+            fetch: callable returning the json output of 'ceph pg dump pgs'
+            ttl: seconds for which a fetched snapshot is served
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._fetched_at = None
+        self._reset()
+
+    def _reset(self):
+        self.pgs = dict()
+        self.by_pool = defaultdict(list)
+        self.by_osd = defaultdict(list)
+        self.by_primary = defaultdict(list)
+        self.by_state = defaultdict(list)
+
+    @staticmethod
+    def parse(dump) -> list:
+        """Returns the PG stats from the various formats of the dump.
+
+        The PG stats are either the dump itself (older releases), available
+        under 'pg_stats' (ceph pg dump pgs) or under 'pg_map' (ceph pg dump).
+        """
+        if isinstance(dump, list):
+            return dump
+
+        if "pg_map" in dump:
+            dump = dump["pg_map"]
+
+        return dump.get("pg_stats") or []
+
+    def load(self, pg_stats: list):
+        """Rebuilds the indexes from the given PG stats."""
+        self._reset()
+        for pg in pg_stats:
+            pgid = pg["pgid"]
+            self.pgs[pgid] = pg
+            self.by_pool[int(pgid.split(".")[0])].append(pgid)
+            for osd in pg.get("acting", []):
+                self.by_osd[osd].append(pgid)
+            self.by_primary[pg.get("acting_primary")].append(pgid)
+            for state in pg["state"].split("+"):
+                self.by_state[state].append(pgid)
+
+    @property
+    def fresh(self) -> bool:
+        return self._fetched_at is not None and (
+            monotonic() - self._fetched_at < self.ttl
+        )
+
+    def refresh(self, force: bool = False):
+        """Fetches the PG dump when the snapshot is stale.
+
+        Concurrent callers wait for the ongoing fetch instead of issuing their
+        own dump, the queries are served under the same lock so that they
+        never observe a partially loaded snapshot.
+
+        Args:
+            force: fetch the dump irrespective of the snapshot age
+        """
+        with self._lock:
+            if self.fresh and not force:
+                return self
+
+            _start = monotonic()
+            pg_stats = self.parse(self.fetch())
+            self.load(pg_stats)
+            self._fetched_at = monotonic()
+
+        log.debug(
+            f"PG snapshot refreshed with {len(pg_stats)} PGs in "
+            f"{self._fetched_at - _start:.2f}s"
+        )
+        return self
+
+    def invalidate(self):
+        """Marks the snapshot stale, the next query fetches a new dump."""
+        with self._lock:
+            self._fetched_at = None
+
+    def get(self, pgid: str) -> dict:
+        """Returns the stats of the PG, None if the PG does not exist."""
+        with self._lock:
+            self.refresh()
+            return self.pgs.get(pgid)
+
+    def state(self, pgid: str):
+        """Returns the state of the PG, None if the PG does not exist."""
+        pg = self.get(pgid)
+        return pg["state"] if pg else None
+
+    def filter(
+        self,
+        pool_id: int = None,
+        osd: int = None,
+        osd_primary: int = None,
+        states: list = None,
+    ) -> list:
+        """Returns the PG IDs matching all the given criteria.
+
+        Similar to 'ceph pg ls', a PG matches the states when it is in any
+        of them.
+
+        Args:
+            pool_id: ID of the pool
+            osd: OSD part of the acting set
+            osd_primary: primary OSD of the acting set
+            states: list of PG states
+        """
+        with self._lock:
+            self.refresh()
+            return self._filter(pool_id, osd, osd_primary, states)
+
+    def _filter(self, pool_id, osd, osd_primary, states):
+        selections = []
+        if pool_id is not None:
+            selections.append(self.by_pool.get(int(pool_id), []))
+        if osd is not None:
+            selections.append(self.by_osd.get(int(osd), []))
+        if osd_primary is not None:
+            selections.append(self.by_primary.get(int(osd_primary), []))
+        if states:
+            selections.append(
+                {pgid for state in states for pgid in self.by_state.get(state, [])}
+            )
+
+        if not selections:
+            return list(self.pgs)
+
+        matched = set(selections[0]).intersection(*selections[1:])
+        return [pgid for pgid in self.pgs if pgid in matched]
+
+
+def invalidates_pg_snapshot(func):
+    """Decorator for RadosOrchestrator methods that change the PG map."""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.invalidate_pg_snapshot()
+
+    return wrapper
@@ -6,14 +6,56 @@ the low level native object storage API provided by Ceph.
 
 """
 
+import json
+import os
+import re
 from concurrent.futures import ALL_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, fields
 from time import time
+from typing import Dict, List, Optional
 
 from ceph.ceph_admin.common import config_dict_to_string
 from utility.log import Log
 
 LOG = Log(__name__)
 
+# Summary lines of the rados bench output and the result attribute they map to
+SUMMARY_FIELDS = {
+    "total time run": "total_time",
+    "total writes made": "total_ops",
+    "total reads made": "total_ops",
+    "write size": "op_size",
+    "read size": "op_size",
+    "object size": "object_size",
+    "bandwidth (mb/sec)": "bandwidth",
+    "stddev bandwidth": "stddev_bandwidth",
+    "max bandwidth (mb/sec)": "max_bandwidth",
+    "min bandwidth (mb/sec)": "min_bandwidth",
+    "average iops": "average_iops",
+    "stddev iops": "stddev_iops",
+    "max iops": "max_iops",
+    "min iops": "min_iops",
+    "average latency(s)": "average_latency",
+    "stddev latency(s)": "stddev_latency",
+    "max latency(s)": "max_latency",
+    "min latency(s)": "min_latency",
+}
+
+# sec, cur ops, started, finished, avg MB/s, cur MB/s, last lat(s), avg lat(s)
+SAMPLE_PATTERN = re.compile(
+    r"^\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+([\d.]+)\s+([\d.]+)\s+(\S+)\s+(\S+)\s*$"
+)
+
+# Allowed relative change of the metrics before being flagged as a regression.
+# The latencies regress when they grow, the others when they drop.
+DEFAULT_TOLERANCES = {
+    "bandwidth": 0.1,
+    "average_iops": 0.1,
+    "average_latency": 0.1,
+    "max_latency": 0.5,
+}
+LATENCY_METRICS = ("average_latency", "stddev_latency", "max_latency", "min_latency")
+
 
 class ClientNotFoundError(Exception):
     pass
@@ -31,6 +73,270 @@ class RadosBenchExecutionFailure(Exception):
     pass
 
 
+@dataclass
+class BenchSample:
+    """Per second progress of a rados bench run."""
+
+    sec: int
+    cur_ops: int
+    started: int
+    finished: int
+    avg_bandwidth: float
+    cur_bandwidth: float
+    last_latency: Optional[float]
+    avg_latency: Optional[float]
+
+
+@dataclass
+class BenchResult:
+    """Summary of a rados bench run, bandwidth in MB/s and latencies in seconds."""
+
+    mode: str = ""
+    run_name: Optional[str] = None
+    total_time: float = 0.0
+    total_ops: int = 0
+    op_size: int = 0
+    object_size: int = 0
+    bandwidth: float = 0.0
+    stddev_bandwidth: Optional[float] = None
+    max_bandwidth: Optional[float] = None
+    min_bandwidth: Optional[float] = None
+    average_iops: float = 0.0
+    stddev_iops: Optional[float] = None
+    max_iops: Optional[float] = None
+    min_iops: Optional[float] = None
+    average_latency: float = 0.0
+    stddev_latency: Optional[float] = None
+    max_latency: Optional[float] = None
+    min_latency: Optional[float] = None
+    samples: List[BenchSample] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        data = dict(data)
+        data["samples"] = [BenchSample(**x) for x in data.get("samples", [])]
+        names = {x.name for x in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    def __str__(self):
+        return (
+            f"{self.mode}: {self.bandwidth} MB/s, {self.average_iops} IOPS, "
+            f"latency avg {self.average_latency}s max {self.max_latency}s "
+            f"min {self.min_latency}s over {self.total_time}s"
+        )
+
+
+@dataclass
+class BenchRegression:
+    """Metric of a rados bench run beyond the tolerance of its baseline."""
+
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    tolerance: float
+
+    def __str__(self):
+        return (
+            f"{self.metric}: {self.baseline} -> {self.current} "
+            f"({self.change:+.1%}, tolerance {self.tolerance:.0%})"
+        )
+
+
+def _to_number(value):
+    """Returns the value as int or float, None when it is not a number."""
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() and "." not in value else number
+
+
+def parse_bench_output(output, mode=""):
+    """
+    Parse the output of rados bench
+
+    Args:
+        output (Str): stdout of rados bench
+        mode (Str): bench mode write, seq or rand
+
+    Returns:
+        BenchResult
+
+    Raises:
+        RadosBenchExecutionFailure: when the output has no summary
+    """
+    result = BenchResult(mode=mode)
+    found = False
+    for line in output.splitlines():
+        sample = SAMPLE_PATTERN.match(line)
+        if sample:
+            values = [_to_number(x) for x in sample.groups()]
+            result.samples.append(BenchSample(*values))
+            continue
+
+        key, sep, value = line.partition(":")
+        attr = SUMMARY_FIELDS.get(key.strip().lower())
+        if sep and attr:
+            setattr(result, attr, _to_number(value.strip()))
+            found = True
+
+    if not found:
+        raise RadosBenchExecutionFailure("rados bench output has no summary")
+
+    return result
+
+
+def compare_results(result, baseline, tolerances=None):
+    """
+    Compare the bench result against the baseline
+
+    Args:
+        result (BenchResult): result of the run under test
+        baseline (BenchResult): result of the reference run
+        tolerances (Dict): allowed relative change per metric
+                           (Default: DEFAULT_TOLERANCES)
+
+    Returns:
+        list of BenchRegression, empty when no metric regressed
+    """
+    regressions = []
+    for metric, tolerance in (tolerances or DEFAULT_TOLERANCES).items():
+        _base, _current = getattr(baseline, metric), getattr(result, metric)
+        if not _base or _current is None:
+            continue
+
+        change = (_current - _base) / _base
+        worse = change > tolerance if metric in LATENCY_METRICS else -change > tolerance
+        if worse:
+            regressions.append(
+                BenchRegression(metric, _base, _current, change, tolerance)
+            )
+
+    return regressions
+
+
+class BenchResultStore:
+    """JSON lines store of rados bench results keyed by build, pool type and profile."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (Str): file holding the results, one record per line
+        """
+        self.path = path
+
+    def add(self, result, build, pool_type, profile):
+        """
+        Persist the result of a run
+
+        Args:
+            result (BenchResult): result of the run
+            build (Str): ceph build under test
+            pool_type (Str): replicated or erasure
+            profile (Str): name of the bench configuration
+        """
+        record = {
+            "build": build,
+            "pool_type": pool_type,
+            "profile": profile,
+            "timestamp": time(),
+            "result": result.to_dict(),
+        }
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+    def query(self, **keys):
+        """
+        Return the records matching the keys, oldest first
+
+        Args:
+            keys: build, pool_type, profile or mode to filter upon
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path) as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                record["result"] = BenchResult.from_dict(record["result"])
+                _keys = dict(record, mode=record["result"].mode)
+                if all(_keys.get(k) == v for k, v in keys.items() if v is not None):
+                    records.append(record)
+
+        return records
+
+    def baseline(self, build, pool_type, profile, mode, baseline_build=None):
+        """
+        Return the result to be compared against the given build
+
+        The latest result of baseline_build if provided, else the latest result
+        of a build other than the given build. None when there is no baseline.
+        """
+        records = self.query(
+            build=baseline_build, pool_type=pool_type, profile=profile, mode=mode
+        )
+        records = [x for x in records if baseline_build or x["build"] != build]
+        return records[-1]["result"] if records else None
+
+    def compare(
+        self,
+        result,
+        build,
+        pool_type,
+        profile,
+        baseline_build=None,
+        tolerances=None,
+    ):
+        """
+        Compare the result of the build against its baseline
+
+        Returns:
+            list of BenchRegression, empty when there is no baseline or regression
+        """
+        baseline = self.baseline(build, pool_type, profile, result.mode, baseline_build)
+        if baseline is None:
+            LOG.info(f"No baseline found for {build}/{pool_type}/{profile}")
+            return []
+
+        regressions = compare_results(result, baseline, tolerances)
+        for regression in regressions:
+            LOG.warning(f"rados bench regression in {build}/{profile} - {regression}")
+
+        return regressions
+
+
+def record_result(output, mode, run_name=None, store=None, store_key=None):
+    """
+    Parse the rados bench output and persist it to the store when provided
+
+    Args:
+        output (Str): stdout of rados bench
+        mode (Str): bench mode
+        run_name (Str): bench run name
+        store (BenchResultStore): store of the results
+        store_key (Dict): build, pool_type and profile of the run
+
+    Returns:
+        BenchResult
+    """
+    result = parse_bench_output(output, mode=mode)
+    result.run_name = run_name
+    LOG.info(f"rados bench result - {result}")
+    if store:
+        store.add(result, **(store_key or {}))
+
+    return result
+
+
 def create_id(prefix=""):
     """
     Return unique name with prefix
@@ -140,7 +446,7 @@ class RadosBench:
             config (Dict): write ops command arguments
 
         Returns:
-            run_name (Str)
+            run_name (Str) or BenchResult when return-result is set
 
         Example::
 
@@ -155,8 +461,14 @@ class RadosBench:
                 reuse-bench (Str) : bench name (String value)
                 max-objects(Str) : max number of objects to be written
                 check_ec(bool): flag to control Exit code checks
+                return-result (Bool) : return the parsed BenchResult
+                result-store (BenchResultStore) : store to persist the result in
+                store-key (Dict) : build, pool_type and profile of the stored result
 
         """
+        return_result = config.pop("return-result", False)
+        store = config.pop("result-store", None)
+        store_key = config.pop("store-key", None)
         base_cmd = ["rados", "bench"]
         seconds = str(config.pop("seconds"))
         _timeout = config.get("timeout", int(seconds) + 100)
@@ -171,10 +483,15 @@ class RadosBench:
         base_cmd.append(config_dict_to_string(config))
         base_cmd = " ".join(base_cmd)
 
-        client.exec_command(
+        out, _ = client.exec_command(
             cmd=base_cmd, sudo=True, timeout=_timeout, check_ec=check_ec
         )
-        return run_name if run_name else None
+        run_name = run_name if run_name else None
+        if not (return_result or store):
+            return run_name
+
+        result = record_result(out, "write", run_name, store, store_key)
+        return result if return_result else run_name
 
     @staticmethod
     def sequential_read(client, pool_name, **config):
@@ -187,7 +504,7 @@ class RadosBench:
             pool_name (str): osd pool name
 
         Returns:
-            run_name (str)
+            run_name (str) or BenchResult when return-result is set
 
         Example::
 
@@ -200,10 +517,16 @@ class RadosBench:
                 no-hints:  no-hint option (Boolean value, Default: false(hints))
                 concurrent-ios: integer (String value)
                 reuse-bench: bench name (String value)
+                return-result: return the parsed BenchResult (Boolean value)
+                result-store: store to persist the result in (BenchResultStore)
+                store-key: build, pool_type and profile of the stored result (Dict)
 
         :warning: there should be a write operation pre-executed.
 
         """
+        return_result = config.pop("return-result", False)
+        store = config.pop("result-store", None)
+        store_key = config.pop("store-key", None)
         base_cmd = ["rados", "bench"]
 
         run_name = config.get("run-name")
@@ -215,8 +538,13 @@ class RadosBench:
 
         base_cmd = " ".join(base_cmd)
 
-        client.exec_command(cmd=base_cmd, sudo=True)
-        return run_name if run_name else None
+        out, _ = client.exec_command(cmd=base_cmd, sudo=True)
+        run_name = run_name if run_name else None
+        if not (return_result or store):
+            return run_name
+
+        result = record_result(out, "seq", run_name, store, store_key)
+        return result if return_result else run_name
 
     @staticmethod
     def cleanup(client, pool_name, run_name=""):
@@ -3,6 +3,7 @@ import json
 import os
 import random
 import re
+import socket
 import time
 import traceback
 from json import loads
@@ -34,6 +35,7 @@ from compute.onecloud import (
     resolve_project_for_site,
 )
 from compute.openstack import CephVMNodeV2, NetworkOpFailure, NodeError, VolumeOpFailure
+from compute.provisioner import get_provision_scheduler
 from utility.log import Log
 from utility.retry import retry
 from utility.utils import (
@@ -282,6 +284,8 @@ def create_ibmc_ceph_nodes(
         else:
             params["root-login"] = True
 
+        # Throttling the spawning of VSI's to avoid hammering of provisioner
+        scheduler = get_provision_scheduler("ibmc", ibm_cred, custom_config)
         with parallel() as p:
             for node in range(1, 100):
                 node = "node" + str(node)
@@ -314,8 +318,7 @@ def create_ibmc_ceph_nodes(
                 if node_dict.get("cloud-data"):
                     node_params["cloud-data"] = node_dict.get("cloud-data")
 
-                # Throttling the spawning of VSI's to avoid hammering of provisioner
-                sleep(node_count * 5)
+                node_params["scheduler"] = scheduler
                 node_count += 1
 
                 p.spawn(setup_vm_node_ibm, node, ceph_nodes, **node_params)
@@ -348,6 +351,7 @@ def setup_vm_node_ibm(node, ceph_nodes, **params):
             }
         )
 
+        params["scheduler"].admit()
         vm.create(
             node_name=params["node-name"],
             image_name=params["image-name"],
@@ -364,6 +368,7 @@ def setup_vm_node_ibm(node, ceph_nodes, **params):
             no_of_volumes=params.get("no-of-volumes", 0),
             userdata=params.get("cloud-data", ""),
         )
+        params["scheduler"].succeeded()
 
         vm.role = params["role"]
         vm.root_login = params["root-login"]
@@ -373,6 +378,7 @@ def setup_vm_node_ibm(node, ceph_nodes, **params):
         ceph_nodes[node] = vm
     except RETRY_EXCEPTIONS as retry_except:
         log.warning(retry_except, exc_info=True)
+        params["scheduler"].failed(retry_except)
         if vm is not None:
             vm.delete(params["zone_name"])
 
@@ -529,7 +535,12 @@ def create_onecloud_ceph_nodes(
     if not virtual_machines:
         raise NodeError("OneCloud: no nodes in cluster config")
 
-    client = get_onecloud_client(api_key, base_url, verify_ssl=verify_ssl)
+    client = get_onecloud_client(
+        api_key,
+        base_url,
+        verify_ssl=verify_ssl,
+        scheduler=get_provision_scheduler("onecloud", cred, custom_config),
+    )
     vlan = get_vlan_for_site(client, site, vlan)
     os_hint = inv_create.get("os") or platform_conf.get("os") or "RedHat"
     # Prefer images matching inventory version_id (e.g. 9.7) when specified
@@ -778,9 +789,9 @@ def create_ceph_nodes(
         else:
             params["root-login"] = True
 
+        scheduler = get_provision_scheduler("openstack", os_cred, custom_config)
         with parallel() as p:
             for node in range(1, 100):
-                sleep(10 * node)
                 node = "node" + str(node)
                 if not ceph_cluster.get(node):
                     break
@@ -816,6 +827,7 @@ def create_ceph_nodes(
 
                 if node_dict.get("cloud-data"):
                     node_params["cloud-data"] = node_dict.get("cloud-data")
+                node_params["scheduler"] = scheduler
                 node_count += 1
                 p.spawn(setup_vm_node, node, ceph_nodes, **node_params)
 
@@ -853,6 +865,7 @@ def setup_vm_node(node, ceph_nodes, **params):
             }
         )
 
+        params["scheduler"].admit()
         vm.create(
             node_name=params["node-name"],
             image_name=params["image-name"],
@@ -862,6 +875,7 @@ def setup_vm_node(node, ceph_nodes, **params):
             size_of_disks=params.get("size-of-disks", 0),
             no_of_volumes=params.get("no-of-volumes", 0),
         )
+        params["scheduler"].succeeded()
 
         vm.role = params["role"]
         vm.root_login = params["root-login"]
@@ -872,6 +886,7 @@ def setup_vm_node(node, ceph_nodes, **params):
         ceph_nodes[node] = vm
     except RETRY_EXCEPTIONS as retry_except:
         log.warning(retry_except, exc_info=True)
+        params["scheduler"].failed(retry_except)
         if vm is not None:
             vm.delete()
 
@@ -962,6 +977,7 @@ def create_aws_ceph_nodes(
         else:
             params["root-login"] = True
 
+        scheduler = get_provision_scheduler("aws", aws_cred, custom_config)
         with parallel() as p:
             for node in range(1, 100):
                 node_key = "node" + str(node)
@@ -997,7 +1013,7 @@ def create_aws_ceph_nodes(
                 if node_dict.get("cloud-data"):
                     node_params["cloud-data"] = node_dict.get("cloud-data")
 
-                sleep(node_count * 5)
+                node_params["scheduler"] = scheduler
                 node_count += 1
                 p.spawn(setup_vm_node_aws, node_key, ceph_nodes, **node_params)
 
@@ -1033,6 +1049,7 @@ def setup_vm_node_aws(node, ceph_nodes, **params):
             }
         )
 
+        params["scheduler"].admit()
         vm.create(
             node_name=params["node-name"],
             image_id=params["image-id"],
@@ -1044,6 +1061,7 @@ def setup_vm_node_aws(node, ceph_nodes, **params):
             size_of_disks=params.get("size-of-disks", 0),
             no_of_volumes=params.get("no-of-volumes", 0),
         )
+        params["scheduler"].succeeded()
 
         vm.role = params["role"]
         vm.root_login = params["root-login"]
@@ -1053,6 +1071,7 @@ def setup_vm_node_aws(node, ceph_nodes, **params):
         ceph_nodes[node] = vm
     except RETRY_EXCEPTIONS as retry_except:
         log.warning(retry_except, exc_info=True)
+        params["scheduler"].failed(retry_except)
         if vm is not None:
             vm.delete()
         raise
@@ -1154,6 +1173,126 @@ def volume_cleanup(volume, osp_cred):
                     return 1
 
 
+def wait_for_port(ip_address, end_time, port=22, max_delay=10):
+    """Waits until the given TCP port is reachable.
+
+    The probe is retried with an exponential backoff starting at one second
+    and capped at max_delay seconds.
+
+    Args:
+        ip_address (str): address of the node
+        end_time (datetime): time until which the probe is retried
+        port (int): TCP port to be probed
+        max_delay (int): maximum delay between two probes
+
+    Raises:
+        NodeError: when the port is not reachable until end_time
+    """
+    delay = 1
+    while True:
+        try:
+            with socket.create_connection((ip_address, port), timeout=5):
+                return
+        except OSError as err:
+            if datetime.datetime.now() + datetime.timedelta(seconds=delay) > end_time:
+                raise NodeError(f"{ip_address}:{port} is not reachable. {err}")
+
+        sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+def connect_node(node, timeout=600):
+    """Connects the node once it is ready and returns the time of each stage.
+
+    The stages are the reachability of the SSH port, the SSH handshake, a
+    sentinel command and lastly CephNode.connect. The handshake and the
+    sentinel are part of connect for the nodes which need to be bootstrapped.
+
+    Args:
+        node (CephNode): node to be connected
+        timeout (int): maximum time in seconds for the node to be reachable
+
+    Returns:
+        dict of stage and the seconds it took
+    """
+    timings = dict()
+    end_time = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
+
+    _start = time.time()
+    wait_for_port(node.ip_address, end_time)
+    timings["tcp"] = time.time() - _start
+
+    if not node.needs_bootstrap:
+        _start = time.time()
+        node.rssh()
+        timings["ssh"] = time.time() - _start
+
+        _start = time.time()
+        with node.root_connection.session(timeout=60) as channel:
+            channel.exec_command("true")
+            channel.recv_exit_status()
+        timings["sentinel"] = time.time() - _start
+
+    _start = time.time()
+    node.connect()
+    timings["connect"] = time.time() - _start
+    timings["total"] = sum(timings.values())
+
+    return timings
+
+
+def connect_nodes(ceph_cluster_dict, timeout=600):
+    """Connects all the nodes of the clusters concurrently.
+
+    Each node is connected as soon as it is ready, the readiness of the nodes
+    is independent of each other. A report of the time taken by every stage
+    of the nodes is logged.
+
+    Args:
+        ceph_cluster_dict (dict): cluster name and Ceph object
+        timeout (int): maximum time in seconds for a node to be reachable
+
+    Returns:
+        dict of node hostname and its stage timings
+
+    Raises:
+        NodeError: when any of the nodes failed to be connected
+    """
+    nodes = [node for cluster in ceph_cluster_dict.values() for node in cluster]
+    if not nodes:
+        return dict()
+
+    report = dict()
+    errors = dict()
+
+    def _connect(node):
+        try:
+            report[node.vmname] = connect_node(node, timeout)
+        except BaseException as be:  # noqa
+            log.error(f"Failed to connect {node.vmname}: {be}", exc_info=True)
+            errors[node.vmname] = be
+
+    with parallel(max_workers=len(nodes)) as p:
+        for node in nodes:
+            p.spawn(_connect, node)
+
+    stages = ["tcp", "ssh", "sentinel", "connect", "total"]
+    msg = "\nNode readiness (seconds)\n"
+    msg += f"{'node':<40}" + "".join(f"{stage:>10}" for stage in stages)
+    for name, timings in sorted(report.items(), key=lambda x: x[1]["total"]):
+        msg += f"\n{name:<40}"
+        msg += "".join(
+            f"{timings[stage]:>10.1f}" if stage in timings else f"{'-':>10}"
+            for stage in stages
+        )
+    log.info(msg)
+
+    if errors:
+        raise NodeError(f"Unable to connect to {', '.join(errors)}")
+
+    return report
+
+
 def keep_alive(ceph_nodes):
     for node in ceph_nodes:
         node.exec_command(cmd="uptime", check_ec=False)
@@ -2,6 +2,8 @@ import json
 import os
 import pickle
 import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 from docopt import docopt
@@ -21,9 +23,19 @@ from utility.log import Log
 log = Log(__name__)
 
 CEPH_VAR_LOG_DIR = "/var/log/ceph"
-_CEPH_VAR_LOG_DIR = "var/log/ceph"
 CEPH_COREDUMP_DIR = "/var/lib/systemd/coredump/"
 
+# Nodes collected from concurrently and the max time spent on a node
+COLLECT_WORKERS = 16
+COLLECT_TIMEOUT = 3600
+
+# Log files larger than 1 GiB are left out and the archive of a node is cut
+# at 4 GiB, the coredumps are collected regardless of their size.
+COLLECT_MAX_FILE_SIZE = 1024 * 1024 * 1024
+COLLECT_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
 doc = """
 Utility to gather cluster information
 
@@ -141,47 +153,158 @@ def get_container_details(node):
     return _info
 
 
+def get_node_info(node):
+    """Gather the configuration info of the node"""
+    _info = get_node_details(node)
+    _info.update({"List_of_packages": get_installed_packages(node)})
+    if node.role == "installer":
+        _info.update({"Cluster_details": get_cluster_details(node)})
+
+    if node.role != "client":
+        _info.update({"List_of_images": get_container_images_details(node)})
+        _info.update({"List_of_containers": get_container_details(node)})
+
+    if node.role == "osd":
+        _info.update({"List_of_host_ceph_disks": get_osd_host_disks(node)})
+
+    return _info
+
+
 def gather_info(cluster):
-    """Gather cluster configuration info"""
-    info, nodes = {}, cluster.get_nodes()
-    for node in nodes:
-        _info = get_node_details(node)
-        _info.update({"List_of_packages": get_installed_packages(node)})
-        if node.role == "installer":
-            _info.update({"Cluster_details": get_cluster_details(node)})
+    """Gather cluster configuration info, querying the nodes concurrently"""
+    nodes = cluster.get_nodes()
+    if not nodes:
+        return {}
 
-        if node.role != "client":
-            _info.update({"List_of_images": get_container_images_details(node)})
-            _info.update({"List_of_containers": get_container_details(node)})
+    with ThreadPoolExecutor(max_workers=min(COLLECT_WORKERS, len(nodes))) as executor:
+        infos = list(executor.map(get_node_info, nodes))
 
-        if node.role == "osd":
-            _info.update({"List_of_host_ceph_disks": get_osd_host_disks(node)})
+    return {node.hostname: _info for node, _info in zip(nodes, infos)}
 
-        info.update({node.hostname: _info})
 
-    return info
+def archive_command(paths, exclude=None, max_file_size=None):
+    """Returns the command streaming a compressed tar archive of the paths.
 
+    The archive is compressed with zstd, or gzip on the nodes without zstd.
 
-def get_ceph_var_logs(cluster, log_dir):
+    Args:
+        paths (list): absolute paths of the directories or files to archive
+        exclude (list): find -path patterns of the files left out
+        max_file_size (int): files larger than the size in bytes are left out
     """
-    This method is to download and store
-    ceph cluster var logs into log directory.
+    _find = ["find", *[shlex.quote(path.lstrip("/")) for path in paths]]
+    for pattern in exclude or []:
+        _find += ["-not", "-path", shlex.quote(pattern.lstrip("/"))]
+    _find += ["-type", "f"]
+    if max_file_size:
+        _find += ["-size", f"-{max_file_size // 1024 + 1}k"]
+
+    return (
+        f"cd / && {' '.join(_find)} -print0 2>/dev/null | "
+        "tar --null --no-recursion -T - --warning=no-file-changed "
+        "--ignore-failed-read -cf - | "
+        "if command -v zstd >/dev/null; then zstd -q -T0 -c; else gzip -c; fi"
+    )
+
+
+def collect_artifacts(
+    cluster,
+    download_dir,
+    name,
+    paths,
+    exclude=None,
+    max_file_size=COLLECT_MAX_FILE_SIZE,
+    max_bytes=COLLECT_MAX_BYTES,
+    workers=COLLECT_WORKERS,
+    timeout=COLLECT_TIMEOUT,
+):
+    """Streams an archive of the paths from all the nodes into download_dir.
+
+    The archive of a node is streamed over an SSH channel straight into the
+    local file <hostname>-<name>.tar.zst, or .tar.gz when the node lacks
+    zstd, nothing is written to the disks of the nodes. The nodes are
+    collected from concurrently, a node failing does not affect the others.
+
+    Args:
+        cluster (Ceph): cluster whose nodes are collected from
+        download_dir (str): local directory of the archives
+        name (str): name of the archives
+        paths (list): absolute paths of the directories or files to archive
+        exclude (list): find -path patterns of the files left out
+        max_file_size (int): files larger than the size in bytes are left out
+        max_bytes (int): max size in bytes of the archive of a node, the
+                         archive is cut beyond the size
+        workers (int): nodes collected from concurrently
+        timeout (int): max time in seconds to collect from a node
+
+    Returns:
+        dict of the bytes, time, throughput and error of every node
     """
-    download_dir = os.path.join(log_dir, "ceph_logs")
     os.makedirs(download_dir, exist_ok=True)
-    for node in cluster.get_nodes():
-        tar_file = f"{node.hostname}-cephlog.tar"
-        node.exec_command(
-            cmd=f"tar -C / --warning=no-file-changed -cvzf {tar_file} {_CEPH_VAR_LOG_DIR}",
-            sudo=True,
+    cmd = archive_command(paths, exclude, max_file_size)
+
+    def collect(node):
+        dst = os.path.join(download_dir, f"{node.hostname}-{name}.tar.zst")
+        stats = {"file": dst}
+        try:
+            with open(dst, "wb") as fp:
+                size, err, rc, elapsed = node.stream_command(
+                    cmd, fp, sudo=True, timeout=timeout, max_bytes=max_bytes
+                )
+
+            # The archive was compressed with gzip on a node without zstd
+            with open(dst, "rb") as fp:
+                if fp.read(2) == GZIP_MAGIC:
+                    os.replace(dst, dst[: -len(".zst")] + ".gz")
+                    stats["file"] = dst[: -len(".zst")] + ".gz"
+
+            stats.update(
+                {
+                    "bytes": size,
+                    "elapsed": round(elapsed, 3),
+                    "throughput": size / elapsed if elapsed else 0,
+                    "truncated": rc is None,
+                }
+            )
+            if rc:
+                stats["error"] = err.strip()
+            log.info(
+                f"Collected {name} of {node.hostname} to {stats['file']}: {size} bytes "
+                f"in {elapsed:.2f}s ({stats['throughput'] / 1024 / 1024:.2f} MiB/s)"
+            )
+        except Exception as e:
+            log.error(f"Failed to collect {name} of {node.hostname}: {e}")
+            stats["error"] = str(e)
+
+        return node.hostname, stats
+
+    nodes = cluster.get_nodes()
+    if not nodes:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(nodes))) as executor:
+        stats = dict(executor.map(collect, nodes))
+
+    collected = [_stats for _stats in stats.values() if "bytes" in _stats]
+    if collected:
+        slowest = max(collected, key=lambda x: x["elapsed"])
+        log.info(
+            f"Collected {name} of {len(collected)}/{len(nodes)} nodes, "
+            f"{sum(x['bytes'] for x in collected)} bytes, slowest node took "
+            f"{slowest['elapsed']}s"
         )
 
-        node.download_file(
-            src=tar_file,
-            dst=os.path.join(download_dir, tar_file),
-            sudo=True,
-        )
-        log.info(f"Downloading {tar_file} from {node.hostname} to {download_dir}")
+    return stats
+
+
+def get_ceph_var_logs(cluster, log_dir):
+    """
+    This method is to download and store
+    ceph cluster var logs into log directory.
+    """
+    return collect_artifacts(
+        cluster, os.path.join(log_dir, "ceph_logs"), "cephlog", [CEPH_VAR_LOG_DIR]
+    )
 
 
 def collect_ceph_coredumps(cluster, _dir):
@@ -189,18 +312,13 @@ def collect_ceph_coredumps(cluster, _dir):
     This method is to download and store
     ceph coredumps into custom directory.
     """
-    download_dir = os.path.join(_dir, "ceph_coredumps")
-    os.makedirs(download_dir, exist_ok=True)
-    for node in cluster.get_nodes():
-        tar_file = f"{node.hostname}-coredump.tar"
-        node.exec_command(cmd=f"tar -cvzf {tar_file} {CEPH_COREDUMP_DIR}", sudo=True)
-
-        node.download_file(
-            src=tar_file,
-            dst=os.path.join(download_dir, tar_file),
-            sudo=True,
-        )
-        log.info(f"Downloading {tar_file} from {node.hostname} to {download_dir}")
+    return collect_artifacts(
+        cluster,
+        os.path.join(_dir, "ceph_coredumps"),
+        "coredump",
+        [CEPH_COREDUMP_DIR],
+        max_file_size=None,
+    )
 
 
 def write_output(data, output):
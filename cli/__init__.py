@@ -1,5 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import partialmethod
 
+from utility.log import Log
+
+log = Log(__name__)
+
+# Maximum number of nodes on which a command is executed concurrently
+FANOUT_WORKERS = 16
+
 
 class Cli:
     def __init__(self, ctx):
@@ -8,30 +16,66 @@ class Cli:
     def execute(self, cmd, sudo=False, long_running=False, check_ec=False, **kwargs):
         """Inerface to execute commands on node(s).
 
+        When the context is a list of nodes, the command is executed on the
+        nodes concurrently. The failures of all the nodes are reported once
+        every node has completed and the first failure is raised.
+
         Args:
             cmd (str): Command to be execute
             sudo (bool): Use root access
             long_running (bool): Long running command
             check_exit_status (bool): Check command exit status
+            timeout (int): Per node command timeout (default: 3600)
+            max_workers (int): Maximum nodes executing the command at a time
+            parallel (bool): Execute on the nodes concurrently (default: True)
+
+        Returns:
+            Command output or a dict of node shortname and its output for
+            a list of nodes.
         """
-        if isinstance(self.ctx, list):
-            out = {}
-            for ctx in self.ctx:
-                out[ctx.shortname] = ctx.exec_command(
-                    cmd=cmd,
-                    sudo=sudo,
-                    long_running=long_running,
-                    check_ec=check_ec,
-                    timeout=kwargs.get("timeout", 3600),
-                )
-            return out
-        else:
-            return self.ctx.exec_command(
+        timeout = kwargs.get("timeout", 3600)
+
+        def _execute(ctx):
+            return ctx.exec_command(
                 cmd=cmd,
                 sudo=sudo,
                 long_running=long_running,
                 check_ec=check_ec,
-                timeout=kwargs.get("timeout", 3600),
+                timeout=timeout,
             )
 
+        if not isinstance(self.ctx, list):
+            return _execute(self.ctx)
+
+        if not kwargs.get("parallel", True) or len(self.ctx) < 2:
+            return {ctx.shortname: _execute(ctx) for ctx in self.ctx}
+
+        workers = min(kwargs.get("max_workers", FANOUT_WORKERS), len(self.ctx))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {ctx.shortname: executor.submit(_execute, ctx) for ctx in self.ctx}
+
+        # The per node timeout is enforced by exec_command, the wait is only a
+        # safeguard against the nodes stuck beyond it.
+        wait_time = None
+        if isinstance(timeout, (int, float)):
+            wait_time = timeout * -(-len(self.ctx) // workers) + 60
+        _, not_done = wait(futures.values(), timeout=wait_time)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        out, errors = {}, {}
+        for shortname, future in futures.items():
+            if future in not_done:
+                errors[shortname] = TimeoutError(f"{cmd} did not complete on time")
+            elif future.exception():
+                errors[shortname] = future.exception()
+            else:
+                out[shortname] = future.result()
+
+        if errors:
+            report = "\n".join(f"  {name}: {err}" for name, err in errors.items())
+            log.error(f"{cmd} failed on {len(errors)}/{len(self.ctx)} nodes\n{report}")
+            raise next(iter(errors.values()))
+
+        return out
+
     execute_as_sudo = partialmethod(execute, sudo=True)
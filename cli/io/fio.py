@@ -1,6 +1,169 @@
+import csv
 import itertools
+import json
+import os
+from collections import defaultdict
 
 from cli import Cli
+from utility.log import Log
+
+log = Log(__name__)
+
+# Completion latency percentiles collected from the fio results
+CLAT_PERCENTILES = ("50", "90", "95", "99", "99.9")
+
+RESULT_FIELDS = [
+    "workload",
+    "size",
+    "iodepth",
+    "client",
+    "mount",
+    "job",
+    "direction",
+    "iops",
+    "bw_kib",
+    "clat_mean_us",
+] + [f"clat_p{x}_us" for x in CLAT_PERCENTILES]
+
+MATRIX_FIELDS = [
+    "workload",
+    "size",
+    "iodepth",
+    "direction",
+    "jobs",
+    "iops",
+    "bw_kib",
+    "clat_mean_us",
+] + [f"clat_p{x}_us" for x in CLAT_PERCENTILES]
+
+
+def parse_fio_result(data, **keys):
+    """
+    Parses the fio json output into per job and direction rows
+
+    Args:
+        data (str): fio json output
+        keys: workload, size, iodepth, client and mount of the run
+
+    Returns:
+        list of dict with RESULT_FIELDS
+    """
+    # fio may emit notes ahead of the json document
+    result = json.loads(data[data.find("{") :])
+    rows = []
+    for job in result.get("jobs", []):
+        for direction in ("read", "write", "trim"):
+            stats = job.get(direction)
+            if not stats or not stats.get("total_ios", stats.get("io_bytes")):
+                continue
+
+            # Older fio releases report the completion latency in usec
+            clat, scale = stats.get("clat_ns"), 1000
+            if clat is None:
+                clat, scale = stats.get("clat", {}), 1
+
+            percentiles = {
+                float(k): v for k, v in (clat.get("percentile") or {}).items()
+            }
+            row = dict(
+                keys,
+                job=job.get("jobname"),
+                direction=direction,
+                iops=stats.get("iops", 0),
+                bw_kib=stats.get("bw", 0),
+                clat_mean_us=clat.get("mean", 0) / scale,
+            )
+            for x in CLAT_PERCENTILES:
+                value = percentiles.get(float(x))
+                row[f"clat_p{x}_us"] = value / scale if value is not None else None
+            rows.append(row)
+
+    return rows
+
+
+def aggregate_fio_results(rows):
+    """
+    Merges the results of all the clients and mounts into a matrix keyed by
+    workload, size, iodepth and direction.
+
+    IOPS and bandwidth are summed, the mean latency is weighted by IOPS and
+    the percentiles are the worst reported.
+    """
+    groups = defaultdict(list)
+    for row in rows:
+        key = (row["workload"], row["size"], row["iodepth"], row["direction"])
+        groups[key].append(row)
+
+    matrix = []
+    for (workload, size, iodepth, direction), group in sorted(groups.items()):
+        iops = sum(x["iops"] for x in group)
+        entry = dict(
+            workload=workload,
+            size=size,
+            iodepth=iodepth,
+            direction=direction,
+            jobs=len(group),
+            iops=iops,
+            bw_kib=sum(x["bw_kib"] for x in group),
+            clat_mean_us=(
+                sum(x["clat_mean_us"] * x["iops"] for x in group) / iops if iops else 0
+            ),
+        )
+        for x in CLAT_PERCENTILES:
+            values = [r[f"clat_p{x}_us"] for r in group if r[f"clat_p{x}_us"]]
+            entry[f"clat_p{x}_us"] = max(values) if values else None
+        matrix.append(entry)
+
+    return matrix
+
+
+def write_fio_results(rows, results_dir):
+    """
+    Writes the per job results and the aggregated matrix as CSV files
+
+    Args:
+        rows (list): results of one or more Fio runs
+        results_dir (str): directory in which the files are created
+
+    Returns:
+        tuple of the results and matrix file paths
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    files = (
+        (os.path.join(results_dir, "fio_results.csv"), RESULT_FIELDS, rows),
+        (
+            os.path.join(results_dir, "fio_matrix.csv"),
+            MATRIX_FIELDS,
+            aggregate_fio_results(rows),
+        ),
+    )
+    for path, fields, data in files:
+        with open(path, "w", newline="") as _csv:
+            writer = csv.DictWriter(_csv, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(data)
+        log.info(f"Fio results written to {path}")
+
+    return files[0][0], files[1][0]
+
+
+def merge_fio_results(runs, results_dir):
+    """
+    Merges the results of the Fio runs of all the clients into one aggregate
+
+    Args:
+        runs (list): Fio objects run with a results_dir
+        results_dir (str): directory in which the aggregate files are created
+
+    Returns:
+        tuple of the results and matrix file paths, None without any result
+    """
+    rows = [row for run in runs for row in run.results]
+    if not rows:
+        log.warning("No fio results collected to be aggregated")
+        return None
+
+    return write_fio_results(rows, results_dir)
 
 
 class Fio(Cli):
@@ -13,6 +176,8 @@ class Fio(Cli):
         self.sizes = None
         self.iodepth_values = None
         self.numjobs = None
+        self.combinations = dict()
+        self.results = []
 
     def create_config(self):
         """
@@ -24,6 +189,7 @@ class Fio(Cli):
         for combo in itertools.product(self.workloads, self.sizes, self.iodepth_values):
             workload, size, iodepth = combo
             filename = f"file_{workload}_{size}_{iodepth}.fio"
+            self.combinations[filename] = combo
             configs.append(
                 (
                     filename,
@@ -67,7 +233,48 @@ iodepth= {iodepth}
 """
         return config
 
-    def run(self, mount_dir, ioengine, workloads, sizes, iodepth_values, numjobs):
+    def collect_result(self, result_file, results_dir):
+        """
+        Downloads the json result of a fio job and parses it
+        Args:
+            result_file (str): json result file on the client
+            results_dir (str): local directory to which the file is downloaded
+
+        Returns:
+            list of the result rows, empty if the result could not be collected
+        """
+        workload, size, iodepth = self.combinations[
+            result_file.split(".fio_")[0] + ".fio"
+        ]
+        local_file = os.path.join(results_dir, self.ctx.hostname, result_file)
+        os.makedirs(os.path.dirname(local_file), exist_ok=True)
+        try:
+            self.ctx.download_file(src=result_file, dst=local_file, sudo=True)
+            with open(local_file) as _file:
+                rows = parse_fio_result(
+                    _file.read(),
+                    workload=workload,
+                    size=size,
+                    iodepth=iodepth,
+                    client=self.ctx.hostname,
+                    mount=self.mount_dir,
+                )
+        except Exception as err:
+            log.error(f"Failed to collect fio result {result_file}: {err}")
+            return []
+
+        return rows
+
+    def run(
+        self,
+        mount_dir,
+        ioengine,
+        workloads,
+        sizes,
+        iodepth_values,
+        numjobs,
+        results_dir=None,
+    ):
         """
         Run Fio
         Args:
@@ -77,6 +284,10 @@ iodepth= {iodepth}
             sizes (str): size
             iodepth_values (str): Depth of IO
             numjobs (str): Number of jobs
+            results_dir (str): Local directory for the results, when provided
+                the json result of each job is downloaded once it completes
+                and the results of the mount are written as CSV files. The
+                rows of every mount run are kept in self.results.
         """
         self.ioengine = ioengine
         self.mount_dir = mount_dir
@@ -87,7 +298,14 @@ iodepth= {iodepth}
         # Update Fio configuration
         filenames = self.create_config()
 
+        if results_dir and self.ctx.role == "windows_client":
+            log.warning(
+                f"fio results of {self.ctx.hostname} not collected, the json results "
+                "are written by the linux clients only"
+            )
+
         # Run Fio
+        rows = []
         for file in filenames:
             if self.ctx.role == "windows_client":
                 cmd = (
@@ -96,10 +314,21 @@ iodepth= {iodepth}
                 )
                 self.execute(long_running=True, cmd=cmd)
             else:
-                cmd = (
-                    f"fio {file} --output-format=json "
-                    f"--output={file}_{self.ctx.hostname}_{mount_dir.replace('/', '')}.json"
+                result_file = (
+                    f"{file}_{self.ctx.hostname}_{mount_dir.replace('/', '')}.json"
                 )
+                cmd = f"fio {file} --output-format=json --output={result_file}"
                 self.execute(sudo=True, long_running=True, cmd=cmd)
+                if results_dir:
+                    rows.extend(self.collect_result(result_file, results_dir))
+
+        self.results.extend(rows)
+        if results_dir and rows:
+            write_fio_results(
+                rows,
+                os.path.join(
+                    results_dir, self.ctx.hostname, mount_dir.replace("/", "")
+                ),
+            )
 
         return True
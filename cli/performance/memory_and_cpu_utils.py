@@ -1,6 +1,7 @@
 import os
 from threading import Thread
 
+from ceph.parallel import parallel
 from cli.utilities.configs import get_cephci_config
 from utility.log import Log
 
@@ -125,20 +126,24 @@ def download_logger_data_from_nodes(download_path, tracker):
         tracker(dict): Tracker Dictionary containing nodes and files to be copied for each node
     """
     try:
-        for node, files in tracker.items():
-            for file in files:
-                src_file = f"/root/{file}.csv"
-                download_dir = (
-                    f"{download_path}/performance-metrics/{file.split('-')[-1]}"
-                )
-                os.makedirs(download_dir, exist_ok=True)
-                node.download_file(
-                    src=src_file, dst=f"{download_dir}/{file}.csv", sudo=True
-                )
-                log.info(f"Downloading {file} from {node.hostname} to {download_dir}")
+        # The nodes are downloaded from concurrently, each of them transferring
+        # its files over its cached SFTP sessions.
+        with parallel() as p:
+            for node, files in tracker.items():
+                transfers = []
+                for file in files:
+                    download_dir = (
+                        f"{download_path}/performance-metrics/{file.split('-')[-1]}"
+                    )
+                    os.makedirs(download_dir, exist_ok=True)
+                    transfers.append(
+                        (f"/root/{file}.csv", f"{download_dir}/{file}.csv")
+                    )
+                log.info(f"Downloading {files} from {node.hostname}")
+                p.spawn(node.download_files, transfers, sudo=True)
         log.info("All files downloaded from all the nodes")
-    except Exception:
-        log.error(f"Failed to download {file} from {node.hostname}")
+    except Exception as e:
+        log.error(f"Failed to download the logger data from the nodes: {e}")
 
 
 def _get_process_list_to_monitor():
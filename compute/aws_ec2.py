@@ -257,13 +257,19 @@ class CephVMNodeAWS:
         return state
 
     def __setstate__(self, state: dict) -> None:
-        """Restore state from pickle; recreate EC2 client from credentials."""
+        """Restore state from pickle; the EC2 client is recreated on first use."""
         self.__dict__.update(state)
-        self.client = get_ec2_client(
-            region=self._aws_cred["region"],
-            access_key=self._aws_cred.get("access_key"),
-            secret_key=self._aws_cred.get("secret_key"),
-        )
+
+    def __getattr__(self, name):
+        if name == "client":
+            self.client = get_ec2_client(
+                region=self._aws_cred["region"],
+                access_key=self._aws_cred.get("access_key"),
+                secret_key=self._aws_cred.get("secret_key"),
+            )
+            return self.client
+
+        raise AttributeError(name)
 
     @property
     def ip_address(self) -> str:
@@ -1205,11 +1205,25 @@ class CephVMNodeIBM:
     def __setstate__(self, state) -> None:
         """
         Rehydrate the object after unpickling.
-        Rebuilds the IBM Cloud services using stored credentials.
+        The IBM Cloud services are rebuilt on their first use.
         """
+        state.pop("service", None)
+        state.pop("dns_service", None)
         self.__dict__.update(state)
 
-        access_key = self._os_cred_ibm["accesskey"]
-        service_url = self._os_cred_ibm["service_url"]
-        self.service = get_ibm_service(access_key=access_key, service_url=service_url)
-        self.dns_service = get_dns_service(access_key=access_key)
+    def __getattr__(self, name):
+        """Rebuilds the IBM Cloud services using stored credentials."""
+        if name == "service":
+            self.service = get_ibm_service(
+                access_key=self._os_cred_ibm["accesskey"],
+                service_url=self._os_cred_ibm["service_url"],
+            )
+            return self.service
+
+        if name == "dns_service":
+            self.dns_service = get_dns_service(
+                access_key=self._os_cred_ibm["accesskey"]
+            )
+            return self.dns_service
+
+        raise AttributeError(name)
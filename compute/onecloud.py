@@ -22,6 +22,7 @@ VM_POLL_INTERVAL = 30
 VM_POLL_TIMEOUT = 1800  # 30 minutes
 CLEANUP_VERIFY_INTERVAL = 5
 CLEANUP_VERIFY_TIMEOUT = 900  # 15 minutes max to wait for deletion to complete
+THROTTLE_RETRIES = 5  # attempts of a rate limited request when throttled
 
 # VM name fields the API may return (OpenAPI uses vmname; some implementations use camelCase)
 VM_NAME_KEYS = ("vmname", "vmName", "VMName", "name")
@@ -95,6 +96,7 @@ def get_onecloud_client(
     api_key: str,
     base_url: str,
     verify_ssl: bool = False,
+    scheduler=None,
 ):
     """
     Return a simple requests-based client for OneCloud API.
@@ -103,6 +105,9 @@ def get_onecloud_client(
         api_key: JWT Bearer token for authentication.
         base_url: API base URL from credentials (global_credentials / osp-cred).
         verify_ssl: If False (default), disable SSL verification.
+        scheduler: Optional compute.provisioner.ProvisionScheduler; when set, each
+            request is admitted by it and throttled (429) requests are retried
+            after its backoff.
 
     Returns:
         Object with get/post/put/delete methods that add auth headers.
@@ -121,7 +126,18 @@ def get_onecloud_client(
         headers.setdefault("Content-Type", "application/json")
         headers.setdefault("Authorization", f"Bearer {api_key}")
         kwargs.setdefault("verify", verify_ssl)
-        return requests.request(method, url, headers=headers, timeout=120, **kwargs)
+        if scheduler is None:
+            return requests.request(method, url, headers=headers, timeout=120, **kwargs)
+
+        for _ in range(THROTTLE_RETRIES):
+            scheduler.admit()
+            resp = requests.request(method, url, headers=headers, timeout=120, **kwargs)
+            if resp.status_code != 429:
+                scheduler.succeeded()
+                return resp
+            retry_after = resp.headers.get("Retry-After", "")
+            scheduler.throttled(int(retry_after) if retry_after.isdigit() else None)
+        return resp
 
     class Client:
         def get(self, path: str, **kwargs) -> requests.Response:
@@ -272,9 +272,16 @@ class CephVMNodeV2:
         return state
 
     def __setstate__(self, state) -> None:
+        state.pop("driver", None)
         self.__dict__.update(state)
 
-        self.driver = get_openstack_driver(**self._os_cred)
+    def __getattr__(self, name):
+        # The driver is recreated on its first use after unpickling
+        if name == "driver":
+            self.driver = get_openstack_driver(**self._os_cred)
+            return self.driver
+
+        raise AttributeError(name)
 
     # Private methods to the object
     def _get_node(self, name: str) -> Node:
@@ -0,0 +1,268 @@
+"""Rate limited admission of cloud provisioning API calls.
+
+The clouds throttle the number of API requests a tenant can issue, hence the
+VM spawns cannot be fired all at once. Instead of staggering the spawns with
+fixed sleeps, a token bucket per cloud admits a request as soon as a token is
+available. The bucket holds up to ``burst`` tokens and is refilled at ``rate``
+tokens per second.
+
+When the cloud responds with a throttling error, the bucket is paused for an
+exponentially growing backoff which is shared by all the spawns of the cloud.
+The backoff decays with every successful request.
+
+Example::
+
+    scheduler = get_provision_scheduler("openstack", os_cred, custom_config)
+    scheduler.admit()
+    try:
+        vm.create(...)
+    except BaseException as be:
+        scheduler.failed(be)
+        raise
+    scheduler.succeeded()
+"""
+
+import re
+import threading
+from time import monotonic, sleep
+
+from utility.log import Log
+from utility.utils import parse_custom_config_list
+
+LOG = Log(__name__)
+
+# Per cloud defaults of the token bucket. rate is in tokens per second.
+PROVISION_LIMITS = {
+    "openstack": {"rate": 0.5, "burst": 3},
+    "ibmc": {"rate": 0.5, "burst": 2},
+    "aws": {"rate": 2.0, "burst": 5},
+    "onecloud": {"rate": 1.0, "burst": 5},
+}
+DEFAULT_LIMIT = {"rate": 0.5, "burst": 2}
+
+MIN_BACKOFF = 5
+MAX_BACKOFF = 120
+
+# Markers found in the errors of the cloud SDKs when the API is throttled.
+THROTTLE_MARKERS = (
+    "too many requests",
+    "rate limit",
+    "ratelimit",
+    "requestlimitexceeded",
+    "throttl",
+    "over limit",
+    "overlimit",
+)
+
+_schedulers = dict()
+_schedulers_lock = threading.Lock()
+
+
+def is_throttle_error(error):
+    """Returns True when the given exception was caused by API throttling.
+
+    The exception chain is inspected as the compute drivers wrap the SDK
+    errors in NodeError.
+
+    Args:
+        error (BaseException): exception raised by the cloud call
+    """
+    while error is not None:
+        for attr in ("code", "status_code", "http_status"):
+            if getattr(error, attr, None) == 429:
+                return True
+
+        _msg = str(error).lower()
+        if re.search(r"\b429\b", _msg) or any(
+            marker in _msg for marker in THROTTLE_MARKERS
+        ):
+            return True
+
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
+def validate_limits(rate, burst):
+    """Raises ValueError unless the rate is positive and the burst at least 1.
+
+    Args:
+        rate (float): tokens added per second
+        burst (int): maximum number of tokens held
+    """
+    if not float(rate) > 0:
+        raise ValueError(f"Provision rate must be greater than 0, got {rate}")
+
+    if not float(burst) >= 1:
+        raise ValueError(f"Provision burst must be at least 1, got {burst}")
+
+
+class TokenBucket:
+    """Thread safe token bucket."""
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate (float): tokens added per second
+            burst (int): maximum number of tokens held
+        """
+        validate_limits(rate, burst)
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Blocks until a token is available and consumes it.
+
+        Returns:
+            float: seconds spent waiting for the token
+        """
+        _start = monotonic()
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._refill(now)
+                if now < self._resume_at:
+                    wait = self._resume_at - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - _start
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+            sleep(wait)
+
+    def update(self, rate, burst):
+        """Updates the refill rate and the capacity of the bucket."""
+        validate_limits(rate, burst)
+        with self._lock:
+            self._refill(monotonic())
+            self.rate = float(rate)
+            self.burst = int(burst)
+
+    def pause(self, duration):
+        """Stops issuing tokens for the given duration and drains the bucket."""
+        with self._lock:
+            now = monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            self._resume_at = max(self._resume_at, now + duration)
+
+
+class ProvisionScheduler:
+    """Admits the provisioning API calls of a cloud."""
+
+    def __init__(self, cloud, rate, burst):
+        """
+        Args:
+            cloud (str): name of the cloud
+            rate (float): admitted calls per second
+            burst (int): calls admitted back to back
+        """
+        self.cloud = cloud
+        self.bucket = TokenBucket(rate, burst)
+        self.backoff = 0
+        self.throttled_count = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate, burst):
+        """Updates the limits of the bucket."""
+        self.bucket.update(rate, burst)
+
+    def admit(self):
+        """Blocks until the next call to the cloud is allowed."""
+        waited = self.bucket.acquire()
+        if waited >= 1:
+            LOG.debug("%s: provisioning call admitted after %.1fs", self.cloud, waited)
+
+    def throttled(self, retry_after=None):
+        """Backs off all the calls of the cloud after a throttling response.
+
+        Args:
+            retry_after (int): delay requested by the cloud, if any
+        """
+        with self._lock:
+            self.throttled_count += 1
+            self.backoff = min(MAX_BACKOFF, max(MIN_BACKOFF, self.backoff * 2))
+            delay = max(self.backoff, retry_after or 0)
+
+        LOG.warning("%s: API throttled, backing off for %ss", self.cloud, delay)
+        self.bucket.pause(delay)
+
+    def succeeded(self):
+        """Decays the backoff after a successful call."""
+        with self._lock:
+            self.backoff = self.backoff // 2 if self.backoff > MIN_BACKOFF else 0
+
+    def failed(self, error):
+        """Backs off when the given error is a throttling response.
+
+        Returns:
+            bool: True when the error was caused by throttling
+        """
+        if is_throttle_error(error):
+            self.throttled()
+            return True
+
+        return False
+
+
+def get_provision_limits(cloud, cred=None, custom_config=None):
+    """Returns the rate and burst to be used for the given cloud.
+
+    The precedence is custom config (provision_rate, provision_burst), the
+    cloud credentials (provision-rate, provision-burst) and lastly the
+    defaults in PROVISION_LIMITS.
+
+    Raises:
+        ValueError: when the rate is not positive or the burst is below 1
+
+    Args:
+        cloud (str): name of the cloud
+        cred (dict): credentials section of the cloud
+        custom_config (list): key=value strings from the CLI
+    """
+    limits = dict(PROVISION_LIMITS.get(cloud, DEFAULT_LIMIT))
+    cred = cred or dict()
+    overrides = parse_custom_config_list(custom_config)
+    for key in ("rate", "burst"):
+        value = overrides.get(f"provision_{key}")
+        if value is None:
+            value = cred.get(f"provision-{key}")
+        if value is None:
+            continue
+
+        try:
+            limits[key] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid provision {key} '{value}' for {cloud}")
+
+    validate_limits(**limits)
+    return limits
+
+
+def get_provision_scheduler(cloud, cred=None, custom_config=None):
+    """Returns the scheduler shared by all the clusters of the given cloud.
+
+    Args:
+        cloud (str): name of the cloud
+        cred (dict): credentials section of the cloud
+        custom_config (list): key=value strings from the CLI
+    """
+    limits = get_provision_limits(cloud, cred, custom_config)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(cloud)
+        if scheduler is None:
+            scheduler = ProvisionScheduler(cloud, **limits)
+            _schedulers[cloud] = scheduler
+        else:
+            scheduler.configure(**limits)
+
+    return scheduler
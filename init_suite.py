@@ -5,8 +5,7 @@ from copy import deepcopy
 from glob import glob
 from typing import List
 
-import yaml
-
+from utility.catalog import load_yaml
 from utility.log import Log
 
 log = Log(__name__)
@@ -45,11 +44,7 @@ def read_yaml(file_name):
     Returns:
         dict: data from yaml
     """
-    file_path = os.path.abspath(file_name)
-    with open(file_path) as fp:
-        data = yaml.safe_load(fp)
-
-    return data
+    return load_yaml(file_name)
 
 
 def process_override(dir_name: str) -> List:
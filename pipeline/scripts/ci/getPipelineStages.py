@@ -8,13 +8,15 @@ import sys
 import yaml
 from docopt import docopt
 
+from utility.catalog import Catalog, index_conf, load_yaml
+
 log = logging.getLogger(__name__)
 doc = """
 This script fetches all the tests to be run for a pipeline based on the RHCS version and overrides
 
     Usage:
         getPipelineStages.py --rhcephVersion <VER> --tags <tags>
-                  [--overrides <str>]
+                  [--overrides <str>] [--quota <str>] [--durations <file>]
 
         getPipelineStages.py (-h | --help)
 
@@ -23,14 +25,116 @@ This script fetches all the tests to be run for a pipeline based on the RHCS ver
         -v --rhcephVersion VER     The rhcephVersion for which test stages need to be fetched
         -t --tags <str>    tags to be used for filtering test scripts
         -o --overrides <str>       Overrides to be considered for execution
+        -q --quota <str>           Cloud quota in json, with the keys instances,
+                                   volumes and gigabytes, to plan the execution
+        -d --durations <file>      Yaml file with the expected minutes per suite
 """
 
+# Minutes expected for a suite without an estimate
+DEFAULT_SUITE_DURATION = 120
+
+# Resources of the cloud quota considered while planning the execution
+QUOTA_RESOURCES = ("instances", "volumes", "gigabytes")
+
+_catalog = None
+
 
 def generate_random_string(length):
     """Generate a random alphanumeric string of given length"""
     return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
 
 
+def get_catalog():
+    """Returns the catalog of the repository, refreshed once per invocation."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog().refresh()
+
+    return _catalog
+
+
+def get_suite_footprint(global_conf):
+    """
+    Compute the cloud resources needed by a test suite from its cluster configuration
+
+    The configuration is served from the catalog, it is parsed only when it
+    is not part of the catalog.
+
+    Args:
+        global_conf: path of the global configuration file relative to the repository
+
+    Returns:
+        Dictionary with the instances, volumes and gigabytes requested by all the clusters
+    """
+    index = get_catalog().conf(global_conf)
+    if index is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        index = index_conf(load_yaml(f"{current_dir}/../../../{global_conf}"))
+
+    clusters = index["clusters"].values()
+    return {
+        "instances": sum(cluster["nodes"] for cluster in clusters),
+        "volumes": sum(cluster["volumes"] for cluster in clusters),
+        "gigabytes": sum(cluster["gigabytes"] for cluster in clusters),
+    }
+
+
+def plan_execution(suites, quota):
+    """
+    Schedule the test suites into concurrent waves within the cloud quota.
+
+    The suites are considered longest first, a suite is started as soon as the
+    resources it needs are free, hence the long pole suites start in the first
+    wave and the shorter ones fill the capacity left behind. A suite needing
+    more than the quota is started only when no other suite is running.
+
+    Args:
+        suites: Dictionary of suite name and its footprint with the duration in minutes
+        quota: Dictionary of the available instances, volumes and gigabytes
+
+    Returns:
+        Dictionary containing the waves with their start time, the start and end of
+        every suite and the predicted makespan in minutes
+    """
+    limits = {key: quota[key] for key in QUOTA_RESOURCES if quota.get(key)}
+    pending = sorted(
+        suites,
+        key=lambda name: (-suites[name]["duration"], -suites[name]["instances"]),
+    )
+    used = dict.fromkeys(limits, 0)
+    running, schedule, waves = [], {}, []
+    now = 0
+
+    while pending:
+        started = []
+        for name in list(pending):
+            demand = suites[name]
+            if running and any(used[key] + demand[key] > limits[key] for key in limits):
+                continue
+
+            for key in limits:
+                used[key] += demand[key]
+            end = now + demand["duration"]
+            running.append((end, name))
+            schedule[name] = {**demand, "start": now, "end": end}
+            started.append(name)
+            pending.remove(name)
+
+        if started:
+            waves.append({"start": now, "suites": started})
+
+        # advance to the next completion, releasing the suites ending together
+        running.sort()
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, finished = running.pop(0)
+            for key in limits:
+                used[key] -= suites[finished][key]
+
+    makespan = max((suite["end"] for suite in schedule.values()), default=0)
+    return {"makespan": makespan, "waves": waves, "suites": schedule}
+
+
 def fetch_stages(args):
     """
     Fetch test stages to be executed based on the input provided
@@ -44,6 +148,8 @@ def fetch_stages(args):
                 "tags": comma separated string containing the tags based on which the stages should be filtered,
                 "overrides": <overrides in json format, all keys accepted by run.py are supported to be overridden
                             if any key similar to --store which does not have a value it can be passed as "store": ""
+                "quota": <optional cloud quota in json format to plan the execution of the suites>,
+                "durations": <optional yaml file with the expected minutes of the suites by name>
             }
 
             Example:
@@ -59,13 +165,16 @@ def fetch_stages(args):
                 "execute_cli": ".venv/bin/python run.py ......",
                  "cleanup_cli": "...."
             .....
+
+        When a quota is provided, the "plan" contains the waves in which the suites fit the
+        quota, longest first, with the predicted makespan. Every script has its "wave".
     """
     final_stage = False
     next_stage_data = []
     current_dir = os.path.dirname(os.path.abspath(__file__))
     metadata_dir = os.path.abspath(f"{current_dir}/../../metadata")
     metadata_file = f"{metadata_dir}/{args['rhcephVersion']}.yaml"
-    metadata_content = yaml.safe_load(open(metadata_file, "r"))
+    metadata_content = load_yaml(metadata_file)
     metadata_overrides = metadata_content.get("overrides", {})
     cloud_overrides = {
         "ibmc": metadata_overrides.pop("ibmc", {}),
@@ -96,12 +205,21 @@ def fetch_stages(args):
     if not next_stage_data:
         final_stage = True
 
+    quota = json.loads(args.get("quota") or "{}")
+    durations = dict()
+    if args.get("durations"):
+        durations = load_yaml(args["durations"]) or {}
+    footprints = dict()
+
     test_scripts = dict()
     workspace = overrides.pop("workspace", "")
     build_number = overrides.pop("build_number", "")
     for script in filtered_data:
         script_name = script.pop("name")
         del script["metadata"]
+        duration = durations.get(
+            script_name, script.pop("duration", DEFAULT_SUITE_DURATION)
+        )
         instances_name = f"ci-{generate_random_string(5)}"
         cleanup_cli = ".venv/bin/python run.py --osp-cred $HOME/osp-cred-ci-2.yaml"
         cleanup_cli += f" --cleanup {instances_name}"
@@ -126,6 +244,12 @@ def fetch_stages(args):
         script.update(metadata_overrides)
         script.update(overrides)
 
+        if quota:
+            footprints[script_name] = {
+                **get_suite_footprint(script["global-conf"]),
+                "duration": int(duration),
+            }
+
         for k, v in script.items():
             if isinstance(v, list):
                 for item in v:
@@ -144,6 +268,13 @@ def fetch_stages(args):
         )
 
     test_stages = {"scripts": test_scripts, "final_stage": final_stage}
+    if quota:
+        plan = plan_execution(footprints, quota)
+        for index, wave in enumerate(plan["waves"]):
+            for script_name in wave["suites"]:
+                test_scripts[script_name]["wave"] = index
+        log.info(f"Execution plan with a makespan of {plan['makespan']} minutes")
+        test_stages["plan"] = {"quota": quota, **plan}
 
     return test_stages
 
@@ -155,6 +286,8 @@ if __name__ == "__main__":
         "rhcephVersion": cli_args.get("--rhcephVersion"),
         "tags": cli_args.get("--tags"),
         "overrides": cli_args.get("--overrides"),
+        "quota": cli_args.get("--quota"),
+        "durations": cli_args.get("--durations"),
         "metadata": cli_args.get("--metadata"),
     }
     try:
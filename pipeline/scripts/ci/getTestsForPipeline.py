@@ -8,6 +8,8 @@ import sys
 import yaml
 from docopt import docopt
 
+from utility.catalog import load_yaml
+
 log = logging.getLogger(__name__)
 doc = """
 This script fetches all the tests to be run for a pipeline based on the RHCS version and overrides
@@ -60,7 +62,7 @@ def fetch_from_metadata(rhcephVersion):
     current_dir = os.path.dirname(os.path.abspath(__file__))
     metadata_dir = os.path.abspath(f"{current_dir}/../../metadata")
     metadata_file = f"{metadata_dir}/{rhcephVersion}.yaml"
-    metadata_content = yaml.safe_load(open(metadata_file, "r"))
+    metadata_content = load_yaml(metadata_file)
     return metadata_content
 
 
@@ -9,6 +9,7 @@ import requests
 
 from rest.common.config.config import Config
 from rest.common.utils.exceptions import CommandExecutionError, HTTPError
+from utility.http_session import clear_token, get_token, new_session, set_token
 from utility.log import Log
 
 # from dotenv import dotenv_values
@@ -36,7 +37,13 @@ def rest(**kw):
 
 
 class REST(object):
-    """REST class for invoking REST calls GET, POST, PUT, DELETE."""
+    """REST class for invoking REST calls GET, POST, PUT, DELETE.
+
+    The calls are issued on the session of the REST object, using the keep-alive
+    connection pool shared by the REST objects of the same endpoint. The auth
+    token is cached per endpoint and user, a new REST object reuses the cached
+    token and the token is refreshed when the endpoint responds with 401.
+    """
 
     # Constants representing REST API keys.
     HEADERS = "headers"
@@ -61,6 +68,8 @@ class REST(object):
           port(int,optional): Port to connect for sending REST calls. Default: 9440.
           base_uri(str,optional): URI for sending REST calls to.
             Default: Prism gateway URI.
+          token(str, optional): Auth token to be validated and used.
+            Default: the cached token of the user or a new token.
 
         Returns
           Returns REST object instance.
@@ -80,14 +89,22 @@ class REST(object):
         self._port = kwargs.get("port", 8443)
         base_url = f"https://{self._ip}:{self._port}"
         self._base_uri = kwargs.get("base_uri", base_url)
+        self._session = new_session(self._base_uri)
 
         # Disable HTTPS certificate warning.
         requests.packages.urllib3.disable_warnings()
+        self._token = None
         auth_token = kwargs.get("token", None)
-        if auth_token is None:
+        if auth_token is not None:
+            self.check_auth(auth_token)
+            return
+
+        cached_token = get_token(self._base_uri, self._username)
+        if cached_token is None:
             self.auth()
         else:
-            self.check_auth(auth_token)
+            log.debug(f"Using the cached auth token of {self._username}")
+            self._set_token(cached_token)
 
     def check_auth(self, token):
         """
@@ -104,8 +121,9 @@ class REST(object):
                 relative_url=check_auth_relative_endpoint,
                 headers=self.headers,
                 data=_data,
+                refresh_auth=False,
             )
-            self.headers.update({"Authorization": f"Bearer {token}"})
+            self._set_token(token)
         except Exception as e:
             # or can call self.auth()
             log.error(f"Auth check failed for the token f{e}")
@@ -124,9 +142,33 @@ class REST(object):
         ]
         _data = {"username": self._username, "password": self._password}
         auth_res = self.post(
-            relative_url=auth_relative_endpoint, headers=self.headers, data=_data
+            relative_url=auth_relative_endpoint,
+            headers=self.headers,
+            data=_data,
+            refresh_auth=False,
         )
-        self.headers.update({"Authorization": f"Bearer {auth_res['token']}"})
+        self._set_token(auth_res["token"])
+        set_token(self._base_uri, self._username, self._token)
+
+    def _set_token(self, token):
+        """Sets the bearer token in the headers of the REST calls."""
+        self._token = token
+        self.headers.update({"Authorization": f"Bearer {token}"})
+
+    def refresh_auth(self):
+        """
+        Refreshes the auth token once it has been rejected. When another REST
+        object of the endpoint has already refreshed the cached token, the
+        token is reused instead of a new auth call.
+        """
+        stale_token = self._token
+        clear_token(self._base_uri, self._username, stale_token)
+        cached_token = get_token(self._base_uri, self._username)
+        if cached_token is not None and cached_token != stale_token:
+            self._set_token(cached_token)
+            return
+
+        self.auth()
 
     def delete(self, relative_url, **kwargs):
         """This routine is used to invoke DELETE call for REST API.
@@ -225,6 +267,7 @@ class REST(object):
         custom_headers = kwargs.get(REST.HEADERS, self.headers)
         custom_data = kwargs.get(REST.DATA, {})
         raw_response = kwargs.pop("raw_response", False)
+        refresh_auth = kwargs.pop("refresh_auth", True)
         max_retries = kwargs.get("max_retires", 3)
         main_uri = "".join([self._base_uri, relative_url])
         if "operation" not in kwargs:
@@ -243,6 +286,7 @@ class REST(object):
             auth=auth,
             max_retries=max_retries,
             raw_response=raw_response,
+            refresh_auth=refresh_auth,
         )
         return response
 
@@ -263,6 +307,7 @@ class REST(object):
         data = kwargs.pop("data", {})
         auth = kwargs.pop("auth", {})
         raw_response = kwargs.pop("raw_response", False)
+        refresh_auth = kwargs.pop("refresh_auth", False)
 
         max_retries = kwargs.pop("max_retries", 3)
         verify = kwargs.pop("verify", False)
@@ -272,10 +317,20 @@ class REST(object):
         retry_count = 1
         log.info(f"REST call Details {req_type.upper()}: {main_uri}, {headers}, {data}")
         while retry_count <= max_retries:
-            method_to_call = getattr(requests, req_type)
+            method_to_call = getattr(self._session, req_type)
             response = method_to_call(
                 main_uri, headers=headers, verify=verify, data=data, timeout=timeout
             )
+            if response.status_code == requests.codes.UNAUTHORIZED and refresh_auth:
+                # The token is refreshed once per call, the retry is not
+                # counted against the max retries.
+                log.info("Auth token rejected, refreshing the token")
+                refresh_auth = False
+                self.refresh_auth()
+                if "Authorization" in headers:
+                    headers = dict(headers, Authorization=f"Bearer {self._token}")
+                continue
+
             if raw_response:
                 return response
 
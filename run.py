@@ -7,7 +7,6 @@ import os
 import pickle
 import re
 import sys
-import time
 import traceback
 from copy import deepcopy
 from getpass import getuser
@@ -23,6 +22,7 @@ from ceph.clients import WinNode
 from ceph.utils import (
     cleanup_ceph_nodes,
     cleanup_ibmc_ceph_nodes,
+    connect_nodes,
     create_aws_ceph_nodes,
     create_baremetal_ceph_nodes,
     create_ceph_nodes,
@@ -39,6 +39,7 @@ from cli.performance.memory_and_cpu_utils import (
 from compute.aws_ec2 import cleanup_aws_ceph_nodes
 from compute.onecloud import cleanup_onecloud_ceph_nodes, expand_private_key_path
 from utility import sosreport
+from utility.catalog import load_yaml
 from utility.log import Log
 from utility.polarion import post_to_polarion
 from utility.retry import retry
@@ -49,6 +50,7 @@ from utility.utils import (  # ReportPortal,
     email_results,
     generate_unique_id,
     magna_url,
+    resolve_ssh_pool_config,
     resolve_use_ipv6,
     setup_cluster_access,
     validate_conf,
@@ -214,6 +216,7 @@ def create_nodes(
             --custom-config openstack_vm_profile=c1.standard.xl
             --custom-config openstack_networks=provider_net_cci_1
             --custom-config use_ipv6=true
+            --custom-config ssh_max_channels=8
 
         If these values are not provided then the defaults would be used.
         openstack_networks (single or comma-separated) overrides cluster conf for all OpenStack VMs.
@@ -272,6 +275,7 @@ def create_nodes(
 
         # Resolve use_ipv6 before building nodes so CephNode can use it for SSH when requested
         use_ipv6 = resolve_use_ipv6(custom_config, cloud_type, osp_cred)
+        ssh_pool = resolve_ssh_pool_config(custom_config)
 
         ceph_nodes = []
         root_password = None
@@ -383,6 +387,7 @@ def create_nodes(
                     ipv6_address=ipv6_address,
                     ipv6_subnet=ipv6_subnet,
                     use_ipv6=use_ipv6,
+                    ssh_pool=ssh_pool,
                 )
                 ceph_nodes.append(ceph)
 
@@ -401,21 +406,8 @@ def create_nodes(
 
     # TODO: refactor cluster dict to cluster list
     log.info("Done creating osp instances")
-    log.info("Waiting for Floating IPs to be available")
-    if cloud_type == "onecloud":
-        wait_sec = 75
-        log.info("OneCloud: sleeping %ds for VM readiness", wait_sec)
-        time.sleep(wait_sec)
-    else:
-        log.info("Sleeping 15 Seconds")
-        time.sleep(15)
-
-    for cluster_name, cluster in ceph_cluster_dict.items():
-        for instance in cluster:
-            try:
-                instance.connect()
-            except BaseException:
-                raise
+    log.info("Waiting for the nodes to be reachable")
+    connect_nodes(ceph_cluster_dict)
 
     return ceph_cluster_dict, clients
 
@@ -446,11 +438,7 @@ def print_results(tc):
 
 def load_file(file_name):
     """Retrieve yaml data content from file."""
-    file_path = os.path.abspath(file_name)
-    with open(file_path, "r") as conf_:
-        content = yaml.safe_load(conf_)
-
-    return content
+    return load_yaml(file_name)
 
 
 def get_tier_level(files: str) -> str:
@@ -873,6 +861,15 @@ def run(args):
             for node in cluster:
                 node.reconnect()
 
+    # Reuse a long-lived cephadm shell container for the shell commands
+    persistent_shell = custom_config_dict.get("persistent_shell", "").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+    for cluster in ceph_cluster_dict.values():
+        cluster.persistent_shell = persistent_shell
+
     if store:
         ceph_clusters_file = f"rerun/{instances_name}-{run_id}"
         if not os.path.exists(os.path.dirname(ceph_clusters_file)):
@@ -8,8 +8,10 @@ import csv
 import json
 import random
 import secrets
+import shlex
 import string
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from looseversion import LooseVersion
 
@@ -22,6 +24,16 @@ from utility.utils import get_ceph_version_from_cluster
 
 log = Log(__name__)
 
+# Merkle tree digest tool run on the clients, see dir_digest.py
+DIR_DIGEST_SCRIPT = "/root/dir_digest.py"
+DIR_DIGEST_SNAP_CACHE = "/root/dir_digest_snap_cache.json"
+
+# Directories queried per command while descending the differing subtrees
+DIR_DIGEST_BATCH = 100
+
+# Diverged files reported by the comparison
+DIR_DIGEST_REPORT = 20
+
 
 class CephfsMirroringUtils(object):
     def __init__(self, source_ceph_cluster, target_ceph_cluster):
@@ -1088,39 +1100,34 @@ class CephfsMirroringUtils(object):
             snapshots = snapshots.strip().split()
             log.info(f"Available Snapshots : {snapshots}")
 
-            out_target, rc = target_clients.exec_command(
-                sudo=True,
-                cmd=f"bash /root/md5sum_script.sh {target_mount_path}{source_path}",
-            )
-            log.info(f"Checksums of the files in target cluster : \n {out_target}")
-            out_source, rc = source_client.exec_command(
-                sudo=True,
-                cmd=f"bash /root/md5sum_script.sh {source_mount_path}{source_path}",
-            )
-            log.info(f"Checksums of the files in source cluster : \n {out_source}")
-            if out_target == out_source:
-                log.info("Checksums are matching and all files synced")
-            out_source_snap, rc = target_clients.exec_command(
-                sudo=True,
-                cmd=f"bash /root/md5sum_script.sh {target_mount_path}{source_path}/.snap",
-            )
-            log.info(
-                f"Checksums of the files in source cluster snap dir : \n {out_source_snap}"
-            )
-            out_target_snap, rc = source_client.exec_command(
-                sudo=True,
-                cmd=f"bash /root/md5sum_script.sh {source_mount_path}{source_path}/.snap",
-            )
-            log.info(
-                f"Checksums of the files in target cluster snap dir : \n {out_target_snap}"
-            )
-            if out_target_snap != out_source_snap:
-                return False, "Checksums are not matching in snapshot folders"
-
+            diverged_snap = self.compare_dir_digests(
+                source_client,
+                f"{source_mount_path}{source_path}/.snap",
+                source_mount_path,
+                target_clients,
+                f"{target_mount_path}{source_path}/.snap",
+                target_mount_path,
+            )
+            if diverged_snap:
+                return False, (
+                    "Checksums are not matching in snapshot folders: "
+                    f"{', '.join(diverged_snap[:DIR_DIGEST_REPORT])}"
+                )
             log.info("Checksums are matching and all files synced in snapshot folder")
 
-            if out_target != out_source:
-                return False, "Checksums are not matching in subvolume folders"
+            diverged = self.compare_dir_digests(
+                source_client,
+                f"{source_mount_path}{source_path}",
+                source_mount_path,
+                target_clients,
+                f"{target_mount_path}{source_path}",
+                target_mount_path,
+            )
+            if diverged:
+                return False, (
+                    "Checksums are not matching in subvolume folders: "
+                    f"{', '.join(diverged[:DIR_DIGEST_REPORT])}"
+                )
             log.info("Checksums are matching and all files synced in Subvolume folder")
             return True, "All Files and checksums synced Properly"
         except Exception as e:
@@ -1129,6 +1136,134 @@ class CephfsMirroringUtils(object):
             target_clients.exec_command(sudo=True, cmd=f"umount {target_mount_path}")
             target_clients.exec_command(sudo=True, cmd=f"rm -rf {target_mount_path}")
 
+    def dir_digest(self, client, path, mount_path, tree_file=None):
+        """
+        Computes the Merkle tree digest of the directory on the client.
+        The digests of the snapshots under the directory are reused from the earlier runs on the client.
+        Args:
+            client: Ceph client on which the directory is mounted.
+            path (str): The directory to be digested.
+            mount_path (str): The mount path of the filesystem on the client.
+            tree_file (str): The file on the client the tree is written to, a temporary file if not provided.
+        Returns:
+            tuple: The tree file on the client and the summary with the root digest.
+        """
+        client.upload_file(
+            sudo=True,
+            src="tests/cephfs/cephfs_mirroring/dir_digest.py",
+            dst=DIR_DIGEST_SCRIPT,
+        )
+        tree_file = tree_file or f"/tmp/dir_digest_{secrets.token_hex(5)}.json"
+        out, _ = client.exec_command(
+            sudo=True,
+            cmd=f"python3 {DIR_DIGEST_SCRIPT} build {shlex.quote(path)} --tree {tree_file} "
+            f"--mount {shlex.quote(mount_path)} --snap-cache {DIR_DIGEST_SNAP_CACHE}",
+            timeout=3600,
+        )
+        summary = json.loads(out)
+        log.info(
+            f"Digest of {path}: {summary['digest']}, "
+            f"{summary['files']} files, {summary['bytes']} bytes, "
+            f"{summary['snapshots_reused']} snapshots reused in {summary['elapsed']}s"
+        )
+        return tree_file, summary
+
+    def dir_digest_entries(self, client, tree_file, relpaths):
+        """
+        Returns the entries of the directories from the tree file on the client.
+        Args:
+            client: Ceph client holding the tree file.
+            tree_file (str): The tree file written by dir_digest.
+            relpaths (list): The directories relative to the digested directory.
+        Returns:
+            dict: The entries of every directory, name mapped to the type and digest.
+        """
+        entries = {}
+        for index in range(0, len(relpaths), DIR_DIGEST_BATCH):
+            batch = " ".join(
+                shlex.quote(relpath)
+                for relpath in relpaths[index : index + DIR_DIGEST_BATCH]
+            )
+            out, _ = client.exec_command(
+                sudo=True,
+                cmd=f"python3 {DIR_DIGEST_SCRIPT} entries --tree {tree_file} {batch}",
+            )
+            entries.update(json.loads(out))
+        return entries
+
+    def compare_dir_digests(
+        self,
+        source_client,
+        source_dir,
+        source_mount_path,
+        target_client,
+        target_dir,
+        target_mount_path,
+    ):
+        """
+        Compares the directory on the source and target clusters using Merkle tree digests.
+        The digests are computed on both the clients concurrently, the root digests are compared first and the
+        comparison descends only into the differing directories.
+        Args:
+            source_client: Ceph client on the source cluster.
+            source_dir (str): The directory on the source cluster.
+            source_mount_path (str): The mount path on the source cluster.
+            target_client: Ceph client on the target cluster.
+            target_dir (str): The directory on the target cluster.
+            target_mount_path (str): The mount path on the target cluster.
+        Returns:
+            list: The diverged files and directories with the reason, empty when the directories are identical.
+        """
+        tree_file = f"/tmp/dir_digest_{secrets.token_hex(5)}"
+        sides = [
+            (source_client, source_dir, source_mount_path, f"{tree_file}_source.json"),
+            (target_client, target_dir, target_mount_path, f"{tree_file}_target.json"),
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            digests = [executor.submit(self.dir_digest, *side) for side in sides]
+            try:
+                (source_tree, source), (target_tree, target) = [
+                    digest.result() for digest in digests
+                ]
+                diverged = []
+                pending = [] if source["digest"] == target["digest"] else ["."]
+                while pending:
+                    source_dirs, target_dirs = executor.map(
+                        lambda side: self.dir_digest_entries(*side, pending),
+                        [(source_client, source_tree), (target_client, target_tree)],
+                    )
+                    next_pending = []
+                    for relpath in pending:
+                        source_entries = source_dirs.get(relpath) or {}
+                        target_entries = target_dirs.get(relpath) or {}
+                        for name in sorted(set(source_entries) | set(target_entries)):
+                            path = name if relpath == "." else f"{relpath}/{name}"
+                            src, dst = source_entries.get(name), target_entries.get(
+                                name
+                            )
+                            if src == dst:
+                                continue
+                            if not dst:
+                                diverged.append(f"{path} missing on target")
+                            elif not src:
+                                diverged.append(f"{path} not present on source")
+                            elif src[0] == dst[0] == "d":
+                                next_pending.append(path)
+                            else:
+                                diverged.append(f"{path} differs")
+                    pending = next_pending
+            finally:
+                # The tree files are removed on both the clients, even when the digest failed on one of them
+                wait(digests)
+                for client, _, _, tree_file in sides:
+                    client.exec_command(
+                        sudo=True, cmd=f"rm -f {tree_file}", check_ec=False
+                    )
+
+        for entry in diverged[:DIR_DIGEST_REPORT]:
+            log.error(f"Diverged between {source_dir} and {target_dir}: {entry}")
+        return diverged
+
     def cleanup_target_client(self, target_clients, target_mount_path):
         """
         This function cleans up the target client by unmounting and removing a specified path.
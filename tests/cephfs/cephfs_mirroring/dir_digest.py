@@ -0,0 +1,198 @@
+"""
+Computes the Merkle tree digest of a directory.
+
+The content of the files is hashed by a pool of threads, the digest of a
+directory is the hash of the sorted names, types and digests of its entries,
+hence two directories have the same digest only when their trees are
+identical. The digests of the directories are saved to the tree file, which
+is queried for the entries of the differing directories while comparing the
+trees of two clusters, without hashing the data again.
+
+The snapshots are immutable, the digests of the snapshots found under the
+directory are cached in the snapshot cache keyed by their path relative to
+the mount and their ceph.snap.btime. A snapshot is hashed again when its
+btime is not available or it has been recreated.
+
+Usage:
+  python3 dir_digest.py build <dir> --tree <file> [--mount <path>] [--snap-cache <file>] [--workers <num>]
+  python3 dir_digest.py entries --tree <file> <relpath>...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fd:
+        for block in iter(lambda: fd.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_entries(entries):
+    digest = hashlib.sha256()
+    for name in sorted(entries):
+        kind, value = entries[name]
+        digest.update(f"{kind}\0{name}\0{value}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def snapshot_btime(path):
+    try:
+        return os.getxattr(path, "ceph.snap.btime").decode().strip("\0")
+    except OSError:
+        return None
+
+
+class DirDigest:
+    def __init__(self, root, mount=None, snap_cache=None, workers=16):
+        self.root = root.rstrip("/") or "/"
+        self.mount = mount.rstrip("/") if mount else None
+        self.snap_cache = snap_cache or {}
+        self.used_snap_cache = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.dirs = {}
+        self.files = self.size = self.reused = 0
+
+    def snapshot_key(self, path):
+        """Returns the cache key of the snapshot directory, None if not cacheable."""
+        if not self.mount or os.path.basename(os.path.dirname(path)) != ".snap":
+            return None
+
+        btime = snapshot_btime(path)
+        if not btime:
+            return None
+
+        return f"{os.path.relpath(path, self.mount)}@{btime}"
+
+    def walk(self, path, relpath):
+        """Returns the digest of the directory, collecting the entries of its tree."""
+        key = self.snapshot_key(path)
+        if key and key in self.snap_cache:
+            cached = self.used_snap_cache[key] = self.snap_cache[key]
+            for subpath, entries in cached["dirs"].items():
+                self.dirs[os.path.normpath(os.path.join(relpath, subpath))] = entries
+            self.reused += 1
+            return cached["digest"]
+
+        entries, files, subdirs = {}, {}, []
+        with os.scandir(path) as scan:
+            for entry in scan:
+                mode = entry.stat(follow_symlinks=False).st_mode
+                if stat.S_ISDIR(mode):
+                    subdirs.append(entry)
+                elif stat.S_ISLNK(mode):
+                    entries[entry.name] = ("l", os.readlink(entry.path))
+                elif stat.S_ISREG(mode):
+                    files[entry.name] = self.executor.submit(hash_file, entry.path)
+                    self.files += 1
+                    self.size += entry.stat(follow_symlinks=False).st_size
+
+        for entry in subdirs:
+            entries[entry.name] = (
+                "d",
+                self.walk(entry.path, os.path.join(relpath, entry.name)),
+            )
+        for name, future in files.items():
+            entries[name] = ("f", future.result())
+
+        relpath = os.path.normpath(relpath)
+        self.dirs[relpath] = entries
+        digest = hash_entries(entries)
+        if key:
+            self.used_snap_cache[key] = {
+                "digest": digest,
+                "dirs": self.subtree(relpath),
+            }
+        return digest
+
+    def subtree(self, relpath):
+        """Returns the directories under relpath, relative to it."""
+        if relpath == ".":
+            return dict(self.dirs)
+
+        prefix = relpath + "/"
+        dirs = {".": self.dirs[relpath]}
+        for name, entries in self.dirs.items():
+            if name.startswith(prefix):
+                dirs[name[len(prefix) :]] = entries
+        return dirs
+
+    def updated_snap_cache(self):
+        """Returns the snapshot cache without the snapshots removed under the root."""
+        if not self.mount:
+            return self.snap_cache
+
+        root = os.path.relpath(self.root, self.mount)
+        prefix = "" if root == "." else root + "/"
+        cache = {
+            key: value
+            for key, value in self.snap_cache.items()
+            if not (key.rpartition("@")[0] + "/").startswith(prefix)
+        }
+        cache.update(self.used_snap_cache)
+        return cache
+
+    def build(self):
+        _start = time.monotonic()
+        try:
+            digest = self.walk(self.root, ".")
+        finally:
+            self.executor.shutdown()
+        return {
+            "root": self.root,
+            "digest": digest,
+            "files": self.files,
+            "bytes": self.size,
+            "snapshots_reused": self.reused,
+            "elapsed": round(time.monotonic() - _start, 3),
+        }
+
+
+def load(path, default):
+    try:
+        with open(path) as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return default
+
+
+def save(path, data):
+    with open(f"{path}.tmp", "w") as fd:
+        json.dump(data, fd)
+    os.replace(f"{path}.tmp", path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build")
+    build.add_argument("dir")
+    build.add_argument("--tree", required=True)
+    build.add_argument("--mount")
+    build.add_argument("--snap-cache")
+    build.add_argument("--workers", type=int, default=16)
+    entries = commands.add_parser("entries")
+    entries.add_argument("--tree", required=True)
+    entries.add_argument("relpaths", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "entries":
+        dirs = load(args.tree, {})["dirs"]
+        print(json.dumps({relpath: dirs.get(relpath) for relpath in args.relpaths}))
+    else:
+        snap_cache = load(args.snap_cache, {}) if args.snap_cache else {}
+        digest = DirDigest(args.dir, args.mount, snap_cache, args.workers)
+        result = digest.build()
+        save(args.tree, {"dirs": digest.dirs, **result})
+        if args.snap_cache:
+            save(args.snap_cache, digest.updated_snap_cache())
+        print(json.dumps(result))
@@ -1,11 +1,12 @@
 import json
+import os
 import re
 from threading import Thread
 from time import sleep
 
 from cli.ceph.ceph import Ceph
 from cli.exceptions import OperationFailedError
-from cli.io.fio import Fio
+from cli.io.fio import Fio, merge_fio_results
 from cli.utilities.windows_utils import setup_windows_clients
 from utility.log import Log
 
@@ -58,6 +59,8 @@ def run(ceph_cluster, **kw):
     fs = "cephfs"
     nfs_client_count = config.get("num_of_clients")
     threads = []
+    fio_runs = []
+    results_dir = os.path.join(kw["run_config"]["log_dir"], "fio_results")
 
     for windows_client_obj in setup_windows_clients(config.get("windows_clients")):
         ceph_cluster.node_list.append(windows_client_obj)
@@ -195,9 +198,12 @@ def run(ceph_cluster, **kw):
         numjobs = "4"
         for client in windows_clients:
             for mount in mount_dir_list:
+                fio = Fio(client)
+                fio_runs.append(fio)
                 th = Thread(
-                    target=Fio(client).run,
+                    target=fio.run,
                     args=(mount, ioengine, workloads, size, iodepth_value, numjobs),
+                    kwargs={"results_dir": results_dir},
                 )
                 threads.append(th)
                 th.start()
@@ -206,6 +212,7 @@ def run(ceph_cluster, **kw):
         for th in threads:
             th.join()
         log.info("Completed running IO on all mounts")
+        merge_fio_results(fio_runs, results_dir)
 
         # Get RSS value
         log.info("RSS value post IO")
@@ -4,14 +4,15 @@ import glob
 import importlib
 import logging
 import os
+import pickle
 import random
 import string
-from multiprocessing import Manager
+from multiprocessing import Queue
 from time import sleep
 
 from ceph.ceph import CommandFailed
 from ceph.parallel import parallel
-from utility.log import LOG_FORMAT, Log
+from utility.log import ForwardingQueueHandler, LocalQueueHandler, Log, LogWriter
 from utility.utils import magna_url
 
 parallel_log = Log(__name__)
@@ -19,6 +20,18 @@ polarion_default_url = (
     "https://polarion.engineering.redhat.com/polarion/#/project/CEPH/workitem?id="
 )
 
+# Arguments describing the cluster, handed once to every worker process
+CLUSTER_ARGS = (
+    "ceph_cluster",
+    "ceph_nodes",
+    "ceph_cluster_dict",
+    "clients",
+    "test_data",
+)
+
+# Cluster arguments of the worker process
+_cluster = dict()
+
 
 class MultiModuleFilter(logging.Filter):
     """Custom filter to log only messages from specific modules."""
@@ -40,51 +53,84 @@ for handler in parallel_log.logger.handlers:
     handler.addFilter(module_filter)
 
 
+def load_cluster(descriptor, log_queue):
+    """Keeps the pickled cluster arguments and the log queue in the worker process.
+
+    The arguments are unpickled on the first test executed by the worker, the
+    nodes connect only when a test issues its first command on them. The log
+    queue is inherited by the worker as it cannot be sent along with the tests.
+    """
+    _cluster["descriptor"] = descriptor
+    _cluster["log_queue"] = log_queue
+    _cluster.pop("args", None)
+
+
+def cluster_args():
+    """Returns the cluster arguments of the worker process."""
+    if "args" not in _cluster:
+        _cluster["args"] = pickle.loads(_cluster["descriptor"])
+
+    return _cluster["args"]
+
+
 def run(**kwargs):
     """Main function to run parallel tests."""
-    # Use a Manager dictionary for shared state across processes
-    with Manager() as manager:
-        results = manager.dict()
-        parallel_tests = kwargs["parallel"]
-        parallel_tcs = manager.list()
-        max_time = kwargs.get("config", {}).get("max_time", None)
-        cancel_pending = kwargs.get("config", {}).get("cancel_pending", False)
-        parallel_log.info(kwargs)
-
+    parallel_tests = kwargs["parallel"]
+    max_time = kwargs.get("config", {}).get("max_time", None)
+    cancel_pending = kwargs.get("config", {}).get("cancel_pending", False)
+    parallel_log.info(kwargs)
+
+    # The cluster is pickled once and handed to every worker process when it
+    # starts, instead of being pickled along with every test.
+    descriptor = pickle.dumps({key: kwargs.get(key) for key in CLUSTER_ARGS})
+    args = {key: val for key, val in kwargs.items() if key not in CLUSTER_ARGS}
+
+    # The records of the test processes are written by a single thread
+    log_queue = Queue()
+    log_writer = LogWriter(log_queue, console=True)
+    log_writer.start()
+    try:
+        # The results are returned by the workers through the result pipe
+        # of the pool, in the order the tests are spawned.
         with parallel(
             thread_pool=False,
             timeout=max_time,
             shutdown_cancel_pending=cancel_pending,
+            initializer=load_cluster,
+            initargs=(descriptor, log_queue),
         ) as p:
             for test in parallel_tests:
-                p.spawn(execute, test, kwargs, results, parallel_tcs)
+                p.spawn(execute, test, args)
                 sleep(1)  # Avoid overloading processes
+    finally:
+        log_writer.stop()
+        log_queue.close()
+        log_queue.join_thread()
 
-        # Convert results to a regular dictionary to inspect
-        results = dict(results)
-        parallel_log.info(f"Final test results: {results}")
-        parallel_log.info(f"Parallel test cases: {parallel_tcs}")
-        test_rc = 0
+    results = {test_name: rc for test_name, rc, _ in p.results}
+    parallel_tcs = [tc for _, _, tc in p.results]
+    parallel_log.info(f"Final test results: {results}")
+    parallel_log.info(f"Parallel test cases: {parallel_tcs}")
+    test_rc = 0
 
-        for key, value in results.items():
-            parallel_log.info(
-                f"{key} test result is {'PASS' if value == 0 else 'FAILED'}"
-            )
-            if value != 0:
-                test_rc = value
+    for key, value in results.items():
+        parallel_log.info(f"{key} test result is {'PASS' if value == 0 else 'FAILED'}")
+        if value != 0:
+            test_rc = value
 
-        return list(parallel_tcs), test_rc
+    return parallel_tcs, test_rc
 
 
-def execute(test, args, results, parallel_tcs):
+def execute(test, args):
     """
     Executes the test in parallel.
 
     Args:
         test: The test module to execute.
-        args: Arguments passed to the test.
-        results: Shared dictionary to store test results.
-        parallel_tcs: Shared list to store test case details.
+        args: Arguments passed to the test, without the cluster arguments.
+
+    Returns:
+        tuple of the test name, its result and the test case details
     """
     test = test.get("test")
     test_name = test.get("name", "unknown_test")
@@ -111,27 +157,23 @@ def execute(test, args, results, parallel_tcs):
     log_file = os.path.join(run_dir, f"{file_name}.log")
     parallel_log.info(f"Log File location for test {test_name}: {log_url}")
 
-    # Configure logger for this test
+    # Configure logger for this test, the records are forwarded to the parent
+    # which writes them to the test log, err file and console.
     test_logger = Log(module_name)
     for handler in logging.getLogger().handlers[:]:
         logging.getLogger().removeHandler(handler)
+    for handler in test_logger.logger.handlers[:]:
+        # The writer of the parent does not run in this process
+        if isinstance(handler, LocalQueueHandler):
+            test_logger.logger.removeHandler(handler)
     logging.basicConfig(
-        handlers=[logging.FileHandler(log_file)], level=logging.INFO, format=LOG_FORMAT
+        handlers=[ForwardingQueueHandler(_cluster["log_queue"], log_file)],
+        level=logging.INFO,
     )
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(logging.Formatter(test_logger.log_format))
-    if not any(
-        isinstance(h, logging.StreamHandler) for h in test_logger.logger.handlers
-    ):
-        test_logger.logger.addHandler(console_handler)
-    err_logfile = os.path.join(run_dir, f"{file_name}.err")
-    error_handler = logging.FileHandler(err_logfile)
-    error_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    error_handler.setLevel(logging.ERROR)  # This ensures only errors are logged
-    test_logger.logger.addHandler(error_handler)
+    test_logger.logger.propagate = True
 
     test_logger.info(f"Starting test: {test_name}")
+    start = datetime.datetime.now()
     try:
         # Import and execute the test module
         mod_file_name = os.path.splitext(test.get("module"))[0]
@@ -140,7 +182,7 @@ def execute(test, args, results, parallel_tcs):
             "log_dir": run_dir,
             "run_id": args["run_config"]["run_id"],
         }
-        start = datetime.datetime.now()
+        cluster = cluster_args()
 
         # Merging configurations safely
         test_config = args.get("config", {}).copy()
@@ -156,18 +198,17 @@ def execute(test, args, results, parallel_tcs):
         tc["desc"] = test.get("desc")
         tc["log-link"] = log_url
         rc = test_mod.run(
-            ceph_cluster=args.get("ceph_cluster"),
-            ceph_nodes=args.get("ceph_nodes"),
+            ceph_cluster=cluster.get("ceph_cluster"),
+            ceph_nodes=cluster.get("ceph_nodes"),
             config=test_config,
             parallel=args.get("parallel"),
-            test_data=args.get("test_data"),
-            ceph_cluster_dict=args.get("ceph_cluster_dict"),
-            clients=args.get("clients"),
+            test_data=cluster.get("test_data"),
+            ceph_cluster_dict=cluster.get("ceph_cluster_dict"),
+            clients=cluster.get("clients"),
             run_config=run_config,
         )
         elapsed = datetime.datetime.now() - start
         tc["duration"] = str(elapsed)
-        results[test_name] = rc
 
         test_logger.info(
             f"Test {test_name} completed with result: {'PASS' if rc == 0 else 'FAILED'}"
@@ -186,10 +227,10 @@ def execute(test, args, results, parallel_tcs):
         tc["status"] = "Failed"
         tc["err_type"] = "exception"
         tc["err_msg"] = str(e)
-        results[test_name] = 1
+        rc = 1
     finally:
-        # Always append tc to results, even if test failed with exception
-        parallel_tcs.append(tc)
         # Reset root logger configuration to avoid conflicts
         for handler in logging.getLogger().handlers[:]:
             logging.getLogger().removeHandler(handler)
+
+    return test_name, rc, tc
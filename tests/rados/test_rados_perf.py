@@ -63,7 +63,7 @@ def run(ceph_cluster, **kw):
         client_count = len(client_config)
 
         # execute radosbench on each client node
-        for entry in client_config.keys():
+        for entry in client_config:
             # determine number of objects to be written
             obj_size = entry["obj_size"]
             obj_count = perf_obj.get_object_count(
@@ -92,21 +92,27 @@ def run(ceph_cluster, **kw):
         # monitor radosbench pids for 2 hours and report their completion periodically
         timeout_time = datetime.datetime.now() + datetime.timedelta(seconds=7400)
         while datetime.datetime.now() < timeout_time:
-            for entry in client_config.keys():
+            for entry in client_config:
                 node_obj = entry["node_obj"]
                 bench_pid = entry["bench_pid"]
                 out, _ = node_obj.exec_command(
                     cmd=f"kill -0 {bench_pid} &> /dev/null ; echo $?", sudo=True
                 )
 
-                if not out:
+                if out.strip() == "0":
                     log.info(
                         f"radosbench process with pid {bench_pid} is still running on {node_obj.hostname}"
                     )
-                else:
+                elif "bench_result" not in entry:
                     log.info(
                         f"radosbench process with pid {bench_pid} completed on {node_obj.hostname}"
                     )
+                    entry["bench_result"] = perf_obj.collect_radosbench_result(
+                        pid=bench_pid
+                    )
+            if all("bench_result" in entry for entry in client_config):
+                log.info("radosbench completed on all the client nodes")
+                break
             time.sleep(300)
 
     except Exception as e:
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Computes the digests of the allocated chunks of an RBD image.
+
+The allocated extents of the image are enumerated with diff_iterate, the
+equivalent of 'rbd diff', and the fixed size chunks covering them are read
+directly from the image and hashed by a pool of threads, each with its own
+image handle. Chunks holding only zeroes are reported as unallocated, so that
+an extent allocated on one cluster and sparse on the other compares equal.
+
+The result is printed as json with the chunk size, the image size and the
+sha256 digest of every allocated chunk indexed by its offset / chunk size.
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import rados
+import rbd
+
+
+def parse_imagespec(imagespec):
+    """Returns the pool, namespace and image of the image specification."""
+    parts = imagespec.split("/")
+    if len(parts) == 2:
+        return parts[0], "", parts[1]
+    return parts[0], parts[1], parts[2]
+
+
+def allocated_chunks(image, size, chunk_size):
+    """Returns the sorted indexes of the chunks covering the allocated extents."""
+    chunks = set()
+
+    def extent(offset, length, exists):
+        if exists and length:
+            chunks.update(
+                range(offset // chunk_size, (offset + length - 1) // chunk_size + 1)
+            )
+
+    image.diff_iterate(0, size, None, extent, include_parent=True)
+    return sorted(chunks)
+
+
+def digest(imagespec, cluster_name, chunk_size, workers):
+    pool, namespace, name = parse_imagespec(imagespec)
+    _start = time.monotonic()
+    with rados.Rados(conffile=f"/etc/ceph/{cluster_name}.conf") as cluster:
+        with cluster.open_ioctx(pool) as ioctx:
+            ioctx.set_namespace(namespace)
+            with rbd.Image(ioctx, name, read_only=True) as image:
+                size = image.size()
+                chunks = allocated_chunks(image, size, chunk_size)
+
+            local = threading.local()
+            handles = []
+            lock = threading.Lock()
+            zeroes = bytes(chunk_size)
+
+            def read_chunk(index):
+                if not hasattr(local, "image"):
+                    local.image = rbd.Image(ioctx, name, read_only=True)
+                    with lock:
+                        handles.append(local.image)
+                offset = index * chunk_size
+                data = local.image.read(offset, min(chunk_size, size - offset))
+                if data == zeroes[: len(data)]:
+                    return index, None
+                return index, hashlib.sha256(data).hexdigest()
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    digests = {
+                        str(index): value
+                        for index, value in executor.map(read_chunk, chunks)
+                        if value
+                    }
+            finally:
+                for handle in handles:
+                    handle.close()
+
+    return {
+        "image": imagespec,
+        "size": size,
+        "chunk_size": chunk_size,
+        "allocated": len(chunks) * chunk_size,
+        "elapsed": round(time.monotonic() - _start, 3),
+        "chunks": digests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0].strip(),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("imagespec", help="<pool>[/<namespace>]/<image>")
+    parser.add_argument("--cluster", default="ceph", help="name of the cluster")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="size in bytes of the hashed chunks",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=16, help="number of threads reading the chunks"
+    )
+    args = parser.parse_args()
+    print(
+        json.dumps(digest(args.imagespec, args.cluster, args.chunk_size, args.workers))
+    )
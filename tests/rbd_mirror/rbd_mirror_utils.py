@@ -4,6 +4,7 @@ import random
 import string
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 from typing import List
 
@@ -15,6 +16,18 @@ from utility.log import Log
 
 log = Log(__name__)
 
+# Size of the chunks of the image compared by check_data
+DIGEST_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Threads of each client reading the chunks of the image
+DIGEST_WORKERS = 16
+
+# Seconds allowed to compute the digest of an image
+DIGEST_TIMEOUT = 3600
+
+# Mismatching extents reported by check_data
+DIGEST_MISMATCH_REPORT = 10
+
 
 class RbdMirror:
     def __init__(self, cluster, config):
@@ -689,10 +702,91 @@ class RbdMirror:
 
     # Check data consistency
     def check_data(self, peercluster, imagespec):
+        """Compares the data of the image on both the clusters.
+
+        The digests of the allocated chunks of the image are computed on the
+        clients of both the clusters concurrently, reading the image directly
+        instead of exporting it, see rbd_image_digest.py. The comparison falls
+        back to the md5sum of the exported image when the digests cannot be
+        computed.
+
+        Args:
+          peercluster: RbdMirror object of the secondary cluster
+          imagespec: image specification
+        """
         self.wait_for_status(imagespec=imagespec, state_pattern="up+stopped")
         peercluster.wait_for_status(imagespec=imagespec, state_pattern="up+replaying")
         if self.get_mirror_mode(imagespec) != "snapshot":
             peercluster.wait_for_replay_complete(imagespec)
+
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                local, remote = executor.map(
+                    lambda mirror: mirror.image_digest(imagespec),
+                    [self, peercluster],
+                )
+        except (CommandFailed, ValueError) as err:
+            log.warning(f"Digest of {imagespec} failed, comparing exports: {err}")
+            return self.check_data_by_export(peercluster, imagespec)
+
+        for name, digest in (("primary", local), ("secondary", remote)):
+            log.info(
+                f"Digest of {imagespec} on {name}: {len(digest['chunks'])} chunks, "
+                f"{digest['allocated']} bytes allocated in {digest['elapsed']}s"
+            )
+
+        mismatches = self.compare_digests(local, remote)
+        if not mismatches:
+            log.info("Data is consistent")
+            return 0
+
+        chunk_size = local["chunk_size"]
+        extents = ", ".join(
+            f"[{index * chunk_size}, {(index + 1) * chunk_size})"
+            for index in mismatches[:DIGEST_MISMATCH_REPORT]
+        )
+        raise Exception(
+            f"Data Inconsistency found in {len(mismatches)} chunks of {chunk_size} "
+            f"bytes of {imagespec}, first extents: {extents}"
+        )
+
+    def image_digest(self, imagespec, chunk_size=DIGEST_CHUNK_SIZE):
+        """Returns the digests of the allocated chunks of the image.
+
+        Args:
+          imagespec: image specification
+          chunk_size: size of the hashed chunks
+        """
+        script = "/home/cephuser/rbd_image_digest.py"
+        self.ceph_client.upload_file(
+            sudo=True, src="tests/rbd_mirror/rbd_image_digest.py", dst=script
+        )
+        out, _ = self.ceph_client.exec_command(
+            sudo=True,
+            cmd=f"python3 {script} {imagespec} --cluster {self.cluster_name} "
+            f"--chunk-size {chunk_size} --workers {DIGEST_WORKERS}",
+            timeout=DIGEST_TIMEOUT,
+        )
+        return json.loads(out)
+
+    @staticmethod
+    def compare_digests(local, remote):
+        """Returns the sorted indexes of the chunks differing between the digests."""
+        if local["size"] != remote["size"]:
+            raise Exception(
+                f"Data Inconsistency found, image size {local['size']} on primary "
+                f"and {remote['size']} on secondary"
+            )
+
+        chunks, peer_chunks = local["chunks"], remote["chunks"]
+        return sorted(
+            int(index)
+            for index in set(chunks) | set(peer_chunks)
+            if chunks.get(index) != peer_chunks.get(index)
+        )
+
+    def check_data_by_export(self, peercluster, imagespec):
+        """Compares the md5sum of the image exported on both the clusters."""
         export_path = "/home/cephuser/image.export_" + self.random_string()
         self.export_image(imagespec=imagespec, path=export_path)
         peercluster.export_image(imagespec=imagespec, path=export_path)
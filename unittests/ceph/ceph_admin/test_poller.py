@@ -0,0 +1,108 @@
+"""Unit tests for the shared orch poller."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ceph.ceph_admin.poller import (
+    SNAPSHOT_SEPARATOR,
+    OrchPoller,
+    refreshed_after,
+    service_exists,
+    service_running,
+)
+
+SERVICES = ["mon", "mgr", "rgw.foo", "nfs.bar"]
+
+
+class Installer:
+    """Reports one more running daemon of each service on every poll."""
+
+    ip_address = "10.0.0.1"
+
+    def __init__(self):
+        self.commands = []
+
+    def exec_command(self, cmd, sudo=False, check_ec=True):
+        self.commands.append(cmd)
+        running = min(len(self.commands), 2)
+        services = [
+            {
+                "service_name": name,
+                "service_type": name.split(".")[0],
+                "status": {
+                    "running": running,
+                    "size": 2,
+                    "last_refresh": datetime.now().isoformat(),
+                },
+            }
+            for name in SERVICES
+        ]
+        daemons = [
+            {
+                "daemon_name": f"osd.{_id}",
+                "daemon_type": "osd",
+                "status_desc": "running",
+            }
+            for _id in range(running)
+        ]
+        return (
+            f"{json.dumps(services)}\n{SNAPSHOT_SEPARATOR}\n{json.dumps(daemons)}",
+            "",
+        )
+
+
+def test_waiters_share_the_polls():
+    installer = Installer()
+    poller = OrchPoller(installer)
+    changes = []
+    poller.subscribe(lambda previous, snapshot, _changes: changes.extend(_changes))
+
+    with ThreadPoolExecutor(max_workers=len(SERVICES)) as executor:
+        results = list(
+            executor.map(
+                lambda name: poller.wait(
+                    service_running(name, stable=1), timeout=10, interval=0.05
+                ),
+                SERVICES,
+            )
+        )
+
+    assert results == [True] * len(SERVICES)
+    # Running on the second poll and stable on the third, whatever the number of waiters
+    assert len(installer.commands) == 3
+    assert "mon running 1/2 -> 2/2" in changes
+
+
+def test_wait_all_predicates():
+    installer = Installer()
+    poller = OrchPoller(installer)
+    start = datetime.now()
+
+    results = poller.wait_all(
+        {
+            "exists": service_exists("mgr"),
+            "absent": service_exists("mds.baz", exist=False),
+            "refreshed": refreshed_after("rgw.foo", start),
+            "missing": service_exists("mds.baz"),
+        },
+        timeout=0.3,
+        interval=0.05,
+    )
+
+    assert results == {
+        "exists": True,
+        "absent": True,
+        "refreshed": True,
+        "missing": False,
+    }
+    assert poller.latest().daemons is None
+    assert "orch ps" not in installer.commands[0]
+
+    assert poller.wait(
+        lambda snapshot: len(snapshot.daemons_of(daemon_type="osd")) == 2,
+        timeout=1,
+        interval=0.05,
+        daemons=True,
+    )
+    assert "orch ps" in installer.commands[-1]
@@ -0,0 +1,262 @@
+"""Unit tests for the persistent cephadm shell."""
+
+import base64
+import json
+import re
+import threading
+from time import sleep
+
+import pytest
+
+from ceph.ceph_admin import shell
+from ceph.ceph_admin.shell import (
+    ShellMixin,
+    ShellSessionError,
+    get_persistent_shell,
+    has_shell_operators,
+)
+
+
+class Channel:
+    """SSH channel running the shell commands with the given handler."""
+
+    def __init__(self, run=None, exited=False):
+        self.run = run
+        self.exited = exited
+        self.pty = False
+        self.closed = False
+        self.commands = []
+        self.in_buffer = bytearray()
+        self.in_stderr_buffer = bytearray()
+        self.status_event = threading.Event()
+
+    def get_pty(self):
+        self.pty = True
+
+    def exec_command(self, cmd):
+        self.commands.append(cmd)
+
+    def exit_status_ready(self):
+        return self.exited
+
+    def recv(self, size):
+        data = bytes(self.in_buffer[:size])
+        del self.in_buffer[:size]
+        return data
+
+    def recv_stderr(self, size):
+        data = bytes(self.in_stderr_buffer[:size])
+        del self.in_stderr_buffer[:size]
+        return data
+
+    def sendall(self, data):
+        script = data.decode()
+        marker = re.search(r"(__CEPHCI_\w+__)", script).group(1)
+        encoded = re.search(r"echo (\S+) \| base64 -d", script).group(1)
+        result = self.run(self, base64.b64decode(encoded).decode())
+        if result is None:
+            return
+
+        out, err, rc = result
+        self.in_buffer += f"{out}\n{marker} {rc}\n".encode()
+        self.in_stderr_buffer += f"{err}\n{marker}\n".encode()
+
+    def close(self):
+        self.closed = True
+
+
+class Node:
+    def __init__(self, ip_address, *channels):
+        self.hostname = "node1"
+        self.ip_address = ip_address
+        self.channels = list(channels)
+        self.opened = []
+        self.commands = []
+
+    def rssh(self):
+        return self
+
+    def get_transport(self):
+        return self
+
+    def open_session(self, timeout=None):
+        self.opened.append(self.channels.pop(0))
+        return self.opened[-1]
+
+    def exec_command(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        token = [c for c in self.opened if c.pty][-1].commands[0].split()[-1]
+        return json.dumps([{"Id": "c0ffee", "Command": ["bash", "-c", token]}]), ""
+
+
+def run(channel, cmd):
+    if cmd == "true":
+        return "", "", 0
+    if cmd == "ceph health":
+        return "HEALTH_OK\nsecond line", "a warning", 0
+    return "", f"{cmd}: command not found", 127
+
+
+@pytest.fixture(autouse=True)
+def sessions(monkeypatch):
+    monkeypatch.setattr(shell, "wait_for_channel", lambda channel, wait: sleep(0.01))
+    yield
+    shell.close_persistent_shells()
+
+
+def test_persistent_shell_framing():
+    container, session_channel = Channel(), Channel(run)
+    node = Node("10.0.0.1", container, session_channel)
+
+    session = get_persistent_shell(node)
+    assert container.pty
+    assert session.container == "c0ffee"
+    assert session_channel.commands == ["podman exec -i c0ffee bash --noprofile --norc"]
+
+    assert session.execute("ceph health") == (
+        "HEALTH_OK\nsecond line",
+        "a warning",
+        0,
+    )
+    assert session.execute("ceph nothing") == (
+        "",
+        "ceph nothing: command not found",
+        127,
+    )
+
+    session.close()
+    assert node.commands[-1] == "podman rm -f c0ffee"
+    assert container.closed and session_channel.closed
+
+
+def test_persistent_shell_errors():
+    def _run(channel, cmd):
+        if cmd == "exit":
+            channel.exited = True
+        elif cmd == "true":
+            return "", "", 0
+
+    node = Node("10.0.0.2", Channel(), Channel(_run), Channel(), Channel(_run))
+    session = get_persistent_shell(node)
+    with pytest.raises(TimeoutError):
+        session.execute("hang", timeout=0.05)
+    assert not session.alive
+    session.lock.release()
+
+    # The container is started again once it died
+    session = get_persistent_shell(node)
+    assert session.alive
+    with pytest.raises(ShellSessionError):
+        session.execute("exit")
+    assert not session.alive
+    assert node.commands.count("podman rm -f c0ffee") == 2
+
+
+class WindowChannel(Channel):
+    """Channel whose remote side blocks once the stderr window is full."""
+
+    WINDOW = 1024
+
+    def __init__(self, run):
+        self.pending_err = bytearray()
+        self.pending_out = bytearray()
+        self._buffers = {False: bytearray(), True: bytearray()}
+        super().__init__(run)
+
+    def _pump(self, stderr):
+        # The stdout frame is written once the stderr preceding it is sent
+        room = self.WINDOW - len(self._buffers[True])
+        self._buffers[True] += self.pending_err[:room]
+        del self.pending_err[:room]
+        if not self.pending_err:
+            self._buffers[False] += self.pending_out
+            self.pending_out.clear()
+        return self._buffers[stderr]
+
+    @property
+    def in_buffer(self):
+        return self._pump(False)
+
+    @in_buffer.setter
+    def in_buffer(self, value):
+        self._buffers[False] = value
+
+    @property
+    def in_stderr_buffer(self):
+        return self._pump(True)
+
+    @in_stderr_buffer.setter
+    def in_stderr_buffer(self, value):
+        self._buffers[True] = value
+
+    def sendall(self, data):
+        out, err = self._buffers[False], self._buffers[True]
+        self._buffers = {False: bytearray(), True: bytearray()}
+        super().sendall(data)
+        self.pending_out += self._buffers[False]
+        self.pending_err += self._buffers[True]
+        self._buffers = {False: out, True: err}
+
+
+def test_persistent_shell_drains_stderr():
+    warnings = "\n".join(f"warning {x}" for x in range(1000))
+
+    def _run(channel, cmd):
+        return ("HEALTH_OK", warnings, 0) if cmd == "ceph health" else ("", "", 0)
+
+    node = Node("10.0.0.4", Channel(), WindowChannel(_run))
+    session = get_persistent_shell(node)
+
+    assert session.execute("ceph health", timeout=5) == ("HEALTH_OK", warnings, 0)
+    session.close()
+
+
+def test_has_shell_operators():
+    assert not has_shell_operators("ceph orch ls --format json")
+    assert not has_shell_operators('ceph config set mon key \'{"a": "b|c"}\'')
+    assert has_shell_operators("ceph osd dump | grep pool")
+    assert has_shell_operators("ceph config-key get key > /tmp/key")
+    assert has_shell_operators("ceph health 2>&1")
+
+
+class Installer:
+    def __init__(self, node):
+        self.node = node
+        self.commands = []
+
+    def exec_command(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return "HEALTH_OK", ""
+
+
+class Cluster:
+    persistent_shell = True
+
+
+class CephAdm(ShellMixin):
+    def __init__(self, node):
+        self.cluster = Cluster()
+        self.installer = Installer(node)
+
+
+def test_shell_fallback():
+    node = Node("10.0.0.3", Channel(exited=True))
+    cephadm = CephAdm(node)
+
+    assert cephadm.shell(args=["ceph", "health"]) == ("HEALTH_OK", "")
+    assert cephadm.shell(args=["ceph", "health"]) == ("HEALTH_OK", "")
+
+    # The container which failed to start is not started on every call
+    assert len(node.opened) == 1
+    assert cephadm.installer.commands == ["cephadm shell -- ceph health"] * 2
+
+
+def test_shell_operators_use_host_shell():
+    node = Node("10.0.0.5", Channel(), Channel(run))
+    cephadm = CephAdm(node)
+
+    cephadm.shell(args=["ceph", "osd", "dump", "|", "grep", "pool"])
+
+    # The pipe runs on the installer, the persistent shell is not started
+    assert not node.opened
+    assert cephadm.installer.commands == ["cephadm shell -- ceph osd dump | grep pool"]
@@ -0,0 +1,91 @@
+"""Unit tests for the upgrade monitor of the UpgradeMixin."""
+
+import json
+import shlex
+
+from ceph.ceph_admin.upgrade import (
+    UPGRADE_POLL_COMMANDS,
+    UPGRADE_POLL_MARKER,
+    UpgradeMixin,
+)
+
+OLD = "18.2.1-100.el9cp"
+NEW = "19.2.1-100.el9cp"
+
+
+def _poll(epoch, active, mgrs, osds, status):
+    """Returns the outputs of a poll, None for the commands failing."""
+    daemons = [
+        {"daemon_type": "mgr", "daemon_name": f"mgr.{name}", "version": version}
+        for name, version in mgrs.items()
+    ] + [
+        {"daemon_type": "osd", "daemon_name": f"osd.{_id}", "version": version}
+        for _id, version in enumerate(osds)
+    ]
+
+    def _versions(versions):
+        counts = dict()
+        for version in versions:
+            key = f"ceph version {version} (sha) stable"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    return {
+        "mgr_stat": json.dumps({"epoch": epoch, "active_name": active}),
+        "versions": json.dumps(
+            {"mgr": _versions(mgrs.values()), "osd": _versions(osds)}
+        ),
+        "daemons": json.dumps(daemons) if all(mgrs.values()) else None,
+        "status": json.dumps({"in_progress": True}) if status else status,
+    }
+
+
+POLLS = [
+    _poll(10, "a", {"a": OLD, "b": OLD}, [OLD, OLD], True),
+    # mgr failover, the orchestrator is not available
+    _poll(11, "b", {"a": OLD, "b": None}, [OLD, OLD], None),
+    _poll(11, "b", {"a": NEW, "b": NEW}, [NEW, OLD], True),
+    _poll(11, "b", {"a": NEW, "b": NEW}, [NEW, NEW], True),
+]
+POLLS[-1]["status"] = "There are no upgrades in progress currently."
+
+
+class Orch(UpgradeMixin):
+    def __init__(self, polls):
+        self.polls = list(polls)
+        self.commands = []
+
+    def shell(self, args):
+        self.commands.append(args[0])
+        if args[0].startswith("ceph mgr metadata"):
+            return json.dumps({"ceph_version": f"ceph version {NEW} (sha) stable"}), ""
+
+        script = shlex.split(args[0])[2]
+        poll = self.polls.pop(0)
+        out = ""
+        for name, cmd in UPGRADE_POLL_COMMANDS.items():
+            assert cmd in script
+            out += f"\n{UPGRADE_POLL_MARKER} {name}\n"
+            if poll[name] is None:
+                out += f"{UPGRADE_POLL_MARKER} failed\n"
+            else:
+                out += poll[name]
+
+        return out, ""
+
+
+def test_monitor_upgrade_status(monkeypatch):
+    monkeypatch.setattr("ceph.ceph_admin.upgrade.sleep", lambda _: None)
+    orch = Orch(POLLS)
+
+    report = orch.monitor_upgrade_status(timeout=60)
+
+    # One shell per poll, the active mgr version resolved only when needed
+    assert orch.commands[2] == "ceph mgr metadata b"
+    assert len(orch.commands) == len(POLLS) + 1
+    assert report["daemons_upgraded"] == 4
+    assert list(report["phases"]) == ["mgr", "osd"]
+    assert report["phases"]["mgr"]["daemons"] == 2
+    assert report["phases"]["osd"]["daemons"] == 2
+    assert report["daemons_per_minute"] > 0
+    assert [event["daemon_type"] for event in report["events"]][:2] == ["mgr", "mgr"]
@@ -0,0 +1,123 @@
+"""Unit tests for the bulk config injection of the error injector."""
+
+import json
+import shlex
+
+from ceph.rados.ceph_error_injector import CONFIG_FAILED_MARKER, CephErrorInjector
+
+
+class ConfigDbNode:
+    """Runs the ceph config scripts against an in-memory config database."""
+
+    def __init__(self, reject=()):
+        self.db = {}
+        self.reject = set(reject)
+        self.calls = 0
+
+    def shell(self, args):
+        self.calls += 1
+        script = args[0]
+        if script.startswith("bash -c"):
+            script = shlex.split(script)[2]
+        out, err = "", []
+        for command in script.split("; "):
+            cmd = shlex.split(command.split(" || ")[0])
+            if cmd[:3] == ["ceph", "config", "dump"]:
+                out = json.dumps(
+                    [
+                        {"section": section, "name": name, "value": value}
+                        for (section, name), value in self.db.items()
+                    ]
+                )
+            elif cmd[3] in self.reject:
+                err.append(f"{CONFIG_FAILED_MARKER} {cmd[3]} {cmd[4]}")
+            elif cmd[2] == "set":
+                # Floats are stored with full precision
+                value = cmd[5]
+                self.db[(cmd[3], cmd[4])] = (
+                    f"{float(value):.6f}" if "." in value else value
+                )
+            else:
+                self.db.pop((cmd[3], cmd[4]), None)
+
+        return out, "\n".join(err)
+
+
+class RadosObj:
+    def __init__(self, node):
+        self.node = node
+
+
+def test_inject_config_batch_single_round_trip():
+    node = ConfigDbNode()
+    injector = CephErrorInjector(rados_obj=RadosObj(node))
+
+    results = injector.inject_config_batch(
+        {
+            "ms_inject_delay_probability": 0.1,
+            "ms_inject_delay_max": 5,
+            "bluestore_debug_inject_read_err": True,
+            "unknown_inject_variable": 1,
+        }
+    )
+
+    assert results == {
+        "ms_inject_delay_probability": True,
+        "ms_inject_delay_max": True,
+        "bluestore_debug_inject_read_err": True,
+        "unknown_inject_variable": False,
+    }
+    assert node.calls == 1
+    assert node.db[("global", "ms_inject_delay_probability")] == "0.100000"
+    assert len(injector.get_active_injections()["config_injections"]) == 3
+
+    summary = injector.cleanup_all()
+    assert summary["configs_removed"] == 3 and summary["configs_failed"] == 0
+    assert node.calls == 2
+    assert node.db == {}
+
+
+def test_inject_config_batch_failed_key():
+    node = ConfigDbNode(reject=["osd"])
+    injector = CephErrorInjector(rados_obj=RadosObj(node))
+
+    results = injector.inject_config_batch(
+        {
+            "ms_inject_delay_max": 5,
+            "osd_debug_inject_dispatch_delay_probability": 0.2,
+        }
+    )
+
+    assert results == {
+        "ms_inject_delay_max": True,
+        "osd_debug_inject_dispatch_delay_probability": False,
+    }
+    assert injector.get_active_injections()["config_injections"] == [
+        {"name": "ms_inject_delay_max", "section": "global"}
+    ]
+
+
+class FailingShellNode(ConfigDbNode):
+    """Fails the batch shell after the config commands ran."""
+
+    def shell(self, args):
+        out, err = super().shell(args)
+        if args[0].startswith("bash -c"):
+            raise RuntimeError("shell exited unexpectedly")
+        return out, err
+
+
+def test_inject_config_batch_shell_failure():
+    node = FailingShellNode()
+    injector = CephErrorInjector(rados_obj=RadosObj(node))
+
+    results = injector.inject_config_batch(
+        {"ms_inject_delay_max": 5, "ms_inject_delay_probability": 0.1}
+    )
+
+    # The keys are verified one by one and tracked for cleanup
+    assert results == {
+        "ms_inject_delay_max": True,
+        "ms_inject_delay_probability": True,
+    }
+    assert len(injector.get_active_injections()["config_injections"]) == 2
@@ -0,0 +1,47 @@
+"""Unit tests for the rados bench runs of the perf workflows."""
+
+from ceph.rados.perf_workflow import PerfWorkflows
+from unittests.ceph.rados.test_rados_bench import WRITE_OUTPUT
+
+
+class Client:
+    def __init__(self):
+        self.commands = []
+
+    def exec_command(self, cmd, sudo=False):
+        self.commands.append(cmd)
+        if cmd.startswith("pgrep"):
+            return "4242", ""
+        return WRITE_OUTPUT, ""
+
+
+class RadosOrchestrator:
+    def __init__(self):
+        self.client = Client()
+        self.bench_cfgs = []
+
+    def bench_write(self, pool_name, **bench_cfg):
+        self.bench_cfgs.append(bench_cfg)
+        return True
+
+
+def test_radosbench_result(monkeypatch):
+    monkeypatch.setattr("ceph.rados.perf_workflow.time.sleep", lambda _: None)
+    perf_obj = PerfWorkflows.__new__(PerfWorkflows)
+    perf_obj.rados_obj = RadosOrchestrator()
+    perf_obj.bench_outputs = dict()
+    node = perf_obj.rados_obj.client
+    node.shortname = "node1"
+
+    bench_cfg = {"byte_size": "4M", "background": True}
+    pid = perf_obj.trigger_radosbench(node, "perf_pool", bench_cfg)
+
+    # The config of the caller is shared by the client nodes, hence not updated
+    assert bench_cfg == {"byte_size": "4M", "background": True}
+    output_file = perf_obj.rados_obj.bench_cfgs[0]["output_file"]
+    assert output_file.startswith("/tmp/radosbench-perf_pool-node1")
+
+    result = perf_obj.collect_radosbench_result(pid)
+    assert node.commands[-1] == f"cat {output_file}"
+    assert result.mode == "write"
+    assert result.bandwidth == 92.6543
@@ -0,0 +1,71 @@
+"""Unit tests for the PG snapshot."""
+
+from ceph.rados.pg_snapshot import PGSnapshot
+
+PG_STATS = [
+    {
+        "pgid": "1.0",
+        "state": "active+clean",
+        "up": [0, 1],
+        "acting": [0, 1],
+        "acting_primary": 0,
+    },
+    {
+        "pgid": "1.1",
+        "state": "active+remapped",
+        "up": [1, 2],
+        "acting": [1, 0],
+        "acting_primary": 1,
+    },
+    {
+        "pgid": "2.0",
+        "state": "unknown",
+        "up": [2, 0],
+        "acting": [2, 0],
+        "acting_primary": 2,
+    },
+]
+
+
+class Fetch:
+    def __init__(self, dump):
+        self.dump = dump
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.dump
+
+
+def test_parse_dump_formats():
+    assert PGSnapshot.parse(PG_STATS) == PG_STATS
+    assert PGSnapshot.parse({"pg_stats": PG_STATS}) == PG_STATS
+    assert PGSnapshot.parse({"pg_map": {"pg_stats": PG_STATS}}) == PG_STATS
+
+
+def test_filter():
+    snapshot = PGSnapshot(Fetch({"pg_stats": PG_STATS}))
+
+    assert snapshot.filter(pool_id=1) == ["1.0", "1.1"]
+    assert snapshot.filter(osd=0) == ["1.0", "1.1", "2.0"]
+    assert snapshot.filter(osd=0, pool_id=2) == ["2.0"]
+    assert snapshot.filter(osd_primary=1) == ["1.1"]
+    assert snapshot.filter(states=["clean", "unknown"]) == ["1.0", "2.0"]
+    assert snapshot.state("1.1") == "active+remapped"
+    assert snapshot.state("3.0") is None
+
+
+def test_ttl_and_invalidate():
+    fetch = Fetch({"pg_stats": PG_STATS})
+    snapshot = PGSnapshot(fetch, ttl=60)
+    for pgid in ("1.0", "1.1", "2.0"):
+        snapshot.get(pgid)
+    assert fetch.calls == 1
+
+    snapshot.invalidate()
+    snapshot.get("1.0")
+    assert fetch.calls == 2
+
+    snapshot.ttl = 0
+    snapshot.get("1.0")
+    assert fetch.calls == 3
@@ -0,0 +1,86 @@
+"""Unit tests for the rados bench result parsing and store."""
+
+import pytest
+
+from ceph.rados.rados_bench import (
+    BenchResultStore,
+    RadosBenchExecutionFailure,
+    compare_results,
+    parse_bench_output,
+)
+
+WRITE_OUTPUT = """hints = 1
+Maintaining 16 concurrent writes of 4194304 bytes to objects of size 4194304 for up to 3 seconds or 0 objects
+Object prefix: benchmark_data_ceph-node1_2765
+  sec Cur ops   started  finished  avg MB/s  cur MB/s last lat(s)  avg lat(s)
+    0       0         0         0         0         0           -           0
+    1      16        31        15   59.9967        60    0.738716    0.520209
+    2      16        56        40   79.9842       100    0.391049    0.637543
+    3      16        80        64   85.3195        96    0.710424    0.649839
+Total time run:         3.4537
+Total writes made:      80
+Write size:             4194304
+Object size:            4194304
+Bandwidth (MB/sec):     92.6543
+Stddev Bandwidth:       21.166
+Max bandwidth (MB/sec): 100
+Min bandwidth (MB/sec): 60
+Average IOPS:           23
+Stddev IOPS:            5.29150
+Max IOPS:               25
+Min IOPS:               15
+Average Latency(s):     0.669282
+Stddev Latency(s):      0.239634
+Max latency(s):         1.30138
+Min latency(s):         0.112889
+"""
+
+
+def test_parse_bench_output():
+    result = parse_bench_output(WRITE_OUTPUT, mode="write")
+
+    assert result.total_ops == 80
+    assert result.object_size == 4194304
+    assert result.bandwidth == 92.6543
+    assert result.average_iops == 23
+    assert result.max_latency == 1.30138
+    assert len(result.samples) == 4
+    assert result.samples[0].last_latency is None
+    assert result.samples[3].cur_bandwidth == 96
+
+
+def test_parse_bench_output_without_summary():
+    with pytest.raises(RadosBenchExecutionFailure):
+        parse_bench_output("error opening pool test: (2) No such file or directory")
+
+
+def test_compare_results():
+    baseline = parse_bench_output(WRITE_OUTPUT, mode="write")
+    result = parse_bench_output(WRITE_OUTPUT, mode="write")
+    assert not compare_results(result, baseline)
+
+    result.bandwidth = 80
+    result.average_latency = 0.7
+    regressions = compare_results(result, baseline)
+    assert [x.metric for x in regressions] == ["bandwidth"]
+
+    regressions = compare_results(result, baseline, {"average_latency": 0.01})
+    assert [x.metric for x in regressions] == ["average_latency"]
+
+
+def test_result_store(tmp_path):
+    store = BenchResultStore(str(tmp_path / "results.jsonl"))
+    key = dict(pool_type="replicated", profile="4M-write")
+    baseline = parse_bench_output(WRITE_OUTPUT, mode="write")
+    result = parse_bench_output(WRITE_OUTPUT, mode="write")
+    result.average_iops = 15
+
+    assert store.compare(result, build="19.2.1-100", **key) == []
+
+    store.add(baseline, build="19.2.1-90", **key)
+    store.add(result, build="19.2.1-100", **key)
+
+    assert len(store.query(build="19.2.1-90")) == 1
+    assert store.query(build="19.2.1-90")[0]["result"].samples == baseline.samples
+    regressions = store.compare(result, build="19.2.1-100", **key)
+    assert [x.metric for x in regressions] == ["average_iops"]
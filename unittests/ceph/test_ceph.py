@@ -0,0 +1,178 @@
+"""Unit tests for the SSH helpers of the ceph nodes."""
+
+import datetime
+import threading
+from time import time
+
+import pytest
+
+from ceph import ceph
+from ceph.ceph import (
+    SFTP_MAX_SESSIONS,
+    CommandFailed,
+    PooledTransport,
+    SSHConnectionManager,
+    wait_exit_status,
+)
+
+
+class StatusChannel:
+    def __init__(self, status=None):
+        self.status_event = threading.Event()
+        self.status = status
+        if status is not None:
+            self.status_event.set()
+
+    def recv_exit_status(self):
+        return self.status
+
+
+def test_wait_exit_status(monkeypatch):
+    monkeypatch.setattr(ceph, "EOF_GRACE_TIMEOUT", 0.05)
+
+    assert wait_exit_status(StatusChannel(3), None, "true") == 3
+
+    # The exit status is waited for until the end time of the command
+    end_time = datetime.datetime.now() + datetime.timedelta(seconds=0.2)
+    start = datetime.datetime.now()
+    with pytest.raises(CommandFailed):
+        wait_exit_status(StatusChannel(), end_time, "sleep")
+    assert datetime.datetime.now() - start >= datetime.timedelta(seconds=0.15)
+
+    with pytest.raises(CommandFailed):
+        wait_exit_status(StatusChannel(), None, "sleep")
+
+
+class FakeChannel:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def open_session(self, timeout=None):
+        return FakeChannel()
+
+
+class FakeClient:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.transport.active = False
+
+
+class FakeSFTP:
+    def __init__(self, transport):
+        self.transport = transport
+        self.channel = FakeChannel()
+
+    def get_channel(self):
+        return self.channel
+
+    def close(self):
+        self.channel.close()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Returns a connection manager on a fake transport and its SFTP sessions."""
+    sessions = []
+
+    def from_transport(transport, window_size=None):
+        sessions.append(FakeSFTP(transport))
+        return sessions[-1]
+
+    monkeypatch.setattr(
+        ceph.paramiko.SFTPClient, "from_transport", staticmethod(from_transport)
+    )
+    manager = SSHConnectionManager("10.0.0.1", "cephuser", "cephuser")
+    client = FakeClient()
+    manager._SSHConnectionManager__client = client
+    manager._SSHConnectionManager__transport = client.get_transport()
+    manager._SSHConnectionManager__primary = PooledTransport(client)
+    return manager, sessions
+
+
+def test_sftp_reuses_idle_session(manager):
+    manager, sessions = manager
+    primary = manager._SSHConnectionManager__primary
+
+    with manager.sftp() as first:
+        pass
+    with manager.sftp() as second:
+        assert second is first
+
+    # The idle session keeps its channel slot open
+    assert len(sessions) == 1
+    assert not first.get_channel().closed
+    assert primary.channels == 1
+
+
+def test_sftp_evicts_dead_and_idle_sessions(manager):
+    manager, sessions = manager
+    primary = manager._SSHConnectionManager__primary
+
+    with manager.sftp() as first:
+        pass
+    first.get_channel().close()
+    with manager.sftp() as second:
+        assert second is not first
+    assert primary.channels == 1
+
+    # Sessions idle for longer than idle_timeout are closed on the next borrow
+    idle = manager._SSHConnectionManager__sftp_idle
+    idle[0] = idle[0][:2] + (time() - manager.idle_timeout - 1,)
+    with manager.session():
+        assert second.get_channel().closed
+        assert primary.channels == 1
+    assert not idle
+    assert primary.channels == 0
+
+
+def test_sftp_closes_sessions_beyond_max(manager):
+    manager, sessions = manager
+    primary = manager._SSHConnectionManager__primary
+    borrowed = SFTP_MAX_SESSIONS + 1
+
+    def borrow(count):
+        if count:
+            with manager.sftp():
+                borrow(count - 1)
+        else:
+            assert primary.channels == borrowed
+
+    borrow(borrowed)
+
+    assert len(sessions) == borrowed
+    assert [s.get_channel().closed for s in sessions].count(True) == 1
+    assert primary.channels == SFTP_MAX_SESSIONS
+
+
+def test_sftp_releases_channel_slot_on_close(manager):
+    manager, sessions = manager
+    primary = manager._SSHConnectionManager__primary
+
+    # A session whose channel closed while borrowed is not kept
+    with manager.sftp() as sftp:
+        sftp.get_channel().close()
+    assert not manager._SSHConnectionManager__sftp_idle
+    assert primary.channels == 0
+
+    with manager.sftp():
+        pass
+    assert primary.channels == 1
+    manager.close()
+    assert all(s.get_channel().closed for s in sessions)
+    assert primary.channels == 0
@@ -0,0 +1,124 @@
+"""Unit tests for the fio result aggregation."""
+
+import csv
+import json
+
+from cli.io.fio import (
+    Fio,
+    aggregate_fio_results,
+    merge_fio_results,
+    parse_fio_result,
+    write_fio_results,
+)
+
+
+def fio_output(iops, p99):
+    job = {
+        "jobname": "randrw",
+        "read": {
+            "io_bytes": 4096,
+            "total_ios": 1,
+            "iops": iops,
+            "bw": iops * 4,
+            "clat_ns": {
+                "mean": 200000.0,
+                "percentile": {"50.000000": 150000, "99.000000": p99, "99.900000": p99},
+            },
+        },
+        "write": {"io_bytes": 0, "total_ios": 0, "iops": 0, "bw": 0},
+    }
+    return "note: notes precede the result\n" + json.dumps({"jobs": [job]})
+
+
+def test_parse_fio_result():
+    keys = dict(workload="randrw", size="4G", iodepth="4", client="c1", mount="m1")
+    rows = parse_fio_result(fio_output(100, 900000), **keys)
+
+    assert len(rows) == 1
+    assert rows[0]["direction"] == "read"
+    assert rows[0]["iops"] == 100
+    assert rows[0]["clat_mean_us"] == 200
+    assert rows[0]["clat_p99_us"] == 900
+    assert rows[0]["clat_p95_us"] is None
+
+
+def test_aggregate_and_write_fio_results(tmp_path):
+    rows = []
+    for client, iops, p99 in (("c1", 100, 900000), ("c2", 300, 500000)):
+        rows += parse_fio_result(
+            fio_output(iops, p99),
+            workload="randrw",
+            size="4G",
+            iodepth="4",
+            client=client,
+            mount="m1",
+        )
+
+    (matrix,) = aggregate_fio_results(rows)
+    assert matrix["jobs"] == 2
+    assert matrix["iops"] == 400
+    assert matrix["bw_kib"] == 1600
+    assert matrix["clat_p99_us"] == 900
+
+    _, matrix_file = write_fio_results(rows, str(tmp_path))
+    with open(matrix_file) as _file:
+        assert next(csv.DictReader(_file))["iops"] == "400"
+
+
+class FioClient:
+    """Client writing the fio configs and results to a local directory."""
+
+    role = "client"
+    hostname = "c1"
+
+    def __init__(self, path):
+        self.path = path
+        self.commands = []
+
+    def remote_file(self, file_name, file_mode, sudo=False):
+        return open(self.path / file_name, file_mode)
+
+    def exec_command(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        result_file = cmd.split("--output=")[1]
+        (self.path / result_file).write_text(fio_output(100, 900000))
+        return "", ""
+
+    def download_file(self, src, dst, sudo=False):
+        with open(self.path / src) as _src, open(dst, "w") as _dst:
+            _dst.write(_src.read())
+
+
+def test_fio_run_results_dir(tmp_path):
+    remote, results_dir = tmp_path / "remote", tmp_path / "results"
+    remote.mkdir()
+    fio = Fio(FioClient(remote))
+
+    for mount in ("/mnt/cephfs", "/mnt/nfs"):
+        fio.run(
+            mount_dir=mount,
+            ioengine="libaio",
+            workloads=["randrw"],
+            sizes=["4G", "8G"],
+            iodepth_values=["4"],
+            numjobs="1",
+            results_dir=str(results_dir),
+        )
+
+    assert len(fio.results) == 4
+    assert {row["size"] for row in fio.results} == {"4G", "8G"}
+    # The files of a mount hold only the results of that mount
+    for mount in ("mntcephfs", "mntnfs"):
+        with open(results_dir / "c1" / mount / "fio_results.csv") as _file:
+            rows = list(csv.DictReader(_file))
+        assert len(rows) == 2
+        assert {row["mount"] for row in rows} == {f"/{mount[:3]}/{mount[3:]}"}
+
+    other = Fio(FioClient(remote))
+    other.results = [dict(row, client="c2") for row in fio.results]
+    _, matrix_file = merge_fio_results([fio, other], str(results_dir))
+    with open(matrix_file) as _file:
+        matrix = list(csv.DictReader(_file))
+    assert [row["size"] for row in matrix] == ["4G", "8G"]
+    assert [row["jobs"] for row in matrix] == ["4", "4"]
+    assert merge_fio_results([], str(results_dir)) is None
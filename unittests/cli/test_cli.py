@@ -0,0 +1,54 @@
+"""Unit tests for the command fan-out of cli.Cli."""
+
+import threading
+from time import sleep
+
+import pytest
+
+from cli import Cli
+
+
+class MockNode:
+    def __init__(self, shortname, delay=0.0, error=None):
+        self.shortname = shortname
+        self.delay = delay
+        self.error = error
+        self.thread = None
+
+    def exec_command(self, cmd, **kw):
+        self.thread = threading.current_thread().name
+        sleep(self.delay)
+        if self.error:
+            raise self.error
+
+        return f"{cmd} on {self.shortname}", ""
+
+
+def test_execute_single_node():
+    assert Cli(MockNode("node1")).execute("uptime") == ("uptime on node1", "")
+
+
+def test_execute_nodes_concurrently():
+    nodes = [MockNode(f"node{i}", delay=0.2) for i in range(4)]
+    out = Cli(nodes).execute("uptime")
+
+    assert out == {n.shortname: (f"uptime on {n.shortname}", "") for n in nodes}
+    assert len({n.thread for n in nodes}) == 4
+
+
+def test_execute_nodes_serially():
+    nodes = [MockNode(f"node{i}") for i in range(3)]
+    Cli(nodes).execute("uptime", parallel=False)
+
+    assert {n.thread for n in nodes} == {threading.current_thread().name}
+
+
+def test_execute_nodes_reports_failure_after_all_complete():
+    nodes = [
+        MockNode("node1", error=ValueError("node1 failed")),
+        MockNode("node2", delay=0.2),
+    ]
+    with pytest.raises(ValueError, match="node1 failed"):
+        Cli(nodes).execute("uptime")
+
+    assert nodes[1].thread is not None
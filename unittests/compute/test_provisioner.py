@@ -0,0 +1,85 @@
+"""Unit tests for the provisioning scheduler."""
+
+from time import monotonic
+
+import pytest
+
+from compute.exceptions import NodeError
+from compute.provisioner import (
+    ProvisionScheduler,
+    TokenBucket,
+    get_provision_limits,
+    is_throttle_error,
+)
+
+
+def test_token_bucket_burst_is_admitted_immediately():
+    bucket = TokenBucket(rate=1000, burst=3)
+    start = monotonic()
+    for _ in range(3):
+        bucket.acquire()
+
+    assert monotonic() - start < 0.1
+
+
+def test_token_bucket_refill_rate():
+    bucket = TokenBucket(rate=20, burst=1)
+    bucket.acquire()
+    waited = bucket.acquire()
+
+    assert 0.02 <= waited < 0.5
+
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=1000, burst=5)
+    bucket.pause(0.2)
+
+    assert bucket.acquire() >= 0.15
+
+
+def test_is_throttle_error_in_wrapped_exception():
+    try:
+        try:
+            raise Exception("RequestLimitExceeded: Request limit exceeded.")
+        except Exception as e:
+            raise NodeError(f"Failed to create VM node1: {e}")
+    except NodeError as ne:
+        assert is_throttle_error(ne)
+
+    assert not is_throttle_error(NodeError("Failed to create VM 4291-node1"))
+
+
+def test_scheduler_backoff_grows_and_decays():
+    scheduler = ProvisionScheduler("openstack", rate=1000, burst=1)
+    scheduler.bucket.pause = lambda duration: None
+    scheduler.throttled()
+    scheduler.throttled()
+    assert scheduler.backoff == 10
+
+    scheduler.succeeded()
+    scheduler.succeeded()
+    assert scheduler.backoff == 0
+
+
+def test_get_provision_limits_precedence():
+    limits = get_provision_limits(
+        "aws", {"provision-rate": 4, "provision-burst": 8}, ["provision_burst=2"]
+    )
+
+    assert limits == {"rate": 4.0, "burst": 2.0}
+
+
+def test_get_provision_limits_invalid():
+    for custom_config in (
+        ["provision_rate=0"],
+        ["provision_rate=-1"],
+        ["provision_burst=0"],
+    ):
+        with pytest.raises(ValueError):
+            get_provision_limits("aws", custom_config=custom_config)
+
+    with pytest.raises(ValueError):
+        get_provision_limits("aws", {"provision-rate": 0})
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, burst=1)
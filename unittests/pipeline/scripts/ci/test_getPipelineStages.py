@@ -0,0 +1,123 @@
+"""Unit tests for the execution plan of the pipeline stages."""
+
+import importlib.util
+import os
+
+import pytest
+import yaml
+
+from utility.catalog import Catalog
+
+REPO_DIR = os.path.abspath(f"{os.path.dirname(__file__)}/../../../..")
+
+spec = importlib.util.spec_from_file_location(
+    "getPipelineStages", f"{REPO_DIR}/pipeline/scripts/ci/getPipelineStages.py"
+)
+stages = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(stages)
+
+NODE = {"role": ["osd"], "no-of-volumes": 4, "disk-size": 15}
+CONF = {
+    "globals": [
+        {
+            "ceph-cluster": {
+                "name": "ceph",
+                "node1": {"role": ["_admin", "mon", "mgr"]},
+                "node2": NODE,
+                "node3": NODE,
+            }
+        },
+        {"ceph-cluster": {"name": "remote", "node1": NODE}},
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def catalog(tmp_path, monkeypatch):
+    """Catalog of a repository holding a single cluster configuration."""
+    os.makedirs(tmp_path / "repo" / "conf")
+    with open(tmp_path / "repo" / "conf" / "cluster.yaml", "w") as conf:
+        yaml.dump(CONF, conf)
+
+    _catalog = Catalog(
+        root=str(tmp_path / "repo"), cache_file=str(tmp_path / "catalog.json")
+    )
+    monkeypatch.setattr(stages, "_catalog", _catalog.refresh())
+    return _catalog
+
+
+def suite(duration, instances, volumes=0, gigabytes=0):
+    return {
+        "duration": duration,
+        "instances": instances,
+        "volumes": volumes,
+        "gigabytes": gigabytes,
+    }
+
+
+def peak_usage(plan, key):
+    """Returns the highest usage of the resource by the concurrent suites."""
+    scheduled = plan["suites"].values()
+    return max(
+        sum(other[key] for other in scheduled if other["start"] <= start < other["end"])
+        for start in [_suite["start"] for _suite in scheduled]
+    )
+
+
+def test_plan_execution_packs_longest_first():
+    suites = {
+        "short": suite(30, 2),
+        "long": suite(100, 6),
+        "medium": suite(60, 4),
+        "medium-short": suite(50, 4),
+    }
+
+    plan = stages.plan_execution(suites, {"instances": 10})
+
+    assert plan["waves"] == [
+        {"start": 0, "suites": ["long", "medium"]},
+        {"start": 60, "suites": ["medium-short"]},
+        {"start": 100, "suites": ["short"]},
+    ]
+    assert plan["makespan"] == 130
+    assert plan["suites"]["medium-short"]["end"] == 110
+    assert peak_usage(plan, "instances") <= 10
+
+
+def test_plan_execution_instance_quota():
+    suites = {name: suite(10, 3, volumes=50) for name in "abcde"}
+
+    plan = stages.plan_execution(suites, {"instances": 7, "volumes": 0})
+
+    # The volumes without a quota are not limited, three instances fit twice
+    assert [len(wave["suites"]) for wave in plan["waves"]] == [2, 2, 1]
+    assert plan["makespan"] == 30
+    assert peak_usage(plan, "instances") <= 7
+
+
+def test_plan_execution_suite_above_quota():
+    suites = {"small": suite(20, 2), "large": suite(10, 6)}
+
+    plan = stages.plan_execution(suites, {"instances": 4})
+
+    # The suite needing more than the quota runs alone
+    assert plan["waves"] == [
+        {"start": 0, "suites": ["small"]},
+        {"start": 20, "suites": ["large"]},
+    ]
+    assert plan["makespan"] == 30
+
+
+def test_get_suite_footprint(tmp_path):
+    # Served from the catalog
+    assert stages.get_suite_footprint("conf/cluster.yaml") == {
+        "instances": 4,
+        "volumes": 12,
+        "gigabytes": 180,
+    }
+
+    # Parsed when not part of the catalog
+    conf = tmp_path / "other.yaml"
+    conf.write_text(yaml.dump(CONF))
+    footprint = stages.get_suite_footprint(os.path.relpath(conf, REPO_DIR))
+    assert footprint == {"instances": 4, "volumes": 12, "gigabytes": 180}
@@ -0,0 +1,106 @@
+"""Unit tests for the suite and conf catalog."""
+
+import os
+
+import pytest
+
+from utility.catalog import Catalog
+
+SUITE = """
+tests:
+  - test:
+      name: install
+      module: test_cephadm.py
+      polarion-id: CEPH-1,CEPH-2
+      clusters:
+        ceph-pri: {}
+  - test:
+      name: mirror
+      module: test_mirror.py
+      polarion-id: CEPH-3
+"""
+
+CONF = """
+globals:
+  - ceph-cluster:
+      name: ceph-pri
+      node1:
+        role: [mon, mgr]
+      node2:
+        role: [osd]
+        no-of-volumes: 4
+        disk-size: 15
+"""
+
+METADATA = """
+suites:
+  - name: "mirror"
+    suite: "suites/reef/tier-2-mirror.yaml"
+    global-conf: "conf/reef/two-node.yaml"
+    metadata:
+      - stage-1
+      - rbd
+"""
+
+
+def _write(root, relpath, content):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(content)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = str(tmp_path / "repo")
+    _write(root, "suites/reef/tier-2-mirror.yaml", SUITE)
+    _write(root, "conf/reef/two-node.yaml", CONF)
+    _write(root, "pipeline/metadata/reef.yaml", METADATA)
+    return root
+
+
+def test_catalog_queries(repo, tmp_path):
+    catalog = Catalog(repo, str(tmp_path / "cache.json")).refresh()
+    suite = catalog.suite("suites/reef/tier-2-mirror.yaml")
+
+    assert suite["tests"] == ["install", "mirror"]
+    assert suite["polarion_ids"] == ["CEPH-1", "CEPH-2", "CEPH-3"]
+    assert suite["tags"] == ["rbd", "stage-1", "tier-2"]
+    assert suite["nodes"] == 2
+    assert catalog.conf("conf/reef/two-node.yaml")["clusters"]["ceph-pri"] == {
+        "nodes": 2,
+        "volumes": 4,
+        "gigabytes": 60,
+        "roles": ["mgr", "mon", "osd"],
+    }
+    assert catalog.suites(module="test_mirror.py", tag="rbd") == [
+        "suites/reef/tier-2-mirror.yaml"
+    ]
+    assert catalog.suites(polarion_id="CEPH-4") == []
+    assert catalog.total_nodes("tier-2") == 2
+
+
+def test_catalog_cache_invalidation(repo, tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "cache.json")
+    Catalog(repo, cache_file).refresh()
+
+    parsed = []
+    monkeypatch.setattr(
+        "utility.catalog.INDEXERS",
+        {kind: lambda data: parsed.append(data) or {} for kind in ("suites", "confs")}
+        | {"metadata": lambda data: parsed.append(data) or []},
+    )
+
+    # Unchanged and touched files are served from the cache
+    Catalog(repo, cache_file).refresh()
+    os.utime(os.path.join(repo, "conf/reef/two-node.yaml"))
+    Catalog(repo, cache_file).refresh()
+    assert parsed == []
+
+    # Modified and removed files are indexed again
+    _write(repo, "conf/reef/two-node.yaml", CONF + "\n# one more node\n")
+    os.remove(os.path.join(repo, "pipeline/metadata/reef.yaml"))
+    catalog = Catalog(repo, cache_file).refresh()
+    assert len(parsed) == 1
+    assert list(catalog.files["metadata"]) == []
+    assert catalog.suite("suites/reef/tier-2-mirror.yaml")["tags"] == ["tier-2"]
@@ -0,0 +1,118 @@
+"""Unit tests for the shared HTTP sessions and the REST token caching."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rest.common.utils.rest import REST
+from utility import http_session
+from utility.http_session import (
+    base_url,
+    close_sessions,
+    get_adapter,
+    get_token,
+    new_session,
+    request_many,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/api/auth":
+            self.server.logins += 1
+            self.server.token = f"token-{self.server.logins}"
+            return self._reply(201, {"token": self.server.token})
+        self._reply(404, {})
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Authorization") != f"Bearer {self.server.token}":
+            return self._reply(401, {"detail": "invalid token"})
+        self._reply(200, {"path": self.path})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.connections = srv.logins = 0
+    srv.token = None
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    close_sessions()
+    http_session._tokens.clear()
+
+
+def _rest(server):
+    return REST(ip="127.0.0.1", base_uri=f"http://127.0.0.1:{server.server_port}")
+
+
+def test_pool_per_base_url():
+    assert base_url("https://Host:8443/api/auth") == "https://host:8443"
+    assert get_adapter("https://host:8443/a") is get_adapter("https://host:8443/b")
+    assert get_adapter("https://host:8443/a") is not get_adapter("https://host:9/a")
+
+    session = new_session("https://host:8443/a")
+    assert session.get_adapter("https://host:8443/b") is get_adapter(
+        "https://host:8443"
+    )
+    assert new_session("https://host:8443/a") is not session
+    close_sessions()
+
+
+def test_connections_reused(server):
+    rest = _rest(server)
+    for i in range(20):
+        assert rest.get(relative_url=f"/api/{i}") == {"path": f"/api/{i}"}
+
+    # Another client of the endpoint reuses the connection, not the cookies
+    other = _rest(server)
+    rest._session.cookies.set("dashboard", "admin")
+    assert other.get(relative_url="/api/x") == {"path": "/api/x"}
+    assert "dashboard" not in other._session.cookies
+    assert server.connections == 1
+
+
+def test_token_cached_and_refreshed(server):
+    _rest(server)
+    rest = _rest(server)
+    assert server.logins == 1
+    assert get_token(rest._base_uri, "admin") == "token-1"
+
+    # Token expired on the server, the call is retried with a new token
+    server.token = "expired"
+    assert rest.get(relative_url="/api/x") == {"path": "/api/x"}
+    assert server.logins == 2
+    assert get_token(rest._base_uri, "admin") == "token-2"
+
+
+def test_request_many(server):
+    rest = _rest(server)
+    paths = [f"/api/{i}" for i in range(50)]
+    results = request_many(lambda path: rest.get(relative_url=path), paths, 8)
+    assert results == [{"path": path} for path in paths]
+
+    results = request_many(lambda x: 1 / x, [1, 0])
+    assert results[0] == 1 and isinstance(results[1], ZeroDivisionError)
@@ -4,12 +4,16 @@
 This test module uses pytest to unit test the sensitive data log filter
 """
 
+import logging
 import os
+import pickle
+import queue
+import threading
 from copy import deepcopy
 
 import pytest
 
-from utility.log import Log
+from utility.log import ForwardingQueueHandler, Log, SensitiveLogFilter
 
 str_data = "This has password something."
 str_data_no_passwd = "This test has no sensitive data."
@@ -59,6 +63,7 @@ def logger():
 
 def read_log():
     """Read the logfile contents."""
+    Log().flush()
     with open("/tmp/unit-testing-log-filter.log", "r+") as fh:
         log_data = fh.read(-1)
 
@@ -116,3 +121,56 @@ def test_log_list_of_dictionaries(logger):
     assert list_dict_data[1]["test"]["module"] in log_contents
     assert "masked" not in log_contents
     assert None not in _test_data
+
+
+def test_log_filter_copies_only_when_masked():
+    _filter = SensitiveLogFilter()
+
+    assert _filter.redact(list_dict_data) is list_dict_data
+
+    redacted = _filter.redact(dict_data)
+    assert redacted is not dict_data
+    assert redacted["password"] == "<masked>"
+    assert redacted["list"][1] is dict_data["list"][1]
+    assert dict_data["password"] == "Should be masked"
+
+
+def test_log_filter_runs_once_per_record():
+    _filter = SensitiveLogFilter()
+    record = logging.LogRecord("cephci", logging.INFO, __file__, 0, str_data, (), None)
+    _filter.filter(record)
+    record.msg = str_data
+    _filter.filter(record)
+
+    assert record.msg == str_data
+
+
+def test_log_args_at_call_time(logger):
+    _test_data = {"state": "before"}
+
+    logger.info("state: %s", _test_data)
+    _test_data["state"] = "after"
+    log_contents = read_log()
+
+    assert "state: {'state': 'before'}" in log_contents
+
+
+def test_forwarded_record_is_redacted():
+    log_queue = queue.Queue()
+    handler = ForwardingQueueHandler(log_queue, "/tmp/unit-testing-forward.log")
+    record = logging.LogRecord(
+        "cephci",
+        logging.INFO,
+        __file__,
+        0,
+        "%s %s",
+        (dict_data, threading.Lock()),
+        None,
+    )
+    handler.handle(record)
+
+    forwarded = pickle.loads(pickle.dumps(log_queue.get_nowait()))
+    assert forwarded.args is None
+    assert "'password': '<masked>'" in forwarded.msg
+    assert "lock object" in forwarded.msg
+    assert forwarded.log_file == "/tmp/unit-testing-forward.log"
@@ -3,7 +3,11 @@ from unittest import mock
 
 import pytest
 
-from utility.utils import custom_ceph_config, get_cephci_config
+from utility.utils import (
+    custom_ceph_config,
+    get_cephci_config,
+    resolve_ssh_pool_config,
+)
 
 suite_config = {
     "global": {
@@ -149,3 +153,16 @@ def test_get_cephci_config_raises(mock_expanduser):
     except IOError as exception:
         assert mock_expanduser.call_count == 1
         assert exception.errno == 2
+
+
+def test_resolve_ssh_pool_config():
+    """Test the SSH pool overrides are picked from the custom config."""
+    custom_config = ["ssh_max_channels=4", "ssh_idle_timeout=60", "use_ipv6=true"]
+    result = resolve_ssh_pool_config(custom_config)
+
+    assert result == {"max_channels": 4, "idle_timeout": 60}
+    assert resolve_ssh_pool_config(None) == {}
+
+    for value in ("0", "-1"):
+        with pytest.raises(ValueError, match="ssh_max_channels"):
+            resolve_ssh_pool_config([f"ssh_max_channels={value}"])
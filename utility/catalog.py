@@ -0,0 +1,345 @@
+"""
+Indexed catalog of the test suites and the cluster configurations of cephci.
+
+The suite, conf and pipeline metadata files are parsed once with the libyaml
+backed loader and indexed into a compact form, which is saved to a cache file.
+A file is parsed again only when its content changes, the stat of the file is
+compared first and the content hash is computed only when the stat differs.
+
+The suites are indexed with their tests, modules, polarion ids and clusters,
+the tags and global configurations of the pipeline metadata entries executing
+them along with their tier. The confs are indexed with the nodes, volumes and
+roles of their clusters.
+
+Executed from the root of the repository as python -m utility.catalog
+
+Example:
+    catalog = Catalog().refresh()
+    catalog.suites(module="test_cephadm.py", tag="tier-1")
+    catalog.total_nodes(tag="tier-1")
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from time import perf_counter
+
+import yaml
+from docopt import docopt
+
+from utility.log import Log
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+log = Log(__name__)
+
+doc = """
+Builds and queries the catalog of the test suites and cluster configurations.
+
+    Usage:
+        catalog.py build [--cache <file>]
+        catalog.py suites [--module <module>] [--tag <tag>] [--polarion <id>] [--cache <file>]
+        catalog.py nodes --tag <tag> [--cache <file>]
+        catalog.py (-h | --help)
+
+    Options:
+        -h --help               Shows the command usage
+        --cache <file>          Catalog cache file
+        --module <module>       Test module executed by the suites
+        --tag <tag>             Pipeline metadata tag or tier of the suites
+        --polarion <id>         Polarion id of a test of the suites
+"""
+
+# Bumped when the layout of the index changes, invalidates the cache files
+CATALOG_VERSION = 1
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Directories of the repository indexed by the catalog
+CATALOG_DIRS = {
+    "suites": "suites",
+    "confs": "conf",
+    "metadata": os.path.join("pipeline", "metadata"),
+}
+
+TIER_PATTERN = re.compile(r"tier[-_]?(\d+)")
+
+
+def load_yaml(file_name):
+    """Returns the content of the yaml file parsed with the libyaml loader."""
+    with open(os.path.abspath(file_name), "r") as fp:
+        return yaml.load(fp, Loader=SafeLoader)
+
+
+def default_cache_file(root=ROOT):
+    """Returns the cache file of the catalog of the repository."""
+    key = hashlib.sha256(root.encode()).hexdigest()[:12]
+    return os.path.join(
+        os.path.expanduser("~"), ".cache", "cephci", f"catalog-{key}.json"
+    )
+
+
+def index_suite(data):
+    """Returns the tests, modules, polarion ids and clusters of the suite."""
+    index = {"tests": [], "modules": [], "polarion_ids": [], "clusters": []}
+    for item in (data or {}).get("tests") or []:
+        test = (item or {}).get("test") or {}
+        index["tests"].append(test.get("name"))
+        if test.get("module") and test["module"] not in index["modules"]:
+            index["modules"].append(test["module"])
+        for _id in str(test.get("polarion-id") or "").split(","):
+            if _id.strip():
+                index["polarion_ids"].append(_id.strip())
+        for cluster in test.get("clusters") or {}:
+            if cluster not in index["clusters"]:
+                index["clusters"].append(cluster)
+
+    return index
+
+
+def index_conf(data):
+    """Returns the nodes, volumes and roles of the clusters of the conf."""
+    clusters = {}
+    for item in (data or {}).get("globals") or []:
+        cluster = (item or {}).get("ceph-cluster") or {}
+        nodes = volumes = gigabytes = 0
+        roles = set()
+        for key, node in cluster.items():
+            if not key.startswith("node") or not isinstance(node, dict):
+                continue
+            nodes += 1
+            _volumes = int(node.get("no-of-volumes", 0))
+            volumes += _volumes
+            gigabytes += _volumes * int(node.get("disk-size", 0))
+            roles.update(node.get("role") or [])
+
+        clusters[cluster.get("name", "ceph")] = {
+            "nodes": nodes,
+            "volumes": volumes,
+            "gigabytes": gigabytes,
+            "roles": sorted(roles),
+        }
+
+    return {
+        "clusters": clusters,
+        "nodes": sum(cluster["nodes"] for cluster in clusters.values()),
+    }
+
+
+def index_metadata(data):
+    """Returns the suite, global configuration and tags of the pipeline entries."""
+    entries = []
+    for suite in (data or {}).get("suites") or []:
+        for path in str(suite.get("suite", "")).split(","):
+            entries.append(
+                {
+                    "suite": path.strip(),
+                    "global-conf": suite.get("global-conf"),
+                    "tags": suite.get("metadata") or [],
+                }
+            )
+
+    return entries
+
+
+INDEXERS = {"suites": index_suite, "confs": index_conf, "metadata": index_metadata}
+
+
+class Catalog:
+    """Cached index of the suites, confs and pipeline metadata of the repository."""
+
+    def __init__(self, root=ROOT, cache_file=None):
+        self.root = root
+        self.cache_file = cache_file or default_cache_file(root)
+        self.files = {kind: dict() for kind in CATALOG_DIRS}
+        self._suite_tags = None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, "r") as fp:
+                cache = json.load(fp)
+        except (OSError, ValueError):
+            return
+
+        if cache.get("version") == CATALOG_VERSION and cache.get("root") == self.root:
+            self.files = cache["files"]
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_file = f"{self.cache_file}.{os.getpid()}"
+        with open(tmp_file, "w") as fp:
+            json.dump(
+                {"version": CATALOG_VERSION, "root": self.root, "files": self.files},
+                fp,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_file, self.cache_file)
+
+    def refresh(self):
+        """Indexes the files changed since the cache was saved.
+
+        Returns:
+            the catalog
+        """
+        _start = perf_counter()
+        self._load_cache()
+        self._suite_tags = None
+        parsed = changed = 0
+        for kind, directory in CATALOG_DIRS.items():
+            entries, present = self.files.setdefault(kind, dict()), set()
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, directory)):
+                for filename in filenames:
+                    if not filename.endswith((".yaml", ".yml")):
+                        continue
+
+                    path = os.path.join(dirpath, filename)
+                    relpath = os.path.relpath(path, self.root)
+                    present.add(relpath)
+                    stat = os.stat(path)
+                    signature = [stat.st_mtime_ns, stat.st_size]
+                    entry = entries.get(relpath)
+                    if entry and entry["stat"] == signature:
+                        continue
+
+                    with open(path, "rb") as fp:
+                        content = fp.read()
+                    digest = hashlib.sha256(content).hexdigest()
+                    changed += 1
+                    if entry and entry["sha256"] == digest:
+                        entry["stat"] = signature
+                        continue
+
+                    entry = {"stat": signature, "sha256": digest}
+                    try:
+                        entry["index"] = INDEXERS[kind](
+                            yaml.load(content, Loader=SafeLoader)
+                        )
+                    except Exception as err:
+                        entry["error"] = str(err)
+                    entries[relpath] = entry
+                    parsed += 1
+
+            for relpath in set(entries) - present:
+                del entries[relpath]
+                changed += 1
+
+        if changed:
+            self._save_cache()
+
+        log.debug(
+            f"Catalog refreshed in {perf_counter() - _start:.3f}s, parsed {parsed} files"
+        )
+        return self
+
+    def _index(self, kind, relpath):
+        entry = self.files[kind].get(os.path.normpath(relpath))
+        return entry.get("index") if entry else None
+
+    def conf(self, relpath):
+        """Returns the index of the cluster configuration."""
+        return self._index("confs", relpath)
+
+    def suite(self, relpath):
+        """Returns the index of the suite with its tags, global confs and nodes.
+
+        The nodes of the suite are the most nodes among its global confs.
+        """
+        index = self._index("suites", relpath)
+        if index is None:
+            return None
+
+        tags, confs = self.suite_tags().get(os.path.normpath(relpath), (set(), set()))
+        return dict(
+            index,
+            tags=sorted(tags),
+            confs=sorted(confs),
+            nodes=max(
+                [(self.conf(conf) or {}).get("nodes", 0) for conf in confs] or [0]
+            ),
+        )
+
+    def suite_tags(self):
+        """Returns the tags and global confs of every suite from the pipeline metadata."""
+        if self._suite_tags is not None:
+            return self._suite_tags
+
+        suite_tags = dict()
+        for relpath, entry in self.files["suites"].items():
+            match = TIER_PATTERN.search(os.path.basename(relpath))
+            tags = {f"tier-{match.group(1)}"} if match else set()
+            suite_tags[relpath] = (tags, set())
+
+        for entry in self.files["metadata"].values():
+            for item in entry.get("index") or []:
+                relpath = os.path.normpath(item["suite"])
+                if relpath not in suite_tags:
+                    continue
+                suite_tags[relpath][0].update(item["tags"])
+                if item["global-conf"]:
+                    suite_tags[relpath][1].add(os.path.normpath(item["global-conf"]))
+
+        self._suite_tags = suite_tags
+        return suite_tags
+
+    def suites(self, module=None, tag=None, polarion_id=None):
+        """Returns the suites matching all the given criteria.
+
+        Args:
+            module (str): Test module executed by the suite
+            tag (str): Pipeline metadata tag or tier of the suite
+            polarion_id (str): Polarion id of a test of the suite
+        """
+        suite_tags = self.suite_tags()
+        matched = []
+        for relpath, entry in sorted(self.files["suites"].items()):
+            index = entry.get("index")
+            if not index:
+                continue
+            if module and module not in index["modules"]:
+                continue
+            if polarion_id and polarion_id not in index["polarion_ids"]:
+                continue
+            if tag and tag not in suite_tags[relpath][0]:
+                continue
+            matched.append(relpath)
+
+        return matched
+
+    def total_nodes(self, tag):
+        """Returns the nodes needed by all the suites having the tag."""
+        return sum(self.suite(relpath)["nodes"] for relpath in self.suites(tag=tag))
+
+    def errors(self):
+        """Returns the files that could not be parsed with their error."""
+        return {
+            relpath: entry["error"]
+            for entries in self.files.values()
+            for relpath, entry in entries.items()
+            if "error" in entry
+        }
+
+
+if __name__ == "__main__":
+    args = docopt(doc)
+    _start = perf_counter()
+    catalog = Catalog(cache_file=args["--cache"]).refresh()
+
+    if args["build"]:
+        for relpath, error in catalog.errors().items():
+            print(f"{relpath}: {error}", file=sys.stderr)
+        print(
+            f"{len(catalog.files['suites'])} suites, {len(catalog.files['confs'])} confs "
+            f"indexed in {perf_counter() - _start:.3f}s"
+        )
+    elif args["suites"]:
+        for relpath in catalog.suites(
+            module=args["--module"], tag=args["--tag"], polarion_id=args["--polarion"]
+        ):
+            print(relpath)
+    elif args["nodes"]:
+        print(catalog.total_nodes(args["--tag"]))
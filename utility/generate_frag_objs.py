@@ -1,69 +1,191 @@
 # module can be used to generate fragmented objects on replicated pool only
 # support for EC pool may be added later
+# With --aio, the writes and removals are submitted asynchronously keeping up to
+# --in-flight ops outstanding per worker. The objects are distributed across
+# --workers processes, each with its own cluster handle and ioctx, which complete
+# every phase before any of them moves to the next one.
 # !/usr/bin/env python
 from __future__ import print_function
 
+import os
 import sys
+import time
+from collections import deque
+from multiprocessing import Barrier, Process, Value
+from multiprocessing.connection import wait
 
 from docopt import docopt
 from rados import Rados
 
 doc = """
 Usage:
-  generate_frag_objs.py --pool <pool_name> --create <object_count> --remove <object_count> --size <each_object_size>
+  generate_frag_objs.py --pool <pool_name> --create <count> --remove <count> --size <obj_size> [options]
 
 Options:
   --pool <name>      Name of the pool where the omap entries need to be generated
   --create <num>       Start point/count to create objects
   --remove <num>       Start point/count to create objects
   --size <num>       Number of kw pairs to be created for each object
+  --aio              Submit the writes and removals asynchronously
+  --in-flight <num>  Outstanding ops per worker with --aio [default: 64]
+  --workers <num>    Number of worker processes [default: 1]
+  --progress-interval <secs>  Seconds between the progress updates [default: 5]
 
 """
 
+# Number of ops completed by a worker before updating the shared counter
+PROGRESS_BATCH = 100
+
+
+class AioWindow:
+    """Keeps a bounded number of aio completions in flight."""
+
+    def __init__(self, depth):
+        self.depth = max(1, depth)
+        self.pending = deque()
+
+    def _reap(self):
+        completion = self.pending.popleft()
+        completion.wait_for_complete()
+        ret = completion.get_return_value()
+        if ret < 0:
+            raise OSError(-ret, f"aio op failed: {os.strerror(-ret)}")
+
+    def add(self, completion):
+        """Tracks the completion, waits for the oldest one when the window is full.
+
+        Returns:
+            number of ops completed
+        """
+        self.pending.append(completion)
+        done = 0
+        while len(self.pending) >= self.depth:
+            self._reap()
+            done += 1
+        return done
+
+    def drain(self):
+        """Waits for all the outstanding ops, returns the number completed."""
+        done = len(self.pending)
+        while self.pending:
+            self._reap()
+        return done
+
+
+def get_phases(prefix, create, remove):
+    """Returns the phases as tuples of name, op and object names."""
+    return [
+        ("create", "write", [prefix + str(i) for i in range(0, create)]),
+        (
+            "removed - fragment",
+            "remove",
+            [prefix + str(i) for i in range(0, create, 2)],
+        ),
+        (
+            "removed - defragment",
+            "remove",
+            [prefix + str(i + 1) for i in range(0, remove, 2)],
+        ),
+    ]
+
+
+def process_objects(
+    pool, index, workers, phases, data, aio, in_flight, counters, barrier
+):
+    """Executes this worker's share of every phase and updates the shared counters."""
+    with Rados(conffile="") as cluster:
+        with cluster.open_ioctx(pool) as ioctx:
+            for (_, op, names), counter in zip(phases, counters):
+                done = 0
+
+                def update(count, force=False):
+                    nonlocal done
+                    done += count
+                    if done >= PROGRESS_BATCH or (force and done):
+                        with counter.get_lock():
+                            counter.value += done
+                        done = 0
+
+                window = AioWindow(in_flight)
+                for name in names[index::workers]:
+                    if not aio:
+                        if op == "write":
+                            ioctx.write(name, data, 0)
+                        else:
+                            ioctx.remove_object(name)
+                        update(1)
+                    elif op == "write":
+                        update(window.add(ioctx.aio_write_full(name, data)))
+                    else:
+                        update(window.add(ioctx.aio_remove(name)))
+                update(window.drain(), force=True)
+                barrier.wait()
+
+
+def worker(*args):
+    barrier = args[-1]
+    try:
+        process_objects(*args)
+    except Exception as err:
+        barrier.abort()
+        print(f"\nworker {os.getpid()} failed. error : {err}", file=sys.stderr)
+        sys.exit(1)
+
 
 def run(args):
     pool = args["--pool"]
     create = int(args["--create"])
     remove = int(args["--remove"])
     size = int(args["--size"])
+    aio = args["--aio"]
+    in_flight = int(args["--in-flight"])
+    workers = max(1, int(args["--workers"]))
+    interval = float(args["--progress-interval"])
     data = bytes(size)
-    with Rados(conffile="") as cluster:
-        with cluster.open_ioctx(pool) as ioctx:
-            prefix = "filler_" + str(size) + "_"
-            for i in range(0, create):
-                ioctx.write(prefix + str(i), data, 0)
-                print(
-                    "create",
-                    i,
-                    "of",
-                    create,
-                    "objects",
-                    end="\r",
-                )
-                sys.stdout.flush()
-            for i in range(0, create, 2):
-                ioctx.remove_object(prefix + str(i))
-                print(
-                    "removed - fragment",
-                    int(i / 2),
-                    "of",
-                    int(create / 2),
-                    "objects",
-                    end="\r",
-                )
-                sys.stdout.flush()
-            for i in range(0, remove, 2):
-                ioctx.remove_object(prefix + str(i + 1))
-                print(
-                    "removed - defragment",
-                    int(i / 2),
-                    "of",
-                    int(remove / 2),
-                    "objects",
-                    end="\r",
-                )
-                sys.stdout.flush()
-    print("\nDone!")
+    prefix = "filler_" + str(size) + "_"
+    phases = get_phases(prefix, create, remove)
+    counters = [Value("q", 0) for _ in phases]
+    barrier = Barrier(workers)
+    procs = [
+        Process(
+            target=worker,
+            args=(
+                pool,
+                index,
+                workers,
+                phases,
+                data,
+                aio,
+                in_flight,
+                counters,
+                barrier,
+            ),
+        )
+        for index in range(workers)
+    ]
+
+    _start = time.monotonic()
+    for proc in procs:
+        proc.start()
+
+    while any(proc.is_alive() for proc in procs):
+        sentinels = {proc.sentinel: proc for proc in procs if proc.is_alive()}
+        for sentinel in wait(sentinels, timeout=interval):
+            sentinels[sentinel].join()
+        for (name, _, names), counter in zip(phases, counters):
+            if counter.value < len(names):
+                break
+        print(name, counter.value, "of", len(names), "objects", end="\r")
+        sys.stdout.flush()
+
+    elapsed = max(time.monotonic() - _start, 1e-6)
+    failed = [proc for proc in procs if proc.exitcode]
+    if failed:
+        raise Exception(f"{len(failed)} of {workers} workers failed")
+
+    ops = sum(len(names) for _, _, names in phases)
+    print(f"\ncompleted {ops} ops in {elapsed:.1f}s, {ops / elapsed:.1f} ops/s")
+    print("Done!")
 
 
 if __name__ == "__main__":
@@ -3,6 +3,11 @@ Module used to:
 1. Create objects on pool,
 2. generate specified amount of dummy key value pairs, add it as attributes to the object,
  thereby increasing the omap entries on the pool
+
+With --aio, the write ops are submitted asynchronously keeping up to --in-flight
+ops outstanding per worker, instead of waiting for each op to complete. The
+objects are distributed across --workers processes, each with its own cluster
+handle and ioctx.
 """
 
 # !/usr/bin/env python
@@ -10,48 +15,170 @@ from __future__ import print_function
 
 import os
 import sys
+import time
+from collections import deque
+from multiprocessing import Process, Value
+from multiprocessing.connection import wait
 
 from docopt import docopt
 from rados import Rados, WriteOpCtx
 
 doc = """
 Usage:
-  generate_omap_entries.py --pool <pool_name> --start <init_count> --end <end_count> --key-count <num_keys>
+  generate_omap_entries.py --pool <pool_name> --start <init_count> --end <end_count> --key-count <num_keys> [options]
 
 Options:
   --pool <name>                     Name of the pool where the omap entries need to be generated
   --start <num>                     Start point/count to create objects
   --end <num>                       end point/count to create objects
   --key-count <num>                 Number of kw pairs to be created for each object
+  --aio                             Submit the write ops asynchronously
+  --in-flight <num>                 Outstanding write ops per worker with --aio [default: 64]
+  --workers <num>                   Number of worker processes [default: 1]
+  --progress-interval <secs>        Seconds between the progress updates [default: 5]
 
 """
 
+# Number of objects written by a worker before updating the shared counter
+PROGRESS_BATCH = 100
+
+
+class AioWindow:
+    """Keeps a bounded number of aio completions in flight."""
+
+    def __init__(self, depth):
+        self.depth = max(1, depth)
+        self.pending = deque()
+
+    def _reap(self):
+        completion, write_op = self.pending.popleft()
+        completion.wait_for_complete()
+        if write_op is not None:
+            write_op.release()
+        ret = completion.get_return_value()
+        if ret < 0:
+            raise OSError(-ret, f"aio write failed: {os.strerror(-ret)}")
+
+    def add(self, completion, write_op=None):
+        """Tracks the completion, waits for the oldest one when the window is full.
+
+        Returns:
+            number of ops completed
+        """
+        self.pending.append((completion, write_op))
+        done = 0
+        while len(self.pending) >= self.depth:
+            self._reap()
+            done += 1
+        return done
+
+    def drain(self):
+        """Waits for all the outstanding ops, returns the number completed."""
+        done = len(self.pending)
+        while self.pending:
+            self._reap()
+        return done
+
+
+def write_objects(pool, names, keys, values, aio, in_flight, counter):
+    """Sets the omap keys on the given objects and updates the shared counter."""
+    done = 0
+
+    def update(count, force=False):
+        nonlocal done
+        done += count
+        if done >= PROGRESS_BATCH or (force and done):
+            with counter.get_lock():
+                counter.value += done
+            done = 0
+
+    with Rados(conffile="") as cluster:
+        with cluster.open_ioctx(pool) as ioctx:
+            if not aio:
+                for name in names:
+                    with WriteOpCtx(ioctx) as write_op:
+                        ioctx.set_omap(write_op, keys, values)
+                        ioctx.operate_write_op(write_op, name)
+                    update(1)
+            else:
+                window = AioWindow(in_flight)
+                for name in names:
+                    write_op = ioctx.create_write_op()
+                    ioctx.set_omap(write_op, keys, values)
+                    completion = ioctx.operate_aio_write_op(write_op, name)
+                    update(window.add(completion, write_op))
+                update(window.drain())
+    update(0, force=True)
+
+
+def worker(*args):
+    try:
+        write_objects(*args)
+    except Exception as err:
+        print(f"\nworker {os.getpid()} failed. error : {err}", file=sys.stderr)
+        sys.exit(1)
+
 
 def run(args):
     pool = args["--pool"]
     start = int(args["--start"])
     end = int(args["--end"])
     keys_per_object = int(args["--key-count"])
+    aio = args["--aio"]
+    in_flight = int(args["--in-flight"])
+    workers = max(1, int(args["--workers"]))
+    interval = float(args["--progress-interval"])
     keys = tuple(["key_" + str(x) for x in range(keys_per_object)])
     values = tuple(["value_" + str(x) for x in range(keys_per_object)])
 
-    with Rados(conffile="") as cluster:
-        with cluster.open_ioctx(pool) as ioctx:
-            prefix = "omap_obj_" + str(os.getpid()) + "_"
-            for i in range(start, end):
-                with WriteOpCtx(ioctx) as write_op:
-                    ioctx.set_omap(write_op, keys, values)
-                    ioctx.operate_write_op(write_op, prefix + str(i))
-                    print(
-                        "wrote",
-                        (i + 1) * keys_per_object,
-                        "of",
-                        (end - start) * keys_per_object,
-                        "omap entries",
-                        end="\r",
-                    )
-                    sys.stdout.flush()
-    print("\nDone!")
+    prefix = "omap_obj_" + str(os.getpid()) + "_"
+    total = max(0, end - start)
+    counter = Value("q", 0)
+    procs = [
+        Process(
+            target=worker,
+            args=(
+                pool,
+                [prefix + str(i) for i in range(start + index, end, workers)],
+                keys,
+                values,
+                aio,
+                in_flight,
+                counter,
+            ),
+        )
+        for index in range(workers)
+    ]
+
+    _start = time.monotonic()
+    for proc in procs:
+        proc.start()
+
+    while any(proc.is_alive() for proc in procs):
+        sentinels = {proc.sentinel: proc for proc in procs if proc.is_alive()}
+        for sentinel in wait(sentinels, timeout=interval):
+            sentinels[sentinel].join()
+        print(
+            "wrote",
+            counter.value * keys_per_object,
+            "of",
+            total * keys_per_object,
+            "omap entries",
+            end="\r",
+        )
+        sys.stdout.flush()
+
+    elapsed = max(time.monotonic() - _start, 1e-6)
+    failed = [proc for proc in procs if proc.exitcode]
+    if failed:
+        raise Exception(f"{len(failed)} of {workers} workers failed")
+
+    print(
+        f"\nwrote {total * keys_per_object} omap entries on {total} objects in "
+        f"{elapsed:.1f}s, {total / elapsed:.1f} ops/s, "
+        f"{total * keys_per_object / elapsed:.1f} keys/s"
+    )
+    print("Done!")
 
 
 if __name__ == "__main__":
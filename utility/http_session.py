@@ -0,0 +1,172 @@
+"""
+Shared HTTP sessions for the REST clients of cephci.
+
+The REST clients used to issue every call through the module level functions
+of requests, paying a new TCP connection and TLS handshake for each of them.
+A keep-alive connection pool (HTTPAdapter) is maintained per base URL (scheme,
+host and port) and shared by the sessions of every client of that endpoint.
+Each client has its own session, hence its own cookies, which are not shared
+between the users of an endpoint.
+
+The auth tokens obtained by the clients are cached per base URL and user, so
+that a new client of the same endpoint reuses the token instead of logging in
+again. The client refreshes the cached token when the server responds with
+401.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utility.log import Log
+
+log = Log(__name__)
+
+# Number of hosts for which connections are pooled by a session
+POOL_CONNECTIONS = 10
+
+# Connections kept alive per host, bounds the concurrent requests to a host
+POOL_MAXSIZE = 32
+
+# Retries on connection errors and on the transient status codes below
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Workers of the concurrent request helper
+MAX_WORKERS = 16
+
+_config = {
+    "pool_connections": POOL_CONNECTIONS,
+    "pool_maxsize": POOL_MAXSIZE,
+    "max_retries": MAX_RETRIES,
+    "backoff_factor": BACKOFF_FACTOR,
+}
+_adapters = dict()
+_tokens = dict()
+_lock = threading.Lock()
+
+
+def base_url(url: str) -> str:
+    """Returns the scheme, host and port of the URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def configure_sessions(**kwargs):
+    """Updates the pool sizes and retries of the connection pools.
+
+    The pools created earlier are closed, the sessions created afterwards
+    use pools with the updated configuration.
+
+    Args:
+        pool_connections (int): number of hosts pooled by a session
+        pool_maxsize (int): connections kept alive per host
+        max_retries (int): retries on connection errors and 502/503/504
+        backoff_factor (float): backoff between the retries
+    """
+    unknown = set(kwargs) - set(_config)
+    if unknown:
+        raise ValueError(f"Unknown session configuration {', '.join(unknown)}")
+
+    _config.update({key: val for key, val in kwargs.items() if val is not None})
+    close_sessions()
+
+
+def get_adapter(url: str) -> HTTPAdapter:
+    """Returns the connection pool of the base URL, creating it on first use."""
+    key = base_url(url)
+    with _lock:
+        adapter = _adapters.get(key)
+        if adapter is None:
+            log.debug(f"Creating HTTP connection pool for {key}")
+            # Only the idempotent methods are retried on status, the responses
+            # are returned to the clients once the retries are exhausted.
+            retries = Retry(
+                total=_config["max_retries"],
+                backoff_factor=_config["backoff_factor"],
+                status_forcelist=RETRY_STATUS_CODES,
+                raise_on_status=False,
+            )
+            adapter = _adapters[key] = HTTPAdapter(
+                pool_connections=_config["pool_connections"],
+                pool_maxsize=_config["pool_maxsize"],
+                max_retries=retries,
+            )
+
+    return adapter
+
+
+def new_session(url: str) -> requests.Session:
+    """Returns a new session using the connection pool of the base URL.
+
+    The session, with its cookies, is meant to be kept by a single client.
+    """
+    adapter = get_adapter(url)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def close_sessions():
+    """Closes the connection pools and their pooled connections."""
+    with _lock:
+        adapters = list(_adapters.values())
+        _adapters.clear()
+
+    for adapter in adapters:
+        adapter.close()
+
+
+def get_token(url: str, username: str):
+    """Returns the cached auth token of the user for the base URL."""
+    with _lock:
+        return _tokens.get((base_url(url), username))
+
+
+def set_token(url: str, username: str, token: str):
+    """Caches the auth token of the user for the base URL."""
+    with _lock:
+        _tokens[(base_url(url), username)] = token
+
+
+def clear_token(url: str, username: str, token: str = None):
+    """Removes the cached token, only if it is still the given token."""
+    key = (base_url(url), username)
+    with _lock:
+        if token is None or _tokens.get(key) == token:
+            _tokens.pop(key, None)
+
+
+def request_many(func, items, max_workers: int = MAX_WORKERS) -> list:
+    """Calls the function for every item concurrently.
+
+    The concurrency is bounded by the workers and the size of the connection
+    pools, which is where the requests wait for a free connection.
+
+    Args:
+        func: callable issuing the request for an item
+        items: arguments of the calls
+        max_workers: maximum requests in flight
+
+    Returns:
+        list of the results in the order of the items, the exceptions raised
+        by the calls are returned in place of their results
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        try:
+            return func(item)
+        except Exception as err:
+            return err
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_call, items))
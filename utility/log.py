@@ -1,8 +1,13 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import re
-from copy import deepcopy
+import threading
+import traceback
+from copy import copy
+from queue import Empty
 from typing import Dict
 
 from .config import TestMetaData
@@ -14,6 +19,12 @@ LOG_FORMAT = (
 magna_server = "http://magna002.ceph.redhat.com"
 magna_url = f"{magna_server}/cephci-jenkins/"
 
+# Maximum records written by the LogWriter before flushing the streams
+LOG_BATCH_SIZE = 1000
+
+_writer = None
+_formatter = logging.Formatter()
+
 
 class LoggerInitializationException(Exception):
     """Exception raised for logger initialization errors."""
@@ -102,7 +113,10 @@ class Log(logging.Logger):
         self.error(message)
 
     def configure_logger(self, test_name, run_dir, disable_console_log, **kwargs):
-        """Configures a new FileHandler for the root logger.
+        """Configures a new LogWriter for the test.
+
+        The records are queued by the logger and written to the test log
+        files, and to the console unless disabled, by the writer thread.
 
         Args:
             test_name: name of the test being executed. used for naming the logfile
@@ -110,6 +124,8 @@ class Log(logging.Logger):
         Returns:
             URL where the log file can be viewed or None if the run_dir does not exist
         """
+        global _writer
+
         if not os.path.isdir(run_dir):
             self._logger.error(
                 f"Run directory '{run_dir}' does not exist, logs will not output to file."
@@ -117,40 +133,24 @@ class Log(logging.Logger):
             return None
 
         self.close_and_remove_filehandlers()
-        pass_filter = SensitiveLogFilter(name="cephci_filter")
 
-        log_format = logging.Formatter(self.log_format)
         full_log_name = f"{test_name}.log"
         test_logfile = os.path.join(run_dir, full_log_name)
         self._logger.info(f"Test logfile: {test_logfile}")
 
-        if disable_console_log:
-            self._logger.propagate = False
-
-        _handler = logging.FileHandler(test_logfile)
-        _handler = logging.handlers.RotatingFileHandler(
-            test_logfile,
-            maxBytes=10 * 1024 * 1024,  # Set the maximum log file size to 10 MB
-            backupCount=20,  # Keep up to 20 old log files which will be 200 MB per test case
+        _writer = LogWriter(
+            queue.Queue(),
+            handlers=get_log_handlers(
+                test_logfile, self.log_format, console=not disable_console_log
+            ),
         )
-        _handler.setFormatter(log_format)
-        _handler.addFilter(pass_filter)
-        self._logger.addHandler(_handler)
-
-        # error file handler
-        err_logfile = os.path.join(run_dir, f"{test_name}.err")
-        _err_handler = logging.FileHandler(err_logfile)
-        _err_handler.setFormatter(log_format)
-        _err_handler.setLevel(logging.ERROR)
-        _err_handler.addFilter(pass_filter)
-        self._logger.addHandler(_err_handler)
-
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(log_format)
-        console_handler.addFilter(pass_filter)
-        if not any(isinstance(h, logging.StreamHandler) for h in self._logger.handlers):
-            self._logger.addHandler(console_handler)
+        _writer.propagate = not disable_console_log
+        _writer.start()
+
+        # The writer owns the console output, propagating the records to the
+        # root handlers would print them before being redacted.
+        self._logger.propagate = False
+        self._logger.addHandler(LocalQueueHandler(_writer))
 
         url_base = (
             magna_url + run_dir.split("/")[-1]
@@ -162,17 +162,257 @@ class Log(logging.Logger):
 
         return log_url
 
+    def flush(self):
+        """Blocks until the queued records are written."""
+        if _writer:
+            _writer.queue.join()
+
     def close_and_remove_filehandlers(self):
-        """Close FileHandlers and then remove them from the logger's handlers list."""
+        """Stop the LogWriter and close FileHandlers, then remove them from the logger's handlers list."""
+        global _writer
+
         handlers = self._logger.handlers[:]
         for handler in handlers:
-            if isinstance(handler, logging.FileHandler):
+            if isinstance(handler, (logging.FileHandler, LocalQueueHandler)):
                 handler.close()
                 self._logger.removeHandler(handler)
 
+        if _writer:
+            _writer.stop()
+            self._logger.propagate = _writer.propagate
+            _writer = None
+
+
+class BatchedFlushMixin:
+    """Defers the flush of the stream to the end of a batch of records."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BatchedFileHandler(BatchedFlushMixin, logging.FileHandler):
+    pass
+
+
+class BatchedRotatingFileHandler(
+    BatchedFlushMixin, logging.handlers.RotatingFileHandler
+):
+    pass
+
+
+class BatchedStreamHandler(BatchedFlushMixin, logging.StreamHandler):
+    pass
+
+
+def get_log_handlers(log_file, log_format=LOG_FORMAT, console=False):
+    """Returns the handlers of a test log file.
+
+    Args:
+        log_file: path of the log file, errors are written to a .err file alongside
+        log_format: format of the records
+        console: include a console handler
+    """
+    formatter = logging.Formatter(log_format)
+    _handler = BatchedRotatingFileHandler(
+        log_file,
+        maxBytes=10 * 1024 * 1024,  # Set the maximum log file size to 10 MB
+        backupCount=20,  # Keep up to 20 old log files which will be 200 MB per test case
+    )
+    _handler.setFormatter(formatter)
+
+    # error file handler
+    _err_handler = BatchedFileHandler(f"{os.path.splitext(log_file)[0]}.err")
+    _err_handler.setFormatter(formatter)
+    _err_handler.setLevel(logging.ERROR)
+    handlers = [_handler, _err_handler]
+
+    if console:
+        console_handler = BatchedStreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    return handlers
+
+
+class LogWriter:
+    """Writes the queued log records from a single thread.
+
+    The records, redacted by the queue handlers, are written in batches, the
+    streams are flushed once per batch. Records carrying a log_file attribute,
+    forwarded by child processes, are written to the handlers of that file
+    which are opened on its first record.
+    """
+
+    def __init__(self, queue, handlers=None, console=False):
+        """
+        Args:
+            queue: queue of the records
+            handlers: handlers of the records without a log_file
+            console: write the records with a log_file to the console as well
+        """
+        self.queue = queue
+        self.handlers = handlers or []
+        self.console = console
+        self.routes = dict()
+        self.pid = os.getpid()
+        self.propagate = True
+        self.log_filter = SensitiveLogFilter(name="cephci_filter")
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._monitor, name="cephci-log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Writes the pending records and closes the handlers."""
+        atexit.unregister(self.stop)
+        if self._thread:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+        for handler in self.handlers + sum(self.routes.values(), []):
+            handler.close()
+        self.routes.clear()
+
+    def handle(self, record):
+        """Redacts the record and passes it to the handlers."""
+        self.log_filter.filter(record)
+        log_file = getattr(record, "log_file", None)
+        handlers = self.handlers
+        if log_file:
+            handlers = self.routes.get(log_file)
+            if handlers is None:
+                handlers = get_log_handlers(log_file, console=self.console)
+                self.routes[log_file] = handlers
+
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def flush(self):
+        for handler in self.handlers + sum(self.routes.values(), []):
+            getattr(handler, "flush_batch", handler.flush)()
+
+    def _monitor(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < LOG_BATCH_SIZE:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                pass
+
+            for record in batch:
+                if record is not None:
+                    try:
+                        self.handle(record)
+                    except Exception:  # noqa
+                        traceback.print_exc()
+            self.flush()
+
+            # The multiprocessing queues of the child processes are not joined
+            if hasattr(self.queue, "task_done"):
+                for _ in batch:
+                    self.queue.task_done()
+
+            if None in batch:
+                return
+
+
+def _flush_writer():
+    """Flushes the buffered records, the forked children must not inherit them."""
+    if _writer:
+        _writer.flush()
+
+
+os.register_at_fork(before=_flush_writer)
+
+
+def prepare_record(record, log_filter):
+    """Returns a copy of the record redacted and with its message merged.
+
+    The args are merged into the message when the record is queued, hence
+    mutable args are logged with their values at the time of the call and the
+    record no longer holds objects which cannot be pickled.
+
+    Args:
+        record: log record
+        log_filter: SensitiveLogFilter redacting the record
+    """
+    record = copy(record)
+    log_filter.filter(record)
+    record.msg, record.args = record.getMessage(), None
+    if record.exc_info:
+        if not record.exc_text:
+            record.exc_text = _formatter.formatException(record.exc_info)
+        record.exc_info = None
+
+    return record
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queues the records for the LogWriter of the process.
+
+    The records are redacted and their message merged when queued, they are
+    formatted and written by the writer.
+    """
+
+    def __init__(self, writer):
+        super().__init__(writer.queue)
+        self.writer = writer
+
+    def prepare(self, record):
+        return prepare_record(record, self.writer.log_filter)
+
+    def emit(self, record):
+        if os.getpid() != self.writer.pid:
+            # Forked child, the writer thread runs only in the parent
+            self.writer.handle(record)
+            self.writer.flush()
+            return
+
+        super().emit(record)
+
+
+class ForwardingQueueHandler(logging.handlers.QueueHandler):
+    """Forwards the records of a child process to the LogWriter of the parent.
+
+    The records are redacted and their message merged in the child, only
+    strings are sent over the queue.
+    """
+
+    def __init__(self, queue, log_file):
+        """
+        Args:
+            queue: multiprocessing queue shared with the parent process
+            log_file: log file of the records in the parent
+        """
+        super().__init__(queue)
+        self.log_file = log_file
+        self.log_filter = SensitiveLogFilter(name="cephci_filter")
+
+    def prepare(self, record):
+        record = prepare_record(record, self.log_filter)
+        record.log_file = self.log_file
+        return record
+
 
 class SensitiveLogFilter(logging.Filter):
-    """Filter known sensitive data from being logged."""
+    """Filter known sensitive data from being logged.
+
+    The filter is attached to every handler of the logger, hence a record is
+    marked once redacted and is not processed again by the other handlers.
+    Strings are scanned with a substring check before the regex is applied and
+    containers are copied only when an item within them is masked.
+    """
 
     excluded_words = [
         "access-key",
@@ -183,69 +423,74 @@ class SensitiveLogFilter(logging.Filter):
         "token",
     ]
 
+    def __init__(self, name=""):
+        super().__init__(name)
+        _words = "|".join(re.escape(word) for word in self.excluded_words)
+        self._pattern = re.compile(
+            rf'({_words})\s*[:=]?\s*(["\']?)([^\s"\']+)(\2)(\s|$)',
+            flags=re.IGNORECASE,
+        )
+        self._words = tuple(word.lower() for word in self.excluded_words)
+
     def redact_list(self, data):
-        """Redact values in the iterator."""
+        """Return the list with its values redacted, the same list if unchanged."""
+        rtn = None
         for i, v in enumerate(data):
-            if isinstance(v, list):
-                self.redact_list(data[i])
-            elif isinstance(v, dict):
-                self.redact_dict(data[i])
-            elif isinstance(v, tuple):
-                data[i] = self.redact(v)
-            elif isinstance(v, (str, bytearray, bytes)):
-                data[i] = self.redact_str(v)
+            _v = self.redact(v)
+            if _v is not v:
+                if rtn is None:
+                    rtn = copy(data)
+                rtn[i] = _v
+
+        return data if rtn is None else rtn
 
     def redact_dict(self, data):
-        """Redact values based on keys"""
-        for _key in data.keys():
-            if _key in self.excluded_words:
-                data[_key] = "<masked>"
-            elif isinstance(data[_key], dict):
-                self.redact_dict(data[_key])
-            elif isinstance(data[_key], list):
-                self.redact_list(data[_key])
-            elif isinstance(data[_key], tuple):
-                data[_key] = self.redact(data[_key])
-            elif isinstance(data[_key], (str, bytearray, bytes)):
-                data[_key] = self.redact_str(data[_key])
+        """Return the dict with values redacted based on keys, the same dict if unchanged."""
+        rtn = None
+        for _key, v in data.items():
+            _v = "<masked>" if _key in self.excluded_words else self.redact(v)
+            if _v is not v:
+                if rtn is None:
+                    rtn = copy(data)
+                rtn[_key] = _v
+
+        return data if rtn is None else rtn
 
     def redact_str(self, data):
         """Redact strings containing sensitive keys."""
-        _words = "|".join(self.excluded_words)
-        rtn = re.sub(
-            rf'({_words})\s*[:=]?\s*(["\']?)([^\s"\']+)(\2)(\s|$)',
-            r"\1 <masked>\5",
-            data,
-            flags=re.IGNORECASE,
-        )
-        return rtn
+        lowered = data.lower()
+        for word in self._words:
+            if word in lowered:
+                return self._pattern.sub(r"\1 <masked>\5", data)
+
+        return data
 
     def redact(self, msg):
         """Return the redacted message if sensitive data found.
 
         The method replaces strings that are captured after known words. If
         the method encounters a dict, the keys of the dict are scanned for
-        excluded fields.
+        excluded fields. The given message is returned as is when there is
+        nothing to be masked.
         """
-        data = deepcopy(msg)
+        if isinstance(msg, str):
+            return self.redact_str(msg)
 
-        if isinstance(data, dict):
-            self.redact_dict(data)
-            return data
+        if isinstance(msg, (bytearray, bytes)):
+            return self.redact_str(str(msg, "utf-8", errors="replace"))
 
-        if isinstance(data, list):
-            self.redact_list(data)
-            return data
+        if isinstance(msg, dict):
+            return self.redact_dict(msg)
 
-        if isinstance(data, tuple):
-            return tuple(self.redact(arg) for arg in data)
+        if isinstance(msg, list):
+            return self.redact_list(msg)
 
-        if isinstance(data, (str, bytearray, bytes)):
-            data = data if isinstance(data, str) else str(data, "utf-8")
-            return self.redact_str(data)
+        if isinstance(msg, tuple):
+            rtn = tuple(self.redact(arg) for arg in msg)
+            return msg if all(x is y for x, y in zip(rtn, msg)) else rtn
 
         # Basic types that require no processing
-        return data
+        return msg
 
     def filter(self, record):
         """Modifies the log record.
@@ -256,11 +501,12 @@ class SensitiveLogFilter(logging.Filter):
         - logging of passwords when registering the server
         - logging of password using as authentication.
         """
+        if getattr(record, "cephci_redacted", False):
+            return True
+
         record.msg = self.redact(record.msg)
-        if isinstance(record.args, dict):
-            for k in record.args.keys():
-                record.args[k] = self.redact(record.args[k])
-        else:
-            record.args = tuple(self.redact(arg) for arg in record.args)
+        if record.args:
+            record.args = self.redact(record.args)
+        record.cephci_redacted = True
 
         return True
@@ -0,0 +1,92 @@
+"""Benchmark for the overhead of SensitiveLogFilter.
+
+A cephci log file is replayed line by line as log records through the filter
+the same way the handlers of the logger apply it. When a log file is not
+provided, a synthetic log of the requested size is replayed instead.
+"""
+
+import logging
+import sys
+from time import perf_counter
+
+from docopt import docopt
+
+from utility.log import LOG_FORMAT, SensitiveLogFilter
+
+doc = """
+Measures the throughput of SensitiveLogFilter over a replayed cephci log.
+
+    Usage:
+        log_filter_bench.py [options]
+        log_filter_bench.py (-h | --help)
+
+    Options:
+        -h --help               Shows the command usage
+        --log <file>            cephci log file to be replayed.
+        --size <mb>             Size of the synthetic log when no log file is
+                                provided. [default: 256]
+        --handlers <count>      Number of handlers applying the filter.
+                                [default: 3]
+"""
+
+SYNTHETIC_LINES = (
+    "2024-01-01 00:00:00,000 - cephci - ceph:1605 - INFO - Execute cephadm shell -- ceph orch ps",
+    "2024-01-01 00:00:00,000 - cephci - ceph:1650 - INFO - osd.1  ceph-node2  running (3h)  4m ago",
+    "2024-01-01 00:00:00,000 - cephci - ceph:1650 - INFO - client.admin keyring is /etc/ceph/keyring",
+    "2024-01-01 00:00:00,000 - cephci - run:530 - INFO - Logging in with password: p@ssw0rd",
+)
+
+
+def replay(lines):
+    """Yields the lines of the log file or the synthetic log."""
+    if lines[0]:
+        with open(lines[0], errors="replace") as fh:
+            yield from fh
+        return
+
+    size, written = lines[1] * 1024 * 1024, 0
+    while written < size:
+        for line in SYNTHETIC_LINES:
+            written += len(line) + 1
+            yield line + "\n"
+
+
+def run(log_file, size, handlers):
+    """Applies the filter on every replayed line.
+
+    Returns:
+        tuple of records, bytes and seconds spent within the filter
+    """
+    _filter = SensitiveLogFilter(name="cephci_filter")
+    formatter = logging.Formatter(LOG_FORMAT)
+    records = total = 0
+    elapsed = 0.0
+    for line in replay((log_file, size)):
+        record = logging.LogRecord(
+            "cephci", logging.INFO, __file__, 0, line.rstrip("\n"), (), None
+        )
+        _start = perf_counter()
+        for _ in range(handlers):
+            _filter.filter(record)
+        elapsed += perf_counter() - _start
+        formatter.format(record)
+        records += 1
+        total += len(line)
+
+    return records, total, elapsed
+
+
+def report(records, total, elapsed):
+    """Prints the filter throughput."""
+    elapsed = max(elapsed, 1e-9)
+    print(f"records : {records}")
+    print(f"size    : {total / 1024 / 1024:.1f}MB")
+    print(f"filter  : {elapsed:.3f}s")
+    print(f"rate    : {records / elapsed:.0f} records/s")
+    print(f"        : {total / 1024 / 1024 / elapsed:.1f}MB/s")
+
+
+if __name__ == "__main__":
+    args = docopt(doc)
+    report(*run(args["--log"], int(args["--size"]), int(args["--handlers"])))
+    sys.exit(0)
@@ -49,6 +49,10 @@ those files will get attached to the suite and if there are any .err files we ar
 test cases based on the name of the test case.
 If the .zip file not present in the attachments. for those we are just updating the results and skipping the attachments
 
+The log events of a test case are buffered and sent through the batch log endpoint of Report Portal in chunks by
+RpLogBatch. The xunit files are read incrementally, the test cases of a suite are started in the order of the xunit
+file as they are parsed, their logs are uploaded and they are finished concurrently before the suite is finished.
+
 Sample Output File:
     [
         {
@@ -77,25 +81,34 @@ Sample Output File:
 
 """
 
-import datetime
 import json
 import logging
 import os
 import re
 import sys
+import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
+from functools import lru_cache, partial
 
-import xmltodict
 from docopt import docopt
 from rp_utils.preproc import PreProcClient
-from rp_utils.reportportalV1 import Launch, Launches, ReportPortalV1, RpLog
+from rp_utils.reportportalV1 import (
+    Launch,
+    Launches,
+    ReportPortalV1,
+    RpLog,
+    RpLogBatch,
+)
 from rp_utils.xunit_xml import TestCase, TestSuite, XunitXML
 from utils import create_run_dir, generate_unique_id, tfacon
 
 from utility.retry import retry
 
 log = logging.getLogger(__name__)
+
+# Test cases of a suite uploaded concurrently
+TESTCASE_WORKERS = 8
 doc = """
 Standard script to push all the logs from Xunit files and get launcher details from Report Portal
 
@@ -243,10 +256,14 @@ def upload_logs(config_file, payload_dir):
         log.info(dir(rportal.service))
         launch = Launch(rportal)
         log.info(dir(preproc))
-        launch.start()
+        launch_uuid = launch.start()
         log.info(result_file_list)
+        batcher = RpLogBatch(rportal, launch_uuid=launch_uuid)
         list(
-            executor.map(partial(process_xml_file, preproc, rportal), result_file_list)
+            executor.map(
+                partial(process_xml_file, preproc, rportal, batcher=batcher),
+                result_file_list,
+            )
         )
         launch.finish()
     return_obj["launches"] = rportal.launches.list
@@ -257,59 +274,51 @@ def upload_logs(config_file, payload_dir):
     return return_obj
 
 
-def process_xml_file(preproc, rportal, fqpath):
-    with open(fqpath) as xmlfd:
-        log.info("Processing fqpath %s", fqpath)
-        filename = os.path.basename(fqpath)
-        filename_base, _ = os.path.splitext(filename)
-        log.info("%s %s", filename, filename_base)
+def process_xml_file(preproc, rportal, fqpath, batcher=None):
+    log.info("Processing fqpath %s", fqpath)
+    filename = os.path.basename(fqpath)
+    filename_base, _ = os.path.splitext(filename)
+    log.info("%s %s", filename, filename_base)
+
+    log.info("Parsing XML incrementally...")
+    xunit_xml = XunitXML(
+        rportal, name=filename_base, configs=preproc._configs, fqpath=fqpath
+    )
+    process(xunit_xml, rportal, batcher=batcher)
 
-        log.info("Parsing XML...")
-        xml_data = xmltodict.parse(xmlfd.read())
-        xunit_xml = XunitXML(
-            rportal, name=filename_base, configs=preproc._configs, xml_data=xml_data
-        )
-        process(xunit_xml, rportal)
 
+def process(xmlObj, rportal, batcher=None):
+    """Process xUnit XML data
 
-def process(xmlObj, rportal):
-    """Process xUnit XML data"""
+    The testcases are started in ReportPortal as soon as they are parsed, in
+    the order of the xUnit file. Their logs and attachments are uploaded and
+    they are finished concurrently, with at most twice the workers pending so
+    that the parsed testcases are released at the pace of the uploads.
+    """
     # override env var with config provided vars
     rp_host_url = os.environ.get("RP_HOST_URL", None)
     log.info("rp_host_url: %s", rp_host_url)
 
-    # check for multiple testsuites in xUnit
-    if xmlObj.xml_data.get("testsuites"):
-        # get test suites list
-        testsuites_object = xmlObj.xml_data.get("testsuites")
-        testsuites = (
-            testsuites_object.get("testsuite")
-            if isinstance(testsuites_object.get("testsuite"), list)
-            else [testsuites_object.get("testsuite")]
-        )
-    else:
-        testsuites = [xmlObj.xml_data.get("testsuite")]
     rplog = RpLog(rportal)
     # create testsuite(s)
-    log.info("Processing %s testsuite(s)", len(testsuites))
-    for testsuite in testsuites:
-        testcases = testsuite.get("testcase")
-        if not testcases:
-            log.info(
-                "Found empty test suite Name: %s. Skipping this test suite"
-                % testsuite.get("@name")
-            )
-            continue
-        elif not isinstance(testcases, list):
-            testcases = [testcases]
-
+    for testsuite, testcases in xmlObj.testsuites():
         tsuite = TestSuite(xmlObj.rportal, xmlObj.name, testsuite)
         tsuite.start()
 
-        # create all testcases
         log.info("Starting testcases")
-        for testcase in testcases:
-            process_testcase(xmlObj, testcase, tsuite)
+        with ThreadPoolExecutor(max_workers=TESTCASE_WORKERS) as executor:
+            pending = deque()
+            for testcase in testcases:
+                tcase = start_testcase(xmlObj, testcase, tsuite)
+                if not tcase:
+                    continue
+                pending.append(
+                    executor.submit(process_testcase, tcase, tsuite, batcher=batcher)
+                )
+                while len(pending) > 2 * TESTCASE_WORKERS:
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
         log.info("\nFinished testcases")
         fqpath = os.path.join(xmlObj._configs.payload_dir, "attachments")
         if os.path.exists(f"{fqpath}/{tsuite.xml_name}/{tsuite.xml_name}.tar.gz"):
@@ -319,7 +328,7 @@ def process(xmlObj, rportal):
         tsuite.finish()
 
 
-def process_testcase(xunit_xml, testcase, tsuite):
+def start_testcase(xunit_xml, testcase, tsuite):
     # Skip testcases which has empty name
     if testcase.get("@name") == "" or not testcase.get("@name"):
         log.info("Skipping testcase because name is empty: %s", testcase)
@@ -331,7 +340,13 @@ def process_testcase(xunit_xml, testcase, tsuite):
         configs=xunit_xml._configs,
         parent_id=tsuite.item_id,
     )
-    tcase.start()
+    tcase.start_item()
+    return tcase
+
+
+def process_testcase(tcase, tsuite, batcher=None):
+    """Uploads the logs of the test case and finishes it."""
+    tcase.add_logs()
     fqpath = os.path.join(tcase._configs.payload_dir, "attachments")
     log.info(f"{fqpath}/{tcase.tc_name}.err")
     if tcase.status == "FAILED" and os.path.exists(
@@ -340,22 +355,45 @@ def process_testcase(xunit_xml, testcase, tsuite):
         with open(
             f"{fqpath}/{tsuite.xml_name}/{tcase.tc_name.replace(' ', '_')}_0.err", "r"
         ) as file:
-            log_entries = list(generate_log_events(file))
-            for i in log_entries:
-                timestamp = int(
-                    datetime.datetime.strptime(
-                        i["date"], "%Y-%m-%d %H:%M:%S,%f"
-                    ).strftime("%s")
-                )
-                tcase.rplog.add_message(
-                    message=i["text"],
-                    level="ERROR",
-                    test_item_id=tcase.test_item_id,
-                    msg_time=str(int(timestamp * 1000)),
+            log_entries = generate_log_events(file)
+            if batcher is None:
+                for i in log_entries:
+                    tcase.rplog.add_message(
+                        message=i["text"],
+                        level="ERROR",
+                        test_item_id=tcase.test_item_id,
+                        msg_time=event_time(i["date"]),
+                    )
+            else:
+                events = (
+                    batcher.event(
+                        tcase.test_item_id, i["text"], "ERROR", event_time(i["date"])
+                    )
+                    for i in log_entries
                 )
+                uploaded = batcher.upload(tcase.rplog, events)
+                log.info(f"Uploaded {uploaded} log events of {tcase.tc_name}")
     tcase.finish()
 
 
+@lru_cache(maxsize=4096)
+def _epoch_seconds(date):
+    return int(time.mktime(time.strptime(date, "%Y-%m-%d %H:%M:%S")))
+
+
+def event_time(date):
+    """Returns the log event date in epoch milliseconds.
+
+    The events of a log share the date up to the second, hence the seconds
+    are parsed once per distinct value.
+
+    Args:
+        date (str): date in the form '%Y-%m-%d %H:%M:%S,%f'
+    """
+    seconds, _, millis = date.partition(",")
+    return str(_epoch_seconds(seconds) * 1000 + int(millis or 0))
+
+
 def generate_log_events(file_handler):
     log_events = {}
     for line in file_handler:
@@ -372,6 +410,7 @@ def generate_log_events(file_handler):
                 log_events["text"] += line
         except Exception:
             log.error(f"Unable to parse the below Line : {line}")
+    if log_events:
         yield log_events
 
 
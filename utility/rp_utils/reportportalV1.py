@@ -5,6 +5,7 @@ import posixpath
 import re
 import time
 import uuid
+from itertools import islice
 from mimetypes import guess_type
 from zipfile import ZipFile
 
@@ -15,6 +16,12 @@ from reportportal_client import ReportPortalService
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 log = logging.getLogger(__name__)
 
+# Log events sent per batch log request
+LOG_BATCH_SIZE = 200
+
+# Characters of a log event message uploaded, the rest is truncated
+LOG_MESSAGE_SIZE = 64 * 1024
+
 
 class ReportPortalV1:
     """ReportPortal class to assist with RP API calls"""
@@ -529,3 +536,78 @@ class RpLog:
             message += msg_txt[-10000:]
             return message
         return msg_txt
+
+
+class RpLogBatch:
+    """Upload the log events of test items through the batch log endpoint.
+
+    The events are sent in chunks of LOG_BATCH_SIZE on the session of the
+    service, a chunk the endpoint fails to accept is logged event by event
+    with RpLog instead.
+    """
+
+    def __init__(self, rportal, launch_uuid=None):
+        self.service = rportal.service
+        self.url = posixpath.join(rportal.endpoint, "api/v1/", rportal.project, "log")
+        self.headers = {"Authorization": "bearer {0}".format(rportal.api_token)}
+        self.launch_uuid = launch_uuid
+
+    def event(self, test_item_id, message, level="INFO", msg_time=None):
+        """Return the log event in the form of the batch log endpoint"""
+        if msg_time is None:
+            msg_time = str(int(time.time() * 1000))
+        if len(message) > LOG_MESSAGE_SIZE:
+            message = (
+                message[:LOG_MESSAGE_SIZE] + "\n\n...\n\n  TRUNCATED by RP PREPROC\n"
+            )
+
+        event = {
+            "itemUuid": test_item_id,
+            "message": message,
+            "level": level,
+            "time": msg_time,
+        }
+        if self.launch_uuid:
+            event["launchUuid"] = self.launch_uuid
+
+        return event
+
+    def post(self, events):
+        """Send the events through the batch log endpoint"""
+        files = [("json_request_part", (None, json.dumps(events), "application/json"))]
+        response = self.service.session.post(
+            self.url, headers=self.headers, files=files, verify=False
+        )
+        response.raise_for_status()
+
+    def upload(self, rplog, events):
+        """Upload the events in chunks
+
+        Args:
+            rplog (RpLog): used for the events of a rejected chunk
+            events (iterable): events returned by event(), consumed one
+                chunk at a time
+
+        Returns:
+            number of events uploaded
+        """
+        events = iter(events)
+        uploaded = 0
+        while True:
+            batch = list(islice(events, LOG_BATCH_SIZE))
+            if not batch:
+                break
+            try:
+                self.post(batch)
+            except Exception as err:
+                log.warning("Batch log upload failed, logging one by one: %s", err)
+                for event in batch:
+                    rplog.add_message(
+                        message=event["message"],
+                        level=event["level"],
+                        msg_time=event["time"],
+                        test_item_id=event["itemUuid"],
+                    )
+            uploaded += len(batch)
+
+        return uploaded
@@ -3,6 +3,9 @@ import os
 import re
 import time
 from functools import partial, reduce
+from xml.etree.ElementTree import Element, iterparse, tostring
+
+import xmltodict
 
 from utility.rp_utils.reportportalV1 import RpLog
 
@@ -12,11 +15,42 @@ log = logging.getLogger(__name__)
 class XunitXML:
     """Class for processing the xUnit XML file for ReportPortal"""
 
-    def __init__(self, rportal, name=None, configs=None, xml_data=None):
+    def __init__(self, rportal, name=None, configs=None, xml_data=None, fqpath=None):
         self.rportal = rportal
         self.name = name
         self._configs = configs
         self.xml_data = xml_data
+        self.fqpath = fqpath
+
+    def testsuites(self):
+        """Yield the testsuites with a generator of their testcases
+
+        The testsuites are read incrementally from the xUnit file when the
+        parsed xml_data is not provided, see iter_testsuites.
+        """
+        if self.xml_data is None:
+            yield from iter_testsuites(self.fqpath)
+            return
+
+        # check for multiple testsuites in xUnit
+        if self.xml_data.get("testsuites"):
+            testsuites = self.xml_data.get("testsuites").get("testsuite")
+        else:
+            testsuites = self.xml_data.get("testsuite")
+        if not isinstance(testsuites, list):
+            testsuites = [testsuites]
+
+        for testsuite in testsuites:
+            testcases = testsuite.get("testcase")
+            if not testcases:
+                log.info(
+                    "Found empty test suite Name: %s. Skipping this test suite",
+                    testsuite.get("@name"),
+                )
+                continue
+            elif not isinstance(testcases, list):
+                testcases = [testcases]
+            yield testsuite, iter(testcases)
 
     @staticmethod
     def get_file_list(results_dir):
@@ -116,6 +150,11 @@ class TestCase:
 
     def start(self):
         """Start a testcase in ReportPortal"""
+        self.start_item()
+        self.add_logs()
+
+    def start_item(self):
+        """Start the testcase item in ReportPortal"""
 
         # getting test case properties if any to be attached as tags for the test cases
         attributes = list()
@@ -134,6 +173,8 @@ class TestCase:
         )
         # FIXME: start_time line length
 
+    def add_logs(self):
+        """Log the output and failures of the testcase in ReportPortal"""
         # Add system_out log
         if self.testcase.get("system-out"):
             # TODO: resolve get each call vs above for efficiency in python
@@ -236,6 +277,71 @@ class TestCase:
         )
 
 
+def to_dict(elem):
+    """Convert the element to the form of xmltodict"""
+    return xmltodict.parse(tostring(elem, encoding="unicode"))[elem.tag]
+
+
+def iter_testsuites(fqpath):
+    """Read the testsuites of the xUnit file incrementally
+
+    The testsuite is yielded once its first testcase starts, with the
+    attributes and properties of the testsuite, along with a generator of
+    its testcases. The testcase is yielded as soon as it is parsed and it
+    is released from the tree thereafter. The testsuites without testcases
+    are skipped.
+
+    Args:
+        fqpath (str): path of the xUnit file
+
+    Yields:
+        tuple of the testsuite and the generator of its testcases, in the
+        form of xmltodict
+    """
+    events = iterparse(fqpath, events=("start", "end"))
+    stack = []
+
+    def testcases(suite):
+        for event, elem in events:
+            if event == "start":
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag == "testcase" and stack and stack[-1] is suite:
+                yield to_dict(elem)
+                suite.remove(elem)
+            elif elem is suite:
+                suite.clear()
+                return
+
+    for event, elem in events:
+        if event == "end":
+            stack.pop()
+            if elem.tag == "testsuite":
+                log.info(
+                    "Found empty test suite Name: %s. Skipping this test suite",
+                    elem.get("name"),
+                )
+                elem.clear()
+            continue
+
+        stack.append(elem)
+        if elem.tag != "testcase" or len(stack) < 2 or stack[-2].tag != "testsuite":
+            continue
+
+        # first testcase of the suite, its properties are already parsed
+        suite = stack[-2]
+        testsuite = Element(suite.tag, suite.attrib)
+        testsuite.extend(child for child in suite if child.tag != "testcase")
+        suite_testcases = testcases(suite)
+        yield to_dict(testsuite), suite_testcases
+
+        # skip the testcases not consumed
+        for _ in suite_testcases:
+            pass
+
+
 def valid_attribute(prop):
     """Check if property can be used as report portal attribute"""
     return bool(
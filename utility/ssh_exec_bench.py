@@ -0,0 +1,97 @@
+"""Micro-benchmark for the per-call overhead of CephNode.exec_command.
+
+The benchmark is meant to be executed against a local sshd so that the numbers
+reflect the overhead added by the framework rather than the network latency.
+"""
+
+import statistics
+import sys
+from time import perf_counter
+
+from docopt import docopt
+
+from ceph.ceph import CephNode
+
+doc = """
+Measures the per-call overhead of CephNode.exec_command.
+
+    Usage:
+        ssh_exec_bench.py --user <user> (--password <password> | --key <key-file>) [options]
+        ssh_exec_bench.py (-h | --help)
+
+    Options:
+        -h --help               Shows the command usage
+        --host <host>           Address of the sshd to benchmark against.
+                                [default: 127.0.0.1]
+        --user <user>           Username to be used for the SSH session.
+        --password <password>   Password of the user.
+        --key <key-file>        Private key file of the user.
+        --calls <calls>         Number of commands to be executed. [default: 100]
+        --cmd <cmd>             Command to be executed. [default: true]
+"""
+
+
+def get_node(host, user, password=None, key=None):
+    """Returns a CephNode instance for the given host."""
+    return CephNode(
+        username=user,
+        password=password,
+        root_password=password,
+        root_username=user,
+        look_for_key=bool(key),
+        private_key_path=key,
+        root_login=user,
+        private_ip=host,
+        ip_address=host,
+        hostname=host,
+        ceph_nodename=host,
+        no_of_volumes=0,
+        role=[],
+    )
+
+
+def run(node, cmd, calls):
+    """Executes the command for the given number of calls.
+
+    Args:
+        node (CephNode): node on which the command is executed
+        cmd (str): command to be executed
+        calls (int): number of times the command is executed
+
+    Returns:
+        list of call durations in seconds
+    """
+    # Warm up the connection, the handshake must not be accounted.
+    node.exec_command(cmd=cmd, check_ec=False)
+
+    durations = []
+    for _ in range(calls):
+        _start = perf_counter()
+        node.exec_command(cmd=cmd, check_ec=False)
+        durations.append(perf_counter() - _start)
+
+    return durations
+
+
+def report(durations):
+    """Prints the latency summary of the given durations."""
+    durations = sorted(durations)
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(f"calls   : {len(durations)}")
+    print(f"total   : {sum(durations):.3f}s")
+    print(f"mean    : {statistics.mean(durations) * 1000:.2f}ms")
+    print(f"median  : {statistics.median(durations) * 1000:.2f}ms")
+    print(f"p99     : {p99 * 1000:.2f}ms")
+    print(f"max     : {durations[-1] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    args = docopt(doc)
+    node = get_node(
+        args["--host"],
+        args["--user"],
+        password=args["--password"],
+        key=args["--key"],
+    )
+    report(run(node, args["--cmd"], int(args["--calls"])))
+    sys.exit(0)
@@ -1041,6 +1041,36 @@ def resolve_use_ipv6(custom_config, cloud_type=None, osp_cred=None):
     return use_ipv6
 
 
+def resolve_ssh_pool_config(custom_config):
+    """
+    Resolve the SSH transport pool overrides of the nodes from custom_config.
+
+    Uses --custom-config ssh_max_transports=<n>, ssh_max_channels=<n> and
+    ssh_idle_timeout=<seconds>. Keys which are not provided fallback to the
+    SSHConnectionManager defaults.
+
+    Args:
+        custom_config: List of key=value strings from CLI (--custom-config).
+
+    Returns:
+        Dict of SSHConnectionManager pool keyword arguments.
+
+    Raises:
+        ValueError: when a provided value is not a positive integer.
+    """
+    overrides = parse_custom_config_list(custom_config)
+    pool_config = {}
+    for key in ("max_transports", "max_channels", "idle_timeout"):
+        value = overrides.get(f"ssh_{key}")
+        if value is None:
+            continue
+
+        if not int(value) > 0:
+            raise ValueError(f"ssh_{key} must be greater than 0, got {value}")
+        pool_config[key] = int(value)
+    return pool_config
+
+
 def custom_ceph_config(suite_config, custom_config, custom_config_file):
     """
     Combines and returns custom configuration overrides for ceph.